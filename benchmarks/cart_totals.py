@@ -0,0 +1,108 @@
+"""Multi-line cart: incremental totals and row patches vs full recompute and resend.
+
+For carts of each size, applies random line updates and reports the time per
+change and the bytes sent per change. "full" re-sums every line and sends the
+whole line list with the totals, as a ``list`` state var would. "incremental"
+is `pricing.cart.Cart` with a `ClientRows` patch of the changed line. Float
+drift of the running subtotal against an exact sum is reported as well.
+
+    python -m benchmarks.cart_totals --lines 10,100,1000 --changes 20000
+"""
+
+import argparse
+import dataclasses
+import json
+import math
+import random
+import time
+
+from reflex.utils.format import json_dumps
+
+from reflex_state_examples.components.client_rows import ClientRows
+from reflex_state_examples.pricing import engine
+from reflex_state_examples.pricing.cart import Cart
+from reflex_state_examples.pricing.catalog import Product
+
+TAX_RATE = 0.0825
+rows = ClientRows("bench_cart")
+
+
+def _script_bytes(event) -> int:
+    # The patch travels as the JS of a `call_script` event.
+    return len(str(event.args[0][1]))
+
+
+def bench(lines: int, changes: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    cart = Cart()
+    for i in range(1, lines + 1):
+        price = round(rng.uniform(0.5, 999.99), 2)
+        cart.add(Product(id=i, name=f"Product {i}", price=price, icon="box"), 1)
+    updates = [
+        (rng.randrange(1, lines + 1), rng.randint(1, 20)) for _ in range(changes)
+    ]
+
+    started = time.perf_counter()
+    for line_id, quantity in updates:
+        line = cart.lines[line_id]
+        line.quantity = quantity
+        subtotal = math.fsum(item.amount for item in cart.lines.values())
+        engine.quote_subtotal(subtotal, 0.0, TAX_RATE)
+    full_us = (time.perf_counter() - started) / changes * 1e6
+    totals = dataclasses.asdict(engine.quote_subtotal(subtotal, 0.0, TAX_RATE))
+    all_rows = [line.to_row() for line in cart.lines.values()]
+    full_bytes = len(json_dumps({"lines": all_rows, "quote": totals}))
+
+    cart.resum()
+    drift = 0.0
+    started = time.perf_counter()
+    for line_id, quantity in updates:
+        line = cart.update(line_id, quantity)
+        cart.quote("", TAX_RATE)
+    incremental_us = (time.perf_counter() - started) / changes * 1e6
+    for line_id, quantity in updates[:1000]:
+        cart.update(line_id, quantity)
+        exact = math.fsum(item.amount for item in cart.lines.values())
+        drift = max(drift, abs(cart.subtotal - exact))
+    patch = rows.upsert(line.to_row())
+    incremental_bytes = len(json_dumps({"quote": totals})) + _script_bytes(patch)
+
+    return {
+        "lines": lines,
+        "full_us": full_us,
+        "incremental_us": incremental_us,
+        "full_bytes": full_bytes,
+        "incremental_bytes": incremental_bytes,
+        "max_drift": drift,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", default="10,100,1000")
+    parser.add_argument("--changes", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = [
+        bench(int(lines), args.changes, args.seed) for lines in args.lines.split(",")
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(
+        f"{'lines':>6} {'full us':>9} {'incr us':>9} {'full B':>9} {'incr B':>8} "
+        f"{'max drift':>10}"
+    )
+    for row in results:
+        print(
+            f"{row['lines']:>6} {row['full_us']:>9.1f} {row['incremental_us']:>9.1f} "
+            f"{row['full_bytes']:>9} {row['incremental_bytes']:>8} "
+            f"{row['max_drift']:>10.1e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
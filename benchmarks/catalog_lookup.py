@@ -0,0 +1,106 @@
+"""Product lookups: in-heap `Catalog` vs the memory-mapped catalog file.
+
+Builds a synthetic catalog, then reports for each backend the time to make
+it available to a worker, the heap it takes, and random lookup throughput for
+IDs that exist and IDs that do not. The lookups are spread uniformly, so the
+mmap backend's small cache of decoded products barely helps here.
+
+    python -m benchmarks.catalog_lookup --products 1000000 --lookups 200000
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from reflex_state_examples.pricing.catalog import Catalog, Product
+from reflex_state_examples.pricing.mmap_catalog import MmapCatalog, build
+
+
+def _products(count: int) -> list[Product]:
+    # Every third ID is left out so misses fall between real products.
+    return [
+        Product(id=i, name=f"SKU {i:08d}", price=1 + i % 997 * 0.25, icon="box")
+        for i in range(1, count * 3 // 2 + 1)
+        if i % 3
+    ][:count]
+
+
+def _lookups_per_sec(catalog, ids: list[int]) -> float:
+    get = catalog.get
+    started = time.perf_counter()
+    for product_id in ids:
+        get(product_id)
+    return len(ids) / (time.perf_counter() - started)
+
+
+def bench(name: str, load, hits: list[int], misses: list[int]) -> dict:
+    started = time.perf_counter()
+    catalog = load()
+    load_ms = (time.perf_counter() - started) * 1000
+    row = {
+        "backend": name,
+        "load_ms": load_ms,
+        "hits_per_sec": _lookups_per_sec(catalog, hits),
+        "misses_per_sec": _lookups_per_sec(catalog, misses),
+    }
+    del catalog
+    # Tracing slows allocation down severalfold, so the heap is measured on a
+    # second, untimed load.
+    tracemalloc.start()
+    catalog = load()
+    row["heap_mb"] = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    products = _products(args.products)
+    rng = random.Random(0)
+    hits = [rng.choice(products).id for _ in range(args.lookups)]
+    misses = [
+        3 * rng.randrange(1, args.products // 2 + 1) for _ in range(args.lookups)
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalog.bin")
+        started = time.perf_counter()
+        build(products, path)
+        build_ms = (time.perf_counter() - started) * 1000
+        file_mb = os.path.getsize(path) / 2**20
+        # Loading into the heap is measured from the same file, so it only
+        # counts decoding, not parsing and validating CSV.
+        results = [
+            bench("heap", lambda: Catalog(MmapCatalog(path, 0)), hits, misses),
+            bench("mmap", lambda: MmapCatalog(path), hits, misses),
+        ]
+
+    if args.json:
+        summary = {"build_ms": build_ms, "file_mb": file_mb, "results": results}
+        print(json.dumps(summary, indent=2))
+        return
+    print(
+        f"{args.products} products, file {file_mb:.1f} MiB built in {build_ms:.0f} ms"
+    )
+    print(
+        f"{'backend':<8} {'load ms':>9} {'heap MiB':>9} "
+        f"{'hits/sec':>10} {'misses/sec':>11}"
+    )
+    for row in results:
+        print(
+            f"{row['backend']:<8} {row['load_ms']:>9.1f} {row['heap_mb']:>9.1f} "
+            f"{row['hits_per_sec']:>10.0f} {row['misses_per_sec']:>11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
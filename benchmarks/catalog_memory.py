@@ -0,0 +1,118 @@
+"""Per-session memory and hydration size: catalog in state vs shared catalog.
+
+"state" is the original layout, a ``products: list[Product]`` var that every
+session deep-copies; "shared" keeps one `pricing.catalog.Catalog` per process
+and only the selected ID per session. Copying a large catalog into thousands
+of sessions takes minutes, so the "state" layout is measured on ``--sample``
+sessions and extrapolated.
+
+    python -m benchmarks.catalog_memory --sessions 10000 --products 1000
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+import reflex as rx
+from reflex.utils.format import json_dumps
+
+from reflex_state_examples.pricing.catalog import Catalog, Product
+
+
+def _products(count: int) -> list[Product]:
+    return [
+        Product(id=i, name=f"Product {i:06d}", price=1 + i % 997 * 0.25, icon="box")
+        for i in range(1, count + 1)
+    ]
+
+
+def _state_classes(items: list[Product], catalog: Catalog):
+    class CatalogInState(rx.State):
+        products: list[Product] = items
+        selected_product_id: int = 1
+
+        @rx.var
+        def selected_product(self) -> Product:
+            for p in self.products:
+                if p.id == self.selected_product_id:
+                    return p
+            return self.products[0]
+
+    class SharedCatalog(rx.State):
+        selected_product_id: int = 1
+
+        @rx.var
+        def selected_product(self) -> Product:
+            return catalog.get(self.selected_product_id)
+
+    return CatalogInState, SharedCatalog
+
+
+def measure(state_cls: type[rx.State], sessions: int) -> dict:
+    before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    states = [state_cls(_reflex_internal_init=True) for _ in range(sessions)]
+    elapsed = time.perf_counter() - started
+    per_session = (tracemalloc.get_traced_memory()[0] - before) / sessions
+    hydration = len(json_dumps(states[0].dict()))
+    return {
+        "bytes_per_session": per_session,
+        "hydration_bytes": hydration,
+        "ms_per_session": elapsed / sessions * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--products", type=int, default=1_000)
+    parser.add_argument("--sample", type=int, default=100)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    products = _products(args.products)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    catalog = Catalog(products)
+    catalog_bytes = tracemalloc.get_traced_memory()[0] - before
+    in_state, shared = _state_classes(products, catalog)
+
+    results = []
+    for name, state_cls, measured in (
+        ("state", in_state, min(args.sample, args.sessions)),
+        ("shared", shared, args.sessions),
+    ):
+        row = measure(state_cls, measured)
+        total = row["bytes_per_session"] * args.sessions
+        if name == "shared":
+            total += catalog_bytes
+        results.append(
+            {
+                "layout": name,
+                "sessions": args.sessions,
+                "products": args.products,
+                "measured_sessions": measured,
+                "total_mb": total / 2**20,
+                **row,
+            }
+        )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{args.sessions} sessions x {args.products} products")
+    print(
+        f"{'layout':<8} {'KiB/session':>12} {'total MiB':>10} "
+        f"{'hydration B':>12} {'ms/session':>11}"
+    )
+    for row in results:
+        print(
+            f"{row['layout']:<8} {row['bytes_per_session'] / 1024:>12.1f} "
+            f"{row['total_mb']:>10.1f} {row['hydration_bytes']:>12} "
+            f"{row['ms_per_session']:>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
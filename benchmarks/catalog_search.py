@@ -0,0 +1,109 @@
+"""Typeahead latency per keystroke as the catalog grows: prefix index vs scan.
+
+Each query is typed one character at a time and every prefix is searched for
+one page of results, as the product picker does. "scan" filters the product
+names linearly for the same page, as searches do while the index loads.
+"open" is loading an index saved by a previous worker instead of building it.
+
+    python -m benchmarks.catalog_search --sizes 10000,100000,1000000
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from reflex_state_examples.pricing.catalog import Catalog, Product
+from reflex_state_examples.pricing.search import ProductIndex, scan
+
+ADJECTIVES = "neural quantum holographic bio metric solar carbon smart modular".split()
+NOUNS = "cable processor display scanner sensor drive router lens battery".split()
+QUERIES = ["quantum proc", "holo disp", "smart lens", "bio sc", "carbon router 12"]
+
+
+def _catalog(size: int) -> Catalog:
+    rng = random.Random(size)
+    return Catalog(
+        Product(
+            id=i,
+            name=f"{rng.choice(ADJECTIVES).title()} {rng.choice(NOUNS).title()} {i}",
+            price=1 + i % 997 * 0.25,
+            icon="box",
+        )
+        for i in range(1, size + 1)
+    )
+
+
+def _keystrokes_us(search, queries: list[str]) -> list[float]:
+    timings = []
+    for query in queries:
+        for end in range(1, len(query) + 1):
+            started = time.perf_counter()
+            search(query[:end])
+            timings.append((time.perf_counter() - started) * 1e6)
+    return timings
+
+
+def bench(size: int, scan_limit: int) -> dict:
+    catalog = _catalog(size)
+    started = time.perf_counter()
+    index = ProductIndex(catalog)
+    build_ms = (time.perf_counter() - started) * 1000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalog.search")
+        index.save(path)
+        started = time.perf_counter()
+        index = ProductIndex.open(path, catalog)
+        open_ms = (time.perf_counter() - started) * 1000
+        timings = sorted(_keystrokes_us(index.search, QUERIES))
+    row = {
+        "products": size,
+        "build_ms": build_ms,
+        "open_ms": open_ms,
+        "p50_us": statistics.median(timings),
+        "p99_us": timings[int(len(timings) * 0.99)],
+        "scan_p50_us": None,
+    }
+    if size <= scan_limit:
+        scans = _keystrokes_us(lambda query: scan(catalog, query), QUERIES)
+        row["scan_p50_us"] = statistics.median(scans)
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument(
+        "--scan-limit",
+        type=int,
+        default=100_000,
+        help="skip the linear scan above this many products",
+    )
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = [
+        bench(int(size), args.scan_limit) for size in args.sizes.split(",")
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(
+        f"{'products':>9} {'build ms':>9} {'open ms':>8} {'p50 us':>8} {'p99 us':>8} "
+        f"{'scan p50 us':>12}"
+    )
+    for row in results:
+        scan = "-" if row["scan_p50_us"] is None else f"{row['scan_p50_us']:.0f}"
+        print(
+            f"{row['products']:>9} {row['build_ms']:>9.0f} {row['open_ms']:>8.2f} "
+            f"{row['p50_us']:>8.1f} "
+            f"{row['p99_us']:>8.1f} {scan:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Websocket messages per Example 2 edit session: server vs client pricing.
+
+Replays synthetic typing sessions (quantity and discount code, with realistic
+gaps between keystrokes) through the debounce each mode applies, then runs
+the events that would reach the server against a headless `ExampleTwoState`
+to size the deltas it sends back. "server" is the default page: every
+quantity keystroke and each 300 ms pause in the code field is a round trip.
+"client" is ``EXAMPLE2_CLIENT_PRICING=1``: the summary is computed in the
+browser and only the cart after each ``EXAMPLE2_SAVE_DEBOUNCE_MS`` pause is
+sent.
+
+    python -m benchmarks.client_pricing --sessions 200
+"""
+
+import argparse
+import json
+import random
+import statistics
+
+import reflex as rx
+from reflex.utils.format import json_dumps
+
+from reflex_state_examples.states.example_two import SAVE_DEBOUNCE_MS, ExampleTwoState
+
+CODES = ["REFLEX20", "SAVE10", "DEVMODE", "SAVE1O"]
+
+# Mode -> field -> debounce in ms (0: every keystroke is sent).
+MODES = {
+    "server": {"quantity": 0, "discount_code": 300},
+    "client": {"quantity": SAVE_DEBOUNCE_MS, "discount_code": SAVE_DEBOUNCE_MS},
+}
+
+
+def _session(rng: random.Random) -> list[tuple[float, str, str]]:
+    """``(time_ms, field, value)`` for each keystroke of one edit session."""
+    keystrokes = []
+    now = 0.0
+    for _ in range(rng.randint(2, 5)):
+        field = rng.choice(["quantity", "discount_code"])
+        if field == "quantity":
+            target = str(rng.randint(1, 250))
+        else:
+            target = rng.choice(CODES)
+        value = ""
+        for char in target:
+            now += rng.uniform(80, 250)
+            value += char
+            keystrokes.append((now, field, value))
+        now += rng.uniform(1000, 4000)
+    return keystrokes
+
+
+def _sent(keystrokes, debounce: dict[str, int]) -> list[tuple[str, str]]:
+    """The ``(field, value)`` events that leave the browser after debouncing."""
+    sent = []
+    for index, (at, field, value) in enumerate(keystrokes):
+        delay = debounce[field]
+        following = keystrokes[index + 1 :]
+        superseded = any(
+            other_field == field and other_at - at < delay
+            for other_at, other_field, _ in following
+        )
+        if not delay or not superseded:
+            sent.append((field, value))
+    return sent
+
+
+def _replay(events: list[tuple[str, str]]) -> tuple[int, int, dict]:
+    root = rx.State(_reflex_internal_init=True)
+    state = root.get_substate(ExampleTwoState.get_full_name().split(".")[1:])
+    root._clean()
+    upstream = downstream = 0
+    for field, value in events:
+        if field == "quantity":
+            name, payload = "change_quantity", {"val": float(value)}
+            state.change_quantity(float(value))
+        else:
+            name, payload = "set_discount_code", {"value": value}
+            state.set_discount_code(value)
+        upstream += len(json.dumps({"name": name, "payload": payload}))
+        downstream += len(json_dumps(root.get_delta()))
+        root._clean()
+    final = {"quantity": state.quantity, "discount_code": state.discount_code}
+    return upstream, downstream, final
+
+
+def bench(sessions: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    traces = [_session(rng) for _ in range(sessions)]
+    results = []
+    finals = {}
+    for mode, debounce in MODES.items():
+        messages, up_bytes, down_bytes = [], 0, 0
+        finals[mode] = []
+        for keystrokes in traces:
+            events = _sent(keystrokes, debounce)
+            upstream, downstream, final = _replay(events)
+            # One event up and one delta down per event.
+            messages.append(2 * len(events))
+            up_bytes += upstream
+            down_bytes += downstream
+            finals[mode].append(final)
+        results.append(
+            {
+                "mode": mode,
+                "keystrokes": sum(map(len, traces)) / sessions,
+                "messages_per_session": statistics.mean(messages),
+                "bytes_per_session": (up_bytes + down_bytes) / sessions,
+            }
+        )
+    assert finals["server"] == finals["client"], "modes persisted different carts"
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = bench(args.sessions, args.seed)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(
+        f"{'mode':<8} {'keys/session':>13} {'msgs/session':>13} "
+        f"{'bytes/session':>14}"
+    )
+    for row in results:
+        print(
+            f"{row['mode']:<8} {row['keystrokes']:>13.1f} "
+            f"{row['messages_per_session']:>13.1f} {row['bytes_per_session']:>14.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Example 1 counter at high click rates: one event per click vs batched clicks.
+
+Replays click traces at each rate through the batching the page applies
+with ``EXAMPLE1_BATCHED_COUNTER=1`` (flush after ``EXAMPLE1_COUNTER_IDLE_MS``
+of idle, or ``EXAMPLE1_COUNTER_MAX_WAIT_MS`` after the first unsent click),
+then runs the resulting events against a headless `ExampleOneState` to time
+them and size their deltas. "sustain/s" is how many clicks per second one
+session could keep up if the worker did nothing else.
+
+    python -m benchmarks.counter_batching --rates 5,20,50 --seconds 10
+"""
+
+import argparse
+import json
+import random
+import time
+
+import reflex as rx
+from reflex.utils.format import json_dumps
+
+from reflex_state_examples.states.example_one import (
+    COUNTER_IDLE_MS,
+    COUNTER_MAX_WAIT_MS,
+    ExampleOneState,
+)
+
+
+def _clicks(rate: float, seconds: float, rng: random.Random) -> list[tuple[float, int]]:
+    """``(time_ms, delta)`` per click, Poisson-spaced, mostly increments."""
+    clicks, now = [], 0.0
+    while True:
+        now += rng.expovariate(rate) * 1000
+        if now > seconds * 1000:
+            return clicks
+        clicks.append((now, 1 if rng.random() < 0.8 else -1))
+
+
+def _batches(clicks, idle_ms: int, max_wait_ms: int) -> list[int]:
+    """The ``n`` of each ``add`` event the page sends for ``clicks``."""
+    batches, pending, first, last = [], 0, None, None
+    for at, delta in clicks:
+        if pending and (at - last >= idle_ms or at - first >= max_wait_ms):
+            batches.append(pending)
+            pending, first = 0, None
+        if first is None:
+            first = at
+        pending += delta
+        last = at
+    if pending:
+        batches.append(pending)
+    return batches
+
+
+def _replay(events) -> tuple[float, int, int]:
+    root = rx.State(_reflex_internal_init=True)
+    state = root.get_substate(ExampleOneState.get_full_name().split(".")[1:])
+    root._clean()
+    elapsed, sent = 0.0, 0
+    for handler, args in events:
+        started = time.perf_counter()
+        handler(state, *args)
+        delta = json_dumps(root.get_delta())
+        root._clean()
+        elapsed += time.perf_counter() - started
+        sent += len(delta)
+    return elapsed, sent, state.count
+
+
+def bench(rate: float, seconds: float, seed: int) -> list[dict]:
+    clicks = _clicks(rate, seconds, random.Random(seed))
+    increment = ExampleOneState.increment.fn
+    decrement = ExampleOneState.decrement.fn
+    add = ExampleOneState.add.fn
+    modes = {
+        "click": [(increment if d > 0 else decrement, ()) for _, d in clicks],
+        "batched": [
+            (add, (n, seq))
+            for seq, n in enumerate(
+                _batches(clicks, COUNTER_IDLE_MS, COUNTER_MAX_WAIT_MS), 1
+            )
+        ],
+    }
+    results, counts = [], set()
+    for mode, events in modes.items():
+        elapsed, sent, count = _replay(events)
+        counts.add(count)
+        results.append(
+            {
+                "mode": mode,
+                "clicks_per_s": len(clicks) / seconds,
+                "events_per_s": len(events) / seconds,
+                "bytes_per_s": sent / seconds,
+                "server_ms_per_s": elapsed * 1000 / seconds,
+                "sustained_clicks_per_s": len(clicks) / elapsed,
+            }
+        )
+    assert len(counts) == 1, "modes ended on different counts"
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rates", default="5,20,50", help="clicks per second")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = [
+        row
+        for rate in args.rates.split(",")
+        for row in bench(float(rate), args.seconds, args.seed)
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(
+        f"{'mode':<8} {'clicks/s':>9} {'events/s':>9} {'bytes/s':>9} "
+        f"{'server ms/s':>12} {'sustain/s':>10}"
+    )
+    for row in results:
+        print(
+            f"{row['mode']:<8} {row['clicks_per_s']:>9.1f} {row['events_per_s']:>9.1f} "
+            f"{row['bytes_per_s']:>9.0f} {row['server_ms_per_s']:>12.2f} "
+            f"{row['sustained_clicks_per_s']:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
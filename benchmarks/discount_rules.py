@@ -0,0 +1,118 @@
+"""Discount rules: compile time, evaluation cost and event-loop stalls on reload.
+
+Generates rule files of each size with a mix of flat, tiered, expiring and
+stackable codes, then measures loading the file, evaluating carts with one or
+several codes, and the longest the event loop goes unserved while
+`discounts.reload_rules` swaps the file in.
+
+    python -m benchmarks.discount_rules --sizes 1000,100000,300000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+from reflex_state_examples.pricing import discounts
+
+DAY = 86_400
+
+
+def _rules(count: int, rng: random.Random) -> list[dict]:
+    now = time.time()
+    rules = []
+    for i in range(count):
+        rule = {"code": f"PROMO{i:07d}", "percent": rng.choice([0.05, 0.1, 0.2])}
+        kind = i % 4
+        if kind == 1:
+            del rule["percent"]
+            rule["tiers"] = [
+                {"min_quantity": 1, "percent": 0.05},
+                {"min_quantity": 10, "percent": 0.1},
+                {"min_quantity": 50, "percent": 0.15},
+            ]
+        elif kind == 2:
+            rule["starts_at"] = now - rng.randrange(1, 30) * DAY
+            rule["expires_at"] = now + rng.randrange(-10, 30) * DAY
+            rule["min_quantity"] = rng.randrange(1, 5)
+        elif kind == 3:
+            rule["stackable"] = True
+        rules.append(rule)
+    return rules
+
+
+def _carts(count: int, size: int, rng: random.Random) -> list[tuple[str, int]]:
+    carts = []
+    for _ in range(count):
+        codes = [f"promo{rng.randrange(size * 11 // 10):07d}"]
+        if rng.random() < 0.3:
+            codes.append(f"PROMO{rng.randrange(size):07d}")
+        carts.append((", ".join(codes), rng.randrange(1, 100)))
+    return carts
+
+
+async def _max_stall_ms(path: str) -> float:
+    stall = 0.0
+    reloading = asyncio.create_task(discounts.reload_rules(path))
+    last = time.perf_counter()
+    while not reloading.done():
+        await asyncio.sleep(0)
+        now = time.perf_counter()
+        stall = max(stall, now - last)
+        last = now
+    assert await reloading, "the rule file was not reloaded"
+    return stall * 1000
+
+
+def bench(size: int, evaluations: int) -> dict:
+    rng = random.Random(size)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "rules.json")
+        with open(path, "w") as file:
+            json.dump(_rules(size, rng), file)
+
+        started = time.perf_counter()
+        rules = discounts.load_rules(path)
+        load_ms = (time.perf_counter() - started) * 1000
+
+        carts = _carts(evaluations, size, rng)
+        now = time.time()
+        started = time.perf_counter()
+        for codes, quantity in carts:
+            rules.percent(codes, quantity, now)
+        eval_ns = (time.perf_counter() - started) / evaluations * 1e9
+
+        stall_ms = asyncio.run(_max_stall_ms(path))
+    return {
+        "rules": size,
+        "load_ms": load_ms,
+        "eval_ns": eval_ns,
+        "max_loop_stall_ms": stall_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,100000,300000")
+    parser.add_argument("--evaluations", type=int, default=200_000)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = [bench(int(size), args.evaluations) for size in args.sizes.split(",")]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'rules':>8} {'load ms':>9} {'ns/cart':>9} {'max stall ms':>13}")
+    for row in results:
+        print(
+            f"{row['rules']:>8} {row['load_ms']:>9.0f} {row['eval_ns']:>9.0f} "
+            f"{row['max_loop_stall_ms']:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Event log cost per logged event: list var vs ring buffer with batched deltas.
+
+"list" is the previous `_log_event`: ``insert(0, ...)`` and ``pop()`` on a
+``list[str]`` var, which sends the whole log in every delta. "ring" is
+`components.event_log.EventLogState`, measured on a headless state: one
+entry per delta however long the log is.
+
+    python -m benchmarks.event_log --capacity 5,100,1000,5000 --events 5000
+"""
+
+import argparse
+import json
+import time
+
+import reflex as rx
+from reflex.utils.format import json_dumps
+
+from reflex_state_examples.components.event_log import EventLog, EventLogState
+
+
+class _ListLogState(rx.State):
+    event_log: list[str] = []
+    _capacity: int = 5
+
+    def _log_event(self, message: str):
+        self.event_log.insert(0, message)
+        if len(self.event_log) > self._capacity:
+            self.event_log.pop()
+
+
+class _RingLogState(EventLogState, rx.State):
+    pass
+
+
+def _measure(state_cls, setup, events: int) -> tuple[float, float]:
+    root = rx.State(_reflex_internal_init=True)
+    state = root.get_substate(state_cls.get_full_name().split(".")[1:])
+    setup(state)
+    root._clean()
+    elapsed, sent = 0.0, 0
+    for i in range(events):
+        started = time.perf_counter()
+        state._log_event(f"Increment: {i}")
+        delta = root.get_delta()
+        elapsed += time.perf_counter() - started
+        sent += len(json_dumps(delta))
+        root._clean()
+    return elapsed / events * 1e6, sent / events
+
+
+def bench(capacity: int, events: int) -> list[dict]:
+    def fill_list(state):
+        state._capacity = capacity
+        state.event_log = [f"Increment: {i}" for i in range(capacity)]
+
+    def fill_ring(state):
+        messages = (f"Increment: {i}" for i in range(capacity))
+        state._event_log = EventLog(capacity, messages)
+
+    results = []
+    for mode, state_cls, setup in (
+        ("list", _ListLogState, fill_list),
+        ("ring", _RingLogState, fill_ring),
+    ):
+        us, sent = _measure(state_cls, setup, events)
+        results.append(
+            {"mode": mode, "capacity": capacity, "us_per_event": us, "bytes": sent}
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--capacity", default="5,100,1000,5000")
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = [
+        row
+        for capacity in args.capacity.split(",")
+        for row in bench(int(capacity), args.events)
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'mode':<6} {'capacity':>9} {'us/event':>9} {'bytes/delta':>12}")
+    for row in results:
+        print(
+            f"{row['mode']:<6} {row['capacity']:>9} {row['us_per_event']:>9.1f} "
+            f"{row['bytes']:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
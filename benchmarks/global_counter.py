@@ -0,0 +1,136 @@
+"""Site-wide counter under concurrent sessions: pushes per session and add latency.
+
+Every session both clicks (Poisson, ``--rate`` adds per second) and watches
+the total through one worker's `CounterHub`. "per-add" is how many updates
+each session would receive if every add were pushed to every watcher;
+"pushed" is what the hub actually delivered, bounded by
+``EXAMPLE1_GLOBAL_COUNTER_PUSH_MS``. "lag" is how far behind the last push
+each session was when the clicking stopped.
+
+    python -m benchmarks.global_counter --sessions 1000 --rate 2
+    python -m benchmarks.global_counter --backend redis --fake
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import random
+import statistics
+import time
+
+from reflex_state_examples.sync.metrics import LatencyHistogram
+from reflex_state_examples.sync.redis_pool import REDIS_URL, redis_pool
+from reflex_state_examples.sync.shared_counter import (
+    COUNTER_SHARDS,
+    PUSH_MS,
+    REFRESH_MS,
+    CounterHub,
+    InProcessCounter,
+    RedisCounter,
+)
+
+
+def _counter(backend: str, shards: int):
+    if backend == "memory":
+        return InProcessCounter(shards)
+    key = f"benchmark:global_counter:{time.time_ns()}"
+    return RedisCounter(key, redis_pool.client, shards)
+
+
+async def run(args) -> dict:
+    counter = _counter(args.backend, args.shards)
+    hub = CounterHub(counter, args.refresh_ms, args.push_ms)
+    pushes = [0] * args.sessions
+    last = [0] * args.sessions
+    latency = LatencyHistogram()
+    rng = random.Random(args.seed)
+    deadline = time.monotonic() + args.seconds
+
+    async def watch(session: int):
+        async with contextlib.aclosing(hub.watch()) as totals:
+            async for total in totals:
+                pushes[session] += 1
+                last[session] = total
+
+    async def click(session: int):
+        while True:
+            delay = rng.expovariate(args.rate)
+            if time.monotonic() + delay >= deadline:
+                return
+            await asyncio.sleep(delay)
+            started = time.perf_counter_ns()
+            await hub.add(f"session-{session}", 1)
+            latency.record((time.perf_counter_ns() - started) // 1000)
+
+    watchers = [asyncio.create_task(watch(i)) for i in range(args.sessions)]
+    started = time.monotonic()
+    await asyncio.gather(*(click(i) for i in range(args.sessions)))
+    elapsed = time.monotonic() - started
+    total = await counter.total()
+    lag = statistics.mean(total - value for value in last)
+    for task in watchers:
+        task.cancel()
+    await asyncio.gather(*watchers, return_exceptions=True)
+    await redis_pool.close()
+
+    assert total == hub.adds, "the counter lost adds"
+    return {
+        "backend": args.backend,
+        "sessions": args.sessions,
+        "shards": args.shards,
+        "adds_per_sec": hub.adds / elapsed,
+        "per_add_pushes_per_session_sec": hub.adds / elapsed,
+        "pushes_per_session_sec": statistics.mean(pushes) / elapsed,
+        "backend_reads_per_sec": hub.reads / elapsed,
+        "lag_mean": lag,
+        "add_latency": latency.to_dict(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=("memory", "redis"), default="memory")
+    parser.add_argument("--url", default=REDIS_URL)
+    parser.add_argument("--fake", action="store_true", help="use in-process fakeredis")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=2.0, help="adds/sec per session")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--shards", type=int, default=COUNTER_SHARDS)
+    parser.add_argument("--refresh-ms", type=float, default=REFRESH_MS)
+    parser.add_argument("--push-ms", type=float, default=PUSH_MS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    redis_pool.url = args.url
+    if args.fake:
+        import fakeredis.aioredis
+
+        server = fakeredis.FakeServer()
+        redis_pool.use_client(
+            fakeredis.aioredis.FakeRedis(server=server, decode_responses=True),
+            raw=fakeredis.aioredis.FakeRedis(server=server),
+        )
+    result = asyncio.run(run(args))
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    hist = result["add_latency"]
+    print(f"{'adds/sec':<26} {result['adds_per_sec']:>10.0f}")
+    print(
+        f"{'updates/session/sec':<26} {result['pushes_per_session_sec']:>10.1f}"
+        f"  (per-add: {result['per_add_pushes_per_session_sec']:.0f})"
+    )
+    print(f"{'backend reads/sec':<26} {result['backend_reads_per_sec']:>10.1f}")
+    lag_ms = result["lag_mean"] / result["adds_per_sec"] * 1000
+    print(f"{'mean lag (adds)':<26} {result['lag_mean']:>10.1f}  (~{lag_ms:.0f} ms)")
+    print(
+        f"{'add latency ms':<26} p50 {hist['p50_us'] / 1000:.2f}  "
+        f"p95 {hist['p95_us'] / 1000:.2f}  p99 {hist['p99_us'] / 1000:.2f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Batch repricing: `pricing.batch.quote_batch` vs a loop over `engine.quote`.
+
+Needs NumPy. Every run checks that both produce identical totals.
+
+    python -m benchmarks.pricing_batch
+    python -m benchmarks.pricing_batch --sizes 100000,1000000 --json
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from reflex_state_examples.pricing.batch import quote_batch
+from reflex_state_examples.pricing.catalog import catalog
+from reflex_state_examples.pricing.engine import discount_percent, quote_line
+
+PRICES = catalog.prices()
+CODES = np.array(["", "SAVE10", "reflex20", "DEVMODE", "EXPIRED", "save10 devmode"])
+TAX_RATES = np.array([0.0825, 0.07, 0.1])
+
+
+def _carts(size: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return (
+        rng.integers(1, 5, size),
+        rng.integers(1, 1000, size),
+        CODES[rng.integers(0, len(CODES), size)],
+        TAX_RATES[rng.integers(0, len(TAX_RATES), size)],
+    )
+
+
+def bench(size: int) -> dict:
+    ids, quantities, codes, tax_rates = _carts(size)
+
+    started = time.perf_counter()
+    batch = quote_batch(PRICES, ids, quantities, codes, tax_rates)
+    vectorized = time.perf_counter() - started
+
+    columns = (ids.tolist(), quantities.tolist(), codes.tolist(), tax_rates.tolist())
+    # Bypass the memo: every cart is priced from scratch, as a cold reprice would.
+    started = time.perf_counter()
+    totals = [
+        quote_line(PRICES[i], q, discount_percent(code, q), rate).total
+        for i, q, code, rate in zip(*columns)
+    ]
+    scalar = time.perf_counter() - started
+
+    assert batch.total.tolist() == totals, "batch totals differ from engine.quote"
+    return {
+        "carts": size,
+        "vectorized_s": vectorized,
+        "scalar_s": scalar,
+        "carts_per_sec": size / vectorized,
+        "speedup": scalar / vectorized,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100000,300000,1000000")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+    results = [bench(int(size)) for size in args.sizes.split(",")]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'carts':>9} {'batch ms':>9} {'loop ms':>9} {'carts/sec':>12} {'speedup':>8}")
+    for row in results:
+        print(
+            f"{row['carts']:>9} {row['vectorized_s'] * 1000:>9.1f} "
+            f"{row['scalar_s'] * 1000:>9.1f} {row['carts_per_sec']:>12.0f} "
+            f"{row['speedup']:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
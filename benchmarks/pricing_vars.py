@@ -0,0 +1,169 @@
+"""Computed-var work per state delta: chained pricing vars vs one engine quote.
+
+"chained" is the original shape of Examples 2 and 5, where ``subtotal``,
+``discount_percent``, ``discount_amount``, ``tax_amount`` and ``total`` are
+separate vars feeding each other. "engine" is the single ``quote`` var backed
+by `reflex_state_examples.pricing.engine`. Each delta changes one input and
+is resolved with ``get_delta`` the way Reflex does after an event.
+
+    python -m benchmarks.pricing_vars --deltas 20000
+"""
+
+import argparse
+import collections
+import json
+import random
+import time
+
+import reflex as rx
+from reflex.state import State
+from reflex.utils.format import json_dumps
+
+from reflex_state_examples.pricing import engine as pricing
+from reflex_state_examples.pricing.catalog import Product
+
+EVALUATIONS: collections.Counter = collections.Counter()
+
+PRODUCTS = [
+    Product(id=1, name="Neural Link Cable", price=49.99, icon="zap"),
+    Product(id=2, name="Quantum Processor", price=899.0, icon="cpu"),
+    Product(id=3, name="Holographic Display", price=249.5, icon="monitor"),
+    Product(id=4, name="Bio-Metric Scanner", price=120.0, icon="fingerprint"),
+]
+
+
+class ChainedPricingState(rx.State):
+    products: list[Product] = PRODUCTS
+    selected_product_id: int = 1
+    quantity: int = 1
+    discount_code: str = ""
+    tax_rate: float = 0.0825
+
+    @rx.var
+    def selected_product(self) -> Product:
+        EVALUATIONS["chained"] += 1
+        for p in self.products:
+            if p.id == self.selected_product_id:
+                return p
+        return self.products[0]
+
+    @rx.var
+    def subtotal(self) -> float:
+        EVALUATIONS["chained"] += 1
+        return self.selected_product.price * self.quantity
+
+    @rx.var
+    def discount_percent(self) -> float:
+        EVALUATIONS["chained"] += 1
+        codes = {"REFLEX20": 0.2, "DEVMODE": 0.5, "SAVE10": 0.1}
+        return codes.get(self.discount_code.upper(), 0.0)
+
+    @rx.var
+    def discount_amount(self) -> float:
+        EVALUATIONS["chained"] += 1
+        return self.subtotal * self.discount_percent
+
+    @rx.var
+    def tax_amount(self) -> float:
+        EVALUATIONS["chained"] += 1
+        return (self.subtotal - self.discount_amount) * self.tax_rate
+
+    @rx.var
+    def total(self) -> float:
+        EVALUATIONS["chained"] += 1
+        return self.subtotal - self.discount_amount + self.tax_amount
+
+
+class EnginePricingState(rx.State):
+    products: list[Product] = PRODUCTS
+    selected_product_id: int = 1
+    quantity: int = 1
+    discount_code: str = ""
+    tax_rate: float = 0.0825
+
+    @rx.var
+    def selected_product(self) -> Product:
+        EVALUATIONS["engine"] += 1
+        for p in self.products:
+            if p.id == self.selected_product_id:
+                return p
+        return self.products[0]
+
+    @rx.var
+    def quote(self) -> pricing.Quote:
+        EVALUATIONS["engine"] += 1
+        return pricing.quote(
+            self.selected_product.price,
+            self.quantity,
+            self.discount_code,
+            self.tax_rate,
+        )
+
+
+def _edits(count: int, seed: int) -> list[tuple[str, object]]:
+    rng = random.Random(seed)
+    edits = []
+    for _ in range(count):
+        field = rng.choice(
+            ["quantity", "quantity", "discount_code", "selected_product_id"]
+        )
+        if field == "quantity":
+            edits.append((field, rng.randint(1, 500)))
+        elif field == "discount_code":
+            edits.append((field, rng.choice(["", "save10", "REFLEX20", "nope"])))
+        else:
+            edits.append((field, rng.randint(1, 4)))
+    return edits
+
+
+def bench(name: str, state_cls: type[rx.State], edits) -> dict:
+    root = State(_reflex_internal_init=True)
+    state = root.get_substate(state_cls.get_full_name().split(".")[1:])
+    root.get_delta()
+    root._clean()
+    EVALUATIONS[name] = 0
+    delta_bytes = 0
+    totals = []
+    started = time.perf_counter()
+    for field, value in edits:
+        setattr(state, field, value)
+        delta = root.get_delta()
+        root._clean()
+        delta_bytes += len(json_dumps(delta))
+        totals.append(state.total if name == "chained" else state.quote.total)
+    elapsed = time.perf_counter() - started
+    return {
+        "variant": name,
+        "evaluations_per_delta": EVALUATIONS[name] / len(edits),
+        "us_per_delta": elapsed / len(edits) * 1e6,
+        "delta_bytes": delta_bytes / len(edits),
+        "totals": totals,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--deltas", type=int, default=20_000)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    edits = _edits(args.deltas, seed=0)
+    results = [
+        bench("chained", ChainedPricingState, edits),
+        bench("engine", EnginePricingState, edits),
+    ]
+    assert results[0].pop("totals") == results[1].pop("totals"), "totals differ"
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'variant':<8} {'evals/delta':>12} {'us/delta':>9} {'delta bytes':>12}")
+    for row in results:
+        print(
+            f"{row['variant']:<8} {row['evaluations_per_delta']:>12.2f} "
+            f"{row['us_per_delta']:>9.1f} {row['delta_bytes']:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""Example 5 edits/sec: per-call connections, the shared pool, the merge script.
+
+"per_call" and "pooled" are the earlier ``_publish_state``: a SET of the whole
+record and a PUBLISH, on a fresh connection and on the shared pool. "script"
+is the current `RedisPubSubTransport.publish`, which merges the changed
+fields into the room hash and broadcasts them in one round trip. "coalesced"
+sends the same edits through `CoalescingPublisher`, as bursts of concurrent
+edits from ``--concurrency`` sessions; "round trips" shows how few reach Redis.
+
+Run against a local redis-server:
+
+    python -m benchmarks.redis_publish --url redis://localhost:6379/0
+
+or against an in-process stand-in (requires ``pip install fakeredis``):
+
+    python -m benchmarks.redis_publish --fake
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import threading
+import time
+
+import redis.asyncio as redis
+
+from reflex_state_examples.sync.protocol import SyncSession, clock
+from reflex_state_examples.sync.publisher import CoalescingPublisher
+from reflex_state_examples.sync.redis_pool import (
+    REDIS_URL,
+    RedisPoolManager,
+    redis_pool,
+)
+from reflex_state_examples.sync.redis_transport import (
+    MERGE_AND_BROADCAST,
+    RedisPubSubTransport,
+)
+
+CHANNEL = "bench:example5"
+STATE_KEY = "bench:example5:state"
+ROOM = "bench"
+LABEL = "Quantity changed"
+BURST = 10
+
+
+def _payload(i: int) -> dict:
+    return {
+        "selected_product_id": 1 + i % 4,
+        "quantity": 1 + i % 9,
+        "discount_code": "SAVE10",
+        "tax_rate": 0.0825,
+    }
+
+
+def _message(i: int) -> tuple[str, str]:
+    payload = _payload(i)
+    record = {"label": LABEL, "payload": payload, "updated_at": time.time()}
+    message = {"origin": "bench", "label": LABEL, "payload": payload}
+    return json.dumps(record), json.dumps(message)
+
+
+async def publish_per_call(url: str, i: int):
+    """The original `_publish_state`: connect, SET, PUBLISH, close."""
+    client = redis.from_url(url, decode_responses=True)
+    try:
+        record, message = _message(i)
+        await client.set(STATE_KEY, record)
+        await client.publish(CHANNEL, message)
+    finally:
+        await client.aclose()
+
+
+async def publish_pooled(pool: RedisPoolManager, i: int):
+    client = pool.client()
+    record, message = _message(i)
+    await client.set(STATE_KEY, record)
+    await client.publish(CHANNEL, message)
+
+
+async def publish_script(transport: RedisPubSubTransport, i: int):
+    fields = {"quantity": _payload(i)["quantity"]}
+    await transport.publish(ROOM, f"bench-{i}", clock.now(), LABEL, fields)
+
+
+async def _drive(publish, count: int, concurrency: int) -> float:
+    next_index = iter(range(count))
+
+    async def worker():
+        for i in next_index:
+            await publish(i)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started
+
+
+async def _drive_coalesced(
+    publisher: CoalescingPublisher, count: int, concurrency: int
+) -> float:
+    """Each session edits ``BURST`` times at once, like fast typing, then waits."""
+    next_index = iter(range(count))
+
+    async def session(n: int):
+        sync = SyncSession(f"bench-{n}", _payload(0), ROOM)
+        while burst := list(zip(range(BURST), next_index)):
+            requests = []
+            for _, i in burst:
+                sync.stage({"quantity": _payload(i)["quantity"]}, force=True)
+                requests.append(publisher.publish(sync, LABEL))
+            await asyncio.gather(*requests)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(session(n) for n in range(concurrency)))
+    return time.perf_counter() - started
+
+
+async def run(url: str, count: int, concurrency: int, pool_size: int) -> dict:
+    results = {}
+    elapsed = await _drive(lambda i: publish_per_call(url, i), count, concurrency)
+    results["per_call"] = (count / elapsed, 2 * count)
+
+    pool = RedisPoolManager(url, max_connections=pool_size)
+    try:
+        elapsed = await _drive(lambda i: publish_pooled(pool, i), count, concurrency)
+        results["pooled"] = (count / elapsed, 2 * count)
+    finally:
+        await pool.close()
+
+    redis_pool.url = url
+    redis_pool.max_connections = pool_size
+    transport = RedisPubSubTransport(CHANNEL, STATE_KEY)
+    try:
+        # Load the script up front, so no timed call pays for the NOSCRIPT
+        # retry (and fakeredis' TCP server, which drops the connection after
+        # any error reply, keeps serving).
+        await redis_pool.client().script_load(MERGE_AND_BROADCAST)
+        elapsed = await _drive(
+            lambda i: publish_script(transport, i), count, concurrency
+        )
+        results["script"] = (count / elapsed, count)
+        publisher = CoalescingPublisher(transport)
+        elapsed = await _drive_coalesced(publisher, count, concurrency)
+        results["coalesced"] = (count / elapsed, publisher.sent + publisher.stale)
+    finally:
+        await redis_pool.close()
+    return results
+
+
+@contextlib.contextmanager
+def fake_server():
+    from fakeredis import TcpFakeServer
+
+    server = TcpFakeServer(("127.0.0.1", 0))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address
+        yield f"redis://{host}:{port}/0"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=REDIS_URL)
+    parser.add_argument("--fake", action="store_true", help="use an in-process fakeredis server")
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--pool-size", type=int, default=16)
+    args = parser.parse_args()
+
+    with fake_server() if args.fake else contextlib.nullcontext(args.url) as url:
+        results = asyncio.run(run(url, args.count, args.concurrency, args.pool_size))
+
+    per_call = results["per_call"][0]
+    print(f"{'mode':<10} {'edits/sec':>10} {'round trips':>12} {'vs per_call':>12}")
+    for mode, (rate, round_trips) in results.items():
+        print(
+            f"{mode:<10} {rate:>10.0f} {round_trips:>12} {rate / per_call:>11.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Example 5 codecs: encode/decode cost and message size, JSON vs binary.
+
+    python -m benchmarks.sync_codec
+    python -m benchmarks.sync_codec --number 200000 --json
+"""
+
+import argparse
+import json
+import timeit
+
+from reflex_state_examples.sync.codec import decode, get_codec
+from reflex_state_examples.sync.metrics import send_stamp
+from reflex_state_examples.sync.protocol import clock
+
+FULL_PAYLOAD = {
+    "selected_product_id": 3,
+    "quantity": 12,
+    "discount_code": "REFLEX20",
+    "tax_rate": 0.0825,
+}
+MESSAGES = {
+    "one_field": {"quantity": 7},
+    "full_payload": FULL_PAYLOAD,
+}
+
+
+def _message(fields: dict) -> dict:
+    return {
+        "origin": "3f2b8c1e9a7d4c6b8e0f1a2b3c4d5e6f",
+        "seq": clock.now(),
+        "label": "Quantity changed",
+        "fields": fields,
+        "sent": send_stamp(),
+    }
+
+
+def bench(number: int) -> list[dict]:
+    results = []
+    for shape, fields in MESSAGES.items():
+        message = _message(fields)
+        for name in ("json", "binary"):
+            codec = get_codec(name)
+            data = codec.encode(message)
+            assert decode(data) == message
+            encode_s = timeit.timeit(lambda: codec.encode(message), number=number)
+            decode_s = timeit.timeit(lambda: decode(data), number=number)
+            results.append(
+                {
+                    "message": shape,
+                    "codec": name,
+                    "bytes": len(data),
+                    "encode_ns": encode_s / number * 1e9,
+                    "decode_ns": decode_s / number * 1e9,
+                }
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=100_000)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+    results = bench(args.number)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'message':<14} {'codec':<8} {'bytes':>6} {'encode ns':>10} {'decode ns':>10}")
+    for row in results:
+        print(
+            f"{row['message']:<14} {row['codec']:<8} {row['bytes']:>6} "
+            f"{row['encode_ns']:>10.0f} {row['decode_ns']:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""Example 5 under load: many simulated sessions on one worker.
+
+Each simulated session mirrors an `ExampleFiveState` tab: a listener that
+drains, merges and applies deltas under its own lock the way ``listen_redis``
+does, and a driver that fires ``select_product``, ``change_quantity`` and
+``update_discount_code`` edits at a Poisson rate through the shared publisher.
+Every edit reaches every other session in the same room, so deliveries grow
+with the rate times sessions squared over ``--rooms``.
+
+    python -m benchmarks.sync_load --sessions 500 --rate 0.2 --duration 20
+    python -m benchmarks.sync_load --sessions 2000 --rooms 100
+    python -m benchmarks.sync_load --transport pubsub --fake --output load.json
+    python -m benchmarks.sync_load --mix select_product=1,change_quantity=4
+
+Results (throughput, latency percentiles, CPU and memory per session) are
+printed as a table and, with ``--output``, written as JSON for comparing runs.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import time
+import uuid
+
+from reflex_state_examples.sync.fanout import WorkerFanout, drain
+from reflex_state_examples.sync.metrics import elapsed_us, metrics
+from reflex_state_examples.sync.protocol import SyncSessions
+from reflex_state_examples.sync.publisher import CoalescingPublisher
+from reflex_state_examples.sync.redis_pool import REDIS_URL, redis_pool
+from reflex_state_examples.sync.transport import create_transport
+
+INITIAL = {
+    "selected_product_id": 1,
+    "quantity": 1,
+    "discount_code": "",
+    "tax_rate": 0.0825,
+}
+DISCOUNT_CODES = ["", "SAVE10", "REFLEX20", "DEVMODE"]
+
+
+def _edit(action: str, rng: random.Random) -> dict:
+    if action == "select_product":
+        return {"selected_product_id": rng.randint(1, 4)}
+    if action == "change_quantity":
+        return {"quantity": rng.randint(1, 20)}
+    return {"discount_code": rng.choice(DISCOUNT_CODES)}
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Peak rather than current RSS, in KiB on Linux and bytes on macOS.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class SimulatedSession:
+    def __init__(
+        self, fanout, publisher, sessions: SyncSessions, room: str, seed: int
+    ):
+        self.fanout = fanout
+        self.publisher = publisher
+        self.token = uuid.uuid4().hex
+        self.sync = sessions.get(uuid.uuid4().hex, INITIAL, room)
+        self.state = dict(INITIAL)
+        self.lock = asyncio.Lock()
+        self.rng = random.Random(seed)
+        self.actions = 0
+        self._publishes: set[asyncio.Task] = set()
+
+    async def listen(self):
+        queue = self.fanout.register(self.token, self.sync.origin, self.sync.room)
+        try:
+            while True:
+                changed, stamps = set(), []
+                for kind, data in await drain(queue):
+                    if kind == "resync":
+                        snapshot = await self.fanout.transport.get_snapshot(
+                            self.sync.room
+                        )
+                        changed.update(self.sync.merge_snapshot(snapshot))
+                        continue
+                    if kind != "message":
+                        continue
+                    metrics.messages_received += 1
+                    fields = self.sync.merge(
+                        data["fields"], int(data["seq"]), data["origin"]
+                    )
+                    if not fields:
+                        metrics.messages_skipped += 1
+                        continue
+                    changed.update(fields)
+                    if "sent" in data:
+                        stamps.append(data["sent"])
+                if not changed:
+                    continue
+                metrics.state_applications += 1
+                async with self.lock:
+                    self.state.update(
+                        {name: self.sync.values[name] for name in changed}
+                    )
+                    for stamp in stamps:
+                        metrics.apply_latency.record(elapsed_us(stamp))
+        finally:
+            self.fanout.unregister(self.token, queue)
+
+    async def drive(self, rate: float, actions: list[str], weights: list[float]):
+        while True:
+            await asyncio.sleep(self.rng.expovariate(rate))
+            action = self.rng.choices(actions, weights)[0]
+            async with self.lock:
+                self.state.update(_edit(action, self.rng))
+                payload = dict(self.state)
+            self.actions += 1
+            if self.sync.stage(payload):
+                # Handlers are background events: an edit never waits for the
+                # previous one's publish.
+                task = asyncio.create_task(self.publisher.publish(self.sync, action))
+                self._publishes.add(task)
+                task.add_done_callback(self._publishes.discard)
+
+
+async def run(args) -> dict:
+    channel = f"bench:example5:load:{args.transport}"
+    transport = create_transport(channel, f"{channel}:state", args.transport)
+    rooms = [f"room{i}" for i in range(args.rooms)]
+    if args.transport in ("pubsub", "streams"):
+        keys = [transport.room_channel(room) for room in rooms]
+        keys += [transport.room_key(room) for room in rooms]
+        await redis_pool.client().delete(*keys)
+    fanout = WorkerFanout(transport)
+    publisher = CoalescingPublisher(transport)
+    mix = dict(item.split("=") for item in args.mix.split(","))
+    actions, weights = list(mix), [float(w) for w in mix.values()]
+    metrics.reset()
+
+    rss_before = _rss_bytes()
+    registry = SyncSessions()
+    sessions = [
+        SimulatedSession(fanout, publisher, registry, rooms[seed % args.rooms], seed)
+        for seed in range(args.sessions)
+    ]
+    listeners = [asyncio.create_task(session.listen()) for session in sessions]
+    while not all(fanout.is_connected(room) for room in rooms):
+        await asyncio.sleep(0.01)
+
+    cpu_started, started = time.process_time(), time.perf_counter()
+    drivers = [
+        asyncio.create_task(session.drive(args.rate, actions, weights))
+        for session in sessions
+    ]
+    await asyncio.sleep(args.duration)
+    for task in drivers:
+        task.cancel()
+    # Let in-flight publishes and deliveries settle before measuring.
+    await asyncio.sleep(publisher.window + 0.2)
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+    rss_after = _rss_bytes()
+
+    for task in listeners:
+        task.cancel()
+    await asyncio.gather(*drivers, *listeners, return_exceptions=True)
+    await redis_pool.close()
+
+    actions_done = sum(session.actions for session in sessions)
+    return {
+        "config": {
+            "transport": args.transport,
+            "sessions": args.sessions,
+            "rooms": args.rooms,
+            "rate_per_session": args.rate,
+            "duration_s": args.duration,
+            "mix": mix,
+            "coalesce_ms": publisher.window * 1000,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+        },
+        "throughput": {
+            "actions_per_sec": actions_done / elapsed,
+            "publishes_per_sec": publisher.sent / elapsed,
+            "deliveries_per_sec": metrics.messages_received / elapsed,
+            "applications_per_sec": metrics.state_applications / elapsed,
+        },
+        "counts": {
+            "actions": actions_done,
+            "publish_requested": publisher.requested,
+            "publish_sent": publisher.sent,
+            "publish_stale": publisher.stale,
+            "deliveries": metrics.messages_received,
+            "skipped": metrics.messages_skipped,
+            "applications": metrics.state_applications,
+            "dropped": fanout.messages_dropped,
+        },
+        "receive_latency": metrics.receive_latency.to_dict(),
+        "apply_latency": metrics.apply_latency.to_dict(),
+        "per_session": {
+            "cpu_ms_per_sec": cpu * 1000 / elapsed / args.sessions,
+            "cpu_utilisation": cpu / elapsed,
+            "rss_kb": (rss_after - rss_before) / 1024 / args.sessions,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transport", default="memory")
+    parser.add_argument("--url", default=REDIS_URL)
+    parser.add_argument("--fake", action="store_true", help="use in-process fakeredis")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--rooms", type=int, default=1, help="sessions split evenly")
+    parser.add_argument("--rate", type=float, default=0.5, help="edits/sec per session")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument(
+        "--mix",
+        default="select_product=1,change_quantity=2,update_discount_code=1",
+        help="relative weight of each edit",
+    )
+    parser.add_argument("--output", help="write the results as JSON to this path")
+    args = parser.parse_args()
+
+    redis_pool.url = args.url
+    if args.fake:
+        import fakeredis.aioredis
+
+        server = fakeredis.FakeServer()
+        redis_pool.use_client(
+            fakeredis.aioredis.FakeRedis(server=server, decode_responses=True),
+            raw=fakeredis.aioredis.FakeRedis(server=server),
+        )
+    result = asyncio.run(run(args))
+
+    if args.output:
+        with open(args.output, "w") as out:
+            json.dump(result, out, indent=2)
+    throughput, per_session = result["throughput"], result["per_session"]
+    print(f"{'actions/sec':<22} {throughput['actions_per_sec']:>10.0f}")
+    print(f"{'publishes/sec':<22} {throughput['publishes_per_sec']:>10.0f}")
+    print(f"{'deliveries/sec':<22} {throughput['deliveries_per_sec']:>10.0f}")
+    print(f"{'applications/sec':<22} {throughput['applications_per_sec']:>10.0f}")
+    for name in ("receive_latency", "apply_latency"):
+        hist = result[name]
+        print(
+            f"{name + ' ms':<22} p50 {hist['p50_us'] / 1000:.1f}  "
+            f"p95 {hist['p95_us'] / 1000:.1f}  p99 {hist['p99_us'] / 1000:.1f}"
+        )
+    print(f"{'cpu ms/sec/session':<22} {per_session['cpu_ms_per_sec']:>10.3f}")
+    print(f"{'rss KiB/session':<22} {per_session['rss_kb']:>10.1f}")
+    print(f"{'dropped':<22} {result['counts']['dropped']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Example 5 transports: delivery throughput and catch-up after a disconnect.
+
+Throughput is the rate at which published deltas reach a session through the
+worker fan-out. Catch-up publishes a burst while the session is away and
+times how long the reconnecting session takes to receive it: transports with
+history replay the missed entries, Pub/Sub can only re-read the snapshot.
+
+    python -m benchmarks.sync_transports --url redis://localhost:6379/0
+    python -m benchmarks.sync_transports --fake   # in-process fakeredis
+    python -m benchmarks.sync_transports --transports memory,unix
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from reflex_state_examples.sync.fanout import WorkerFanout
+from reflex_state_examples.sync.protocol import clock
+from reflex_state_examples.sync.redis_pool import REDIS_URL, redis_pool
+from reflex_state_examples.sync.transport import create_transport
+
+ROOM = "bench"
+
+
+async def _publish_burst(transport, count: int):
+    for i in range(count):
+        await transport.publish(
+            ROOM, "bench-writer", clock.now(), "bench", {"quantity": i}
+        )
+
+
+async def _receive(queue: asyncio.Queue, count: int) -> str | None:
+    last_id = None
+    received = 0
+    while received < count:
+        kind, data = await queue.get()
+        if kind == "message":
+            received += 1
+            last_id = data.get("id", last_id)
+    return last_id
+
+
+async def _connected(queue: asyncio.Queue):
+    while (await queue.get())[0] != "connected":
+        pass
+
+
+async def bench_transport(name: str, count: int, missed: int) -> dict:
+    channel = f"bench:example5:{name}"
+    transport = create_transport(channel, f"{channel}:state", name)
+    if name in ("pubsub", "streams"):
+        await redis_pool.client().delete(
+            transport.room_channel(ROOM), transport.room_key(ROOM)
+        )
+    fanout = WorkerFanout(transport, queue_size=count + missed + 16)
+
+    queue = fanout.register("bench-token", "bench-reader", ROOM)
+    await _connected(queue)
+    started = time.perf_counter()
+    receiver = asyncio.create_task(_receive(queue, count))
+    await _publish_burst(transport, count)
+    last_id = await receiver
+    elapsed = time.perf_counter() - started
+    fanout.unregister("bench-token", queue)
+
+    # The session is gone while `missed` more updates are published.
+    await _publish_burst(transport, missed)
+
+    started = time.perf_counter()
+    queue = fanout.register("bench-token", "bench-reader", ROOM, since=last_id)
+    recovered = 0
+    if last_id is not None:
+        recovered = missed
+        await _receive(queue, missed)
+    else:
+        await transport.get_snapshot(ROOM)
+    catch_up = time.perf_counter() - started
+    fanout.unregister("bench-token", queue)
+    await asyncio.sleep(0)
+    return {
+        "transport": name,
+        "messages_per_sec": count / elapsed,
+        "catch_up_ms": catch_up * 1000,
+        "missed": missed,
+        "recovered": recovered,
+    }
+
+
+async def run(transports: list[str], count: int, missed: int) -> list[dict]:
+    try:
+        return [await bench_transport(name, count, missed) for name in transports]
+    finally:
+        await redis_pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=REDIS_URL)
+    parser.add_argument("--fake", action="store_true", help="use in-process fakeredis")
+    parser.add_argument("--transports", default="pubsub,streams,memory,unix")
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--missed", type=int, default=500)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    redis_pool.url = args.url
+    if args.fake:
+        import fakeredis.aioredis
+
+        server = fakeredis.FakeServer()
+        redis_pool.use_client(
+            fakeredis.aioredis.FakeRedis(server=server, decode_responses=True),
+            raw=fakeredis.aioredis.FakeRedis(server=server),
+        )
+    transports = args.transports.split(",")
+    results = asyncio.run(run(transports, args.count, args.missed))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'transport':<10} {'msgs/sec':>10} {'catch-up ms':>12} {'recovered':>10}")
+    for row in results:
+        print(
+            f"{row['transport']:<10} {row['messages_per_sec']:>10.0f} "
+            f"{row['catch_up_ms']:>12.1f} {row['recovered']:>5}/{row['missed']:<4}"
+        )
+
+
+if __name__ == "__main__":
+    main()
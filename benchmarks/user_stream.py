@@ -0,0 +1,114 @@
+"""Example 3 fetch of a large user table: all at once vs streamed page by page.
+
+Reads ``--users`` users from a `UserSource` with no failures. "at once" is
+the previous `fetch_users`: wait for every row, then assign the ``users``
+list var and send it in one delta. "streamed" is the current one: each page
+updates a headless `ExampleThreeState` and goes to the page as a
+`ClientRows` patch of its own rows. "first" is when the first rows are ready
+to send, "total" when the last are.
+
+    python -m benchmarks.user_stream --users 10000 --page-sizes 50,500,2000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import reflex as rx
+from reflex.utils.format import json_dumps
+
+from reflex_state_examples.states.example_three import ExampleThreeState, user_rows
+from reflex_state_examples.users.source import (
+    CONNECT_MS,
+    PAGE_LATENCY_MS,
+    User,
+    UserSource,
+)
+
+
+class _AllAtOnceState(rx.State):
+    users: list[User] = []
+
+
+def _substate(root: rx.State, state_cls):
+    return root.get_substate(state_cls.get_full_name().split(".")[1:])
+
+
+def _patch_bytes(event) -> int:
+    # The patch travels as the JS of a `call_script` event.
+    return len(str(event.args[0][1]))
+
+
+async def at_once(source: UserSource, page_size: int) -> dict:
+    root = rx.State(_reflex_internal_init=True)
+    state = _substate(root, _AllAtOnceState)
+    root._clean()
+    started = time.perf_counter()
+    users = []
+    async for page in source.pages(page_size):
+        users.extend(page)
+    state.users = users
+    sent = len(json_dumps(root.get_delta()))
+    total = time.perf_counter() - started
+    return {"first_s": total, "total_s": total, "bytes": sent, "messages": 1}
+
+
+async def streamed(source: UserSource, page_size: int) -> dict:
+    root = rx.State(_reflex_internal_init=True)
+    state = _substate(root, ExampleThreeState)
+    root._clean()
+    started = time.perf_counter()
+    first = None
+    sent = messages = 0
+    async for page in source.pages(page_size):
+        rows = [user.model_dump() for user in page]
+        state._users.extend(page)
+        state.user_count = len(state._users)
+        sent += len(json_dumps(root.get_delta()))
+        root._clean()
+        sent += _patch_bytes(user_rows.append(*rows))
+        messages += 2
+        if first is None:
+            first = time.perf_counter() - started
+    total = time.perf_counter() - started
+    return {"first_s": first, "total_s": total, "bytes": sent, "messages": messages}
+
+
+async def run(args) -> list[dict]:
+    source = UserSource(args.users, args.connect_ms, args.page_latency_ms, 0)
+    results = []
+    for page_size in map(int, args.page_sizes.split(",")):
+        for mode, fetch in (("at once", at_once), ("streamed", streamed)):
+            result = await fetch(source, page_size)
+            results.append({"mode": mode, "page_size": page_size, **result})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--page-sizes", default="50,500,2000")
+    parser.add_argument("--connect-ms", type=float, default=CONNECT_MS)
+    parser.add_argument("--page-latency-ms", type=float, default=PAGE_LATENCY_MS)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(
+        f"{'mode':<9} {'page':>6} {'first s':>8} {'total s':>8} {'messages':>9} "
+        f"{'KiB':>8}"
+    )
+    for row in results:
+        print(
+            f"{row['mode']:<9} {row['page_size']:>6} {row['first_s']:>8.2f} "
+            f"{row['total_s']:>8.2f} {row['messages']:>9} {row['bytes'] / 1024:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""A counter whose clicks are summed in the browser and sent in batches.
+
+Every click on an ordinary counter is its own event: one round trip, one
+state delta. `batched_counter` instead adds clicks to a pending total in
+the page and sends it as one ``flush(n, seq)`` event once clicking pauses for
+``idle_ms``, or at the latest ``max_wait_ms`` after the first unsent click.
+The page shows the server's value plus whatever it has not seen applied yet:
+batches count as in flight until the state reports their ``seq`` in
+``applied``, so the number never jumps back while a batch is on the wire.
+The server stays the authority and applies each batch to its own value.
+"""
+
+from typing import NamedTuple
+
+import reflex as rx
+from reflex.event import EventChain, EventHandler
+from reflex.utils.imports import ImportVar
+from reflex.vars import VarData
+from reflex.vars.function import FunctionVar
+
+
+class BatchedCounter(NamedTuple):
+    value: rx.Var
+    increment: rx.Var
+    decrement: rx.Var
+
+
+def batched_counter(
+    name: str,
+    value: rx.Var,
+    applied: rx.Var,
+    flush: EventHandler,
+    idle_ms: int,
+    max_wait_ms: int,
+) -> BatchedCounter:
+    """Client-side batching for the counter ``value``.
+
+    ``flush`` must take ``(n, seq)``, add ``n`` and store ``seq`` in the state
+    var ``applied``. Sequence numbers start from the page's load time, so a
+    reloaded page never reuses one the state has already acknowledged.
+    """
+    send = rx.Var.create(
+        EventChain(
+            events=[flush(rx.Var("n").to(int), rx.Var("seq").to(int))],
+            args_spec=lambda: [],
+        )
+    )
+    batch = f"{name}.current"
+    hooks = {
+        f"const {name} = useRef({{pending: 0, seq: Date.now(), inflight: []}})": None,
+        f"const [, {name}_render] = useState(0)": None,
+        f"{batch}.flush = () => {{"
+        f" const batch = {batch};"
+        " clearTimeout(batch.idle); clearTimeout(batch.wait);"
+        " batch.idle = batch.wait = null;"
+        " if (!batch.pending) return;"
+        " const n = batch.pending; const seq = ++batch.seq;"
+        " batch.pending = 0; batch.inflight.push([seq, n]);"
+        f" ({send!s})(); }}": None,
+        f"{batch}.add = (delta) => {{"
+        f" const batch = {batch};"
+        " batch.pending += delta;"
+        " clearTimeout(batch.idle);"
+        f" batch.idle = setTimeout(() => batch.flush(), {idle_ms});"
+        f" batch.wait ??= setTimeout(() => batch.flush(), {max_wait_ms});"
+        f" {name}_render((render) => render + 1); }}": None,
+        # Send what is pending when the page goes away.
+        f"useEffect(() => () => {batch}.flush(), [])": None,
+        f"useEffect(() => {{ {batch}.inflight = {batch}.inflight"
+        f".filter(([seq]) => seq > {applied!s}); }}, [{applied!s}])": None,
+        f"const {name}_unseen = {batch}.pending + {batch}.inflight"
+        f".reduce((sum, [seq, n]) => (seq > {applied!s} ? sum + n : sum), 0)": None,
+    }
+    var_data = VarData.merge(
+        value._get_all_var_data(),
+        applied._get_all_var_data(),
+        send._get_all_var_data(),
+        VarData(
+            hooks=hooks,
+            imports={
+                "react": [
+                    ImportVar(tag="useRef"),
+                    ImportVar(tag="useState"),
+                    ImportVar(tag="useEffect"),
+                ]
+            },
+        ),
+    )
+
+    def add(delta: int) -> rx.Var:
+        return rx.Var(
+            _js_expr=f"() => {batch}.add({delta})", _var_data=var_data
+        ).to(FunctionVar, EventChain)
+
+    return BatchedCounter(
+        value=rx.Var(
+            _js_expr=f"({value!s} + {name}_unseen)", _var_data=var_data
+        ).to(int),
+        increment=add(1),
+        decrement=add(-1),
+    )
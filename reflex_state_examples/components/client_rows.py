@@ -0,0 +1,59 @@
+"""A list of rows kept in the browser and patched by the server row by row.
+
+Reflex sends a changed list var to the client whole, so a one-line change to
+a long list costs the full list on the wire. States that need long lists keep
+them in a backend var instead, and return one of these patches from their
+event handlers: only the rows that changed travel, as a small script that
+updates a client state var the page renders from.
+"""
+
+import json
+
+import reflex as rx
+from reflex.event import EventSpec
+from reflex.experimental.client_state import ClientStateVar, _client_state_ref
+
+
+def _json(value) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+class ClientRows:
+    """Rows with a unique ``"id"``, held in the client state var ``name``.
+
+    Include `var` in the page once, above everything that renders `rows`.
+    """
+
+    def __init__(self, name: str):
+        self.var = ClientStateVar.create(name, [])
+        self._current = f"({_client_state_ref(name)} ?? [])"
+
+    @property
+    def rows(self) -> rx.Var:
+        return self.var.value.to(list[dict])
+
+    def replace(self, rows: list[dict]) -> EventSpec:
+        """Send the full list, e.g. when a page (re)connects."""
+        return self.var.push(rx.Var(_json(rows)))
+
+    def upsert(self, *rows: dict) -> EventSpec:
+        """Replace rows in place by ID, appending the ones not shown yet."""
+        return self._patch(
+            "((rows, changed) => { const next = rows.slice();"
+            " for (const row of changed) {"
+            " const i = next.findIndex((r) => r.id === row.id);"
+            " if (i < 0) next.push(row); else next[i] = row; }"
+            f" return next; }})({self._current}, {_json(rows)})"
+        )
+
+    def append(self, *rows: dict) -> EventSpec:
+        """Add rows after the ones shown, e.g. the next page of a stream."""
+        return self._patch(f"{self._current}.concat({_json(rows)})")
+
+    def remove(self, *row_ids) -> EventSpec:
+        return self._patch(
+            f"{self._current}.filter((r) => !{_json(row_ids)}.includes(r.id))"
+        )
+
+    def _patch(self, expression: str) -> EventSpec:
+        return self.var.push(rx.Var(expression))
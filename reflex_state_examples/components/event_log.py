@@ -0,0 +1,101 @@
+"""A bounded event log whose updates reach the browser as appended entries.
+
+A ``list[str]`` log var is re-sent whole on every event that touches it, and
+trimming it with ``insert(0, ...)``/``pop()`` shifts every entry. States that
+inherit `EventLogState` keep the log in a backend ring buffer instead and only
+send the entries logged since the last delta (`event_log_batch`). The page
+keeps its own copy, newest first: `event_log_entries` prepends each batch and
+evicts entries past the capacity, so an event costs the same on the wire for a
+log of five entries or five thousand.
+"""
+
+import collections
+from collections.abc import Iterable
+
+import reflex as rx
+from reflex.utils.imports import ImportVar
+from reflex.vars import VarData
+
+
+class EventLog:
+    """The last ``capacity`` messages, numbered in the order they were logged."""
+
+    def __init__(self, capacity: int, initial: Iterable[str] = ()):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.entries: collections.deque[tuple[int, str]] = collections.deque(
+            maxlen=capacity
+        )
+        self.seq = 0
+        for message in initial:
+            self.append(message)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def append(self, message: str) -> tuple[int, str]:
+        """Log ``message``, evicting the oldest entry when full."""
+        self.seq += 1
+        entry = (self.seq, message)
+        self.entries.append(entry)
+        return entry
+
+    def snapshot(self) -> dict:
+        """A batch that replaces whatever the page shows with the whole log."""
+        return {"reset": True, "entries": list(self.entries)}
+
+
+class EventLogState(rx.State, mixin=True):
+    """Adds `_log_event` and a client-side log to a state.
+
+    Override ``_event_log`` to set the capacity or initial entries, and give
+    ``event_log_batch`` the matching ``snapshot()`` so the first render shows
+    them. Call `send_event_log` when the page mounts.
+    """
+
+    _event_log: EventLog = EventLog(5)
+    # Entries logged since the last delta, oldest first. A reset batch
+    # replaces the page's copy instead of extending it.
+    event_log_batch: dict = {"reset": True, "entries": []}
+
+    def _log_event(self, message: str):
+        entry = self._event_log.append(message)
+        if "event_log_batch" in self.dirty_vars:
+            # Still unsent: extend it, keeping no more than the page can show.
+            batch = self.event_log_batch
+            entries = [*batch["entries"], entry][-self._event_log.capacity :]
+            self.event_log_batch = {"reset": batch["reset"], "entries": entries}
+        else:
+            self.event_log_batch = {"reset": False, "entries": [entry]}
+
+    @rx.event
+    def send_event_log(self):
+        """Send the whole log, for a page that (re)mounted on this session."""
+        self.event_log_batch = self._event_log.snapshot()
+
+
+def event_log_entries(state: type[EventLogState]) -> rx.Var:
+    """The page's copy of ``state``'s log as ``[seq, message]`` pairs, newest first."""
+    batch = state.event_log_batch
+    capacity = state.backend_vars["_event_log"].capacity
+    name = f"event_log_{state.get_name()}"
+    setter = f"set_{name}"
+    effect = (
+        f"useEffect(() => {setter}((shown) => {{"
+        f" const batch = {batch!s};"
+        " if (!batch) return shown;"
+        f" if (batch.reset) return batch.entries.slice(-{capacity}).reverse();"
+        " const newest = shown.length ? shown[0][0] : 0;"
+        " const added = batch.entries.filter(([seq]) => seq > newest).reverse();"
+        f" return added.length ? [...added, ...shown].slice(0, {capacity}) : shown;"
+        f" }}), [{batch!s}])"
+    )
+    var_data = VarData.merge(
+        batch._get_all_var_data(),
+        VarData(
+            hooks={f"const [{name}, {setter}] = useState([])": None, effect: None},
+            imports={"react": [ImportVar(tag="useState"), ImportVar(tag="useEffect")]},
+        ),
+    )
+    return rx.Var(_js_expr=name, _var_data=var_data).to(list[tuple[int, str]])
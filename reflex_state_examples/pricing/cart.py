@@ -0,0 +1,114 @@
+"""A multi-line cart whose totals are kept up to date as lines change.
+
+Adding, updating or removing a line adjusts the running subtotal and item
+count by that line's difference, so a change costs the same for a cart of
+three lines or three hundred. Repeated float additions drift, so every
+``PRICING_CART_RESUM_EVERY`` changes the subtotal is summed again exactly
+with `math.fsum`; an emptied cart is reset to exactly zero.
+"""
+
+import dataclasses
+import math
+import os
+
+from reflex_state_examples.pricing import discounts, engine
+from reflex_state_examples.pricing.catalog import Product
+
+RESUM_EVERY = int(os.getenv("PRICING_CART_RESUM_EVERY", "1000"))
+
+
+@dataclasses.dataclass(slots=True)
+class CartLine:
+    line_id: int
+    product_id: int
+    name: str
+    unit_price: float
+    quantity: int
+
+    @property
+    def amount(self) -> float:
+        return self.unit_price * self.quantity
+
+    def to_row(self) -> dict:
+        """The line as the page shows it."""
+        return {
+            "id": self.line_id,
+            "product_id": self.product_id,
+            "name": self.name,
+            "unit_price": self.unit_price,
+            "quantity": self.quantity,
+            "amount": self.amount,
+        }
+
+
+class Cart:
+    """Lines by ID, one per product, with their subtotal and item count."""
+
+    def __init__(self, resum_every: int = RESUM_EVERY):
+        self.resum_every = resum_every
+        self.lines: dict[int, CartLine] = {}
+        self.subtotal = 0.0
+        self.quantity = 0
+        self._by_product: dict[int, int] = {}
+        self._next_id = 1
+        self._changes = 0
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def add(self, product: Product, quantity: int) -> CartLine:
+        """Add ``quantity`` of ``product``, to its existing line if it has one.
+
+        The line keeps the unit price the product had when it was first added.
+        """
+        if quantity < 1:
+            raise ValueError("quantity must be at least 1")
+        line_id = self._by_product.get(product.id)
+        if line_id is not None:
+            return self.update(line_id, self.lines[line_id].quantity + quantity)
+        line = CartLine(self._next_id, product.id, product.name, product.price, 0)
+        self._next_id += 1
+        self.lines[line.line_id] = line
+        self._by_product[product.id] = line.line_id
+        return self.update(line.line_id, quantity)
+
+    def update(self, line_id: int, quantity: int) -> CartLine:
+        """Set a line's quantity; raises KeyError for an unknown line."""
+        if quantity < 1:
+            raise ValueError("quantity must be at least 1; remove the line instead")
+        line = self.lines[line_id]
+        before, previous = line.amount, line.quantity
+        line.quantity = quantity
+        self._changed(line.amount - before, quantity - previous)
+        return line
+
+    def remove(self, line_id: int) -> CartLine:
+        """Drop a line; raises KeyError for an unknown line."""
+        line = self.lines.pop(line_id)
+        del self._by_product[line.product_id]
+        self._changed(-line.amount, -line.quantity)
+        return line
+
+    def clear(self):
+        self.lines.clear()
+        self._by_product.clear()
+        self.resum()
+
+    def resum(self):
+        """Recompute the subtotal exactly from the lines."""
+        self.subtotal = math.fsum(line.amount for line in self.lines.values())
+        self.quantity = sum(line.quantity for line in self.lines.values())
+        self._changes = 0
+
+    def quote(self, discount_code: str, tax_rate: float) -> engine.Quote:
+        """Totals for the whole cart; quantity tiers count every item in it."""
+        percent = discounts.active_rules().percent(discount_code, self.quantity)
+        return engine.quote_subtotal(self.subtotal, percent, tax_rate)
+
+    def _changed(self, amount: float, quantity: int):
+        self.quantity += quantity
+        self._changes += 1
+        if not self.lines or self._changes >= self.resum_every:
+            self.resum()
+        else:
+            self.subtotal += amount
@@ -0,0 +1,79 @@
+import os
+from collections.abc import Iterable, Iterator, Mapping
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel, ConfigDict
+
+if TYPE_CHECKING:
+    from reflex_state_examples.pricing.mmap_catalog import MmapCatalog
+
+CATALOG_PATH = os.getenv("PRICING_CATALOG_PATH", "")
+PICKER_LIMIT = int(os.getenv("PRICING_PICKER_LIMIT", "200"))
+
+
+class Product(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    id: int
+    name: str
+    price: float
+    icon: str
+
+
+class Catalog:
+    """Process-wide, read-only product list with an ID index.
+
+    States keep only the selected ID and look products up here, so a session
+    costs the same whatever the catalog size, and the catalog is never part of
+    a state delta.
+    """
+
+    def __init__(self, products: Iterable[Product]):
+        self._products = tuple(products)
+        if not self._products:
+            raise ValueError("A catalog needs at least one product")
+        self._by_id: Mapping[int, Product] = MappingProxyType(
+            {product.id: product for product in self._products}
+        )
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    def __iter__(self) -> Iterator[Product]:
+        return iter(self._products)
+
+    def __contains__(self, product_id: int) -> bool:
+        return product_id in self._by_id
+
+    @property
+    def first(self) -> Product:
+        return self._products[0]
+
+    def get(self, product_id: int) -> Product:
+        """The product with ``product_id``, or the first product if there is none."""
+        return self._by_id.get(product_id, self._products[0])
+
+    def prices(self) -> dict[int, float]:
+        """Unit price by ID, in catalog order (see `batch.quote_batch`)."""
+        return {product.id: product.price for product in self._products}
+
+
+DEMO_PRODUCTS = (
+    Product(id=1, name="Neural Link Cable", price=49.99, icon="zap"),
+    Product(id=2, name="Quantum Processor", price=899.0, icon="cpu"),
+    Product(id=3, name="Holographic Display", price=249.5, icon="monitor"),
+    Product(id=4, name="Bio-Metric Scanner", price=120.0, icon="fingerprint"),
+)
+
+
+def load_catalog(path: str = CATALOG_PATH) -> "Catalog | MmapCatalog":
+    """The demo products, or the file at ``PRICING_CATALOG_PATH`` if it is set."""
+    if path:
+        from reflex_state_examples.pricing.mmap_catalog import MmapCatalog
+
+        return MmapCatalog(path)
+    return Catalog(DEMO_PRODUCTS)
+
+
+catalog = load_catalog()
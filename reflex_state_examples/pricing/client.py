@@ -0,0 +1,137 @@
+"""The quote formulas as frontend vars, for pricing in the browser.
+
+`client_quote` computes the same five numbers as `engine.quote` in the
+page component, so React recomputes them on every keystroke without a
+round trip. The discount rules travel with the page as a lookup table,
+which only makes sense for a small rule set: `client_rules` returns None
+above ``PRICING_CLIENT_MAX_CODES`` and the page then keeps pricing on the
+server. The server still prices the cart it receives and stays the
+authority; the page only shows the same arithmetic sooner.
+"""
+
+import json
+import math
+import os
+from typing import NamedTuple
+
+import reflex as rx
+from reflex.experimental.client_state import ClientStateVar
+from reflex.vars import VarData
+
+from reflex_state_examples.pricing import discounts
+
+CLIENT_MAX_CODES = int(os.getenv("PRICING_CLIENT_MAX_CODES", "1000"))
+
+# Mirrors `discounts.RuleSet.percent` and `engine.quote_line`, including the
+# order of the float operations, so both sides compute bit-identical totals.
+_QUOTE = """(table, unitPrice, rawQuantity, codes, taxRate) => {
+    const now = Date.now() / 1000;
+    const quantity = Math.max(1, Math.trunc(Number(rawQuantity)) || 1);
+    const percentOf = ([, tiers, starts, expires]) => {
+        if (starts !== null && now < starts) return 0;
+        if (expires !== null && now >= expires) return 0;
+        let percent = 0;
+        for (const [minQuantity, tierPercent] of tiers) {
+            if (quantity >= minQuantity) percent = tierPercent;
+        }
+        return percent;
+    };
+    const discountPercent = () => {
+        if (Object.hasOwn(table, codes)) return percentOf(table[codes]);
+        let single = 0;
+        let remaining = 1;
+        for (const code of new Set(codes.split(/[\\s,]+/))) {
+            if (!Object.hasOwn(table, code)) continue;
+            const percent = percentOf(table[code]);
+            if (table[code][0]) remaining *= 1 - percent;
+            else single = Math.max(single, percent);
+        }
+        return Math.max(single, 1 - remaining);
+    };
+    codes = String(codes).toUpperCase();
+    const subtotal = unitPrice * quantity;
+    const percent = discountPercent();
+    const discount = subtotal * percent;
+    const tax = (subtotal - discount) * taxRate;
+    return {
+        quantity,
+        subtotal,
+        discount_percent: percent,
+        discount_amount: discount,
+        tax_amount: tax,
+        total: subtotal - discount + tax,
+    };
+}"""
+
+
+class ClientQuote(NamedTuple):
+    """The fields of `engine.Quote`, as frontend vars."""
+
+    subtotal: rx.Var
+    discount_percent: rx.Var
+    discount_amount: rx.Var
+    tax_amount: rx.Var
+    total: rx.Var
+
+
+def client_rules(
+    rules: discounts.RuleSet, max_codes: int = CLIENT_MAX_CODES
+) -> dict[str, list] | None:
+    """The rule set as ``code -> [stackable, tiers, starts, expires]``.
+
+    Open-ended times are None. Returns None when there are too many codes to
+    ship with the page.
+    """
+    if len(rules) > max_codes:
+        return None
+    return {
+        rule.code: [
+            rule.stackable,
+            [list(tier) for tier in rule.tiers],
+            rule.starts_at if math.isfinite(rule.starts_at) else None,
+            rule.expires_at if math.isfinite(rule.expires_at) else None,
+        ]
+        for rule in rules
+    }
+
+
+def on_input(state_var: ClientStateVar) -> rx.Var:
+    """A DOM ``onInput`` handler keeping ``state_var`` equal to the input's value.
+
+    It runs beside the input's ``on_change`` event rather than in its chain,
+    which leaves ``on_change`` free for the debounced server update.
+    """
+    setter = state_var.set
+    return rx.Var(
+        _js_expr=f"(e) => ({setter!s})(e.target.value)",
+        _var_data=setter._get_all_var_data(),
+    )
+
+
+def client_quote(
+    name: str,
+    table: dict[str, list],
+    unit_price: rx.Var,
+    quantity: rx.Var,
+    discount_code: rx.Var,
+    tax_rate: rx.Var | float,
+) -> ClientQuote:
+    """The quote for the given frontend vars, computed once per render.
+
+    ``name`` becomes a constant in the page component, so the rule table and
+    the formulas are emitted once however many places show the quote.
+    """
+    args = [
+        rx.Var(json.dumps(table, separators=(",", ":"))),
+        *map(rx.Var.create, (unit_price, quantity, discount_code, tax_rate)),
+    ]
+    call = f"({_QUOTE})({', '.join(map(str, args))})"
+    var_data = VarData.merge(
+        *(arg._get_all_var_data() for arg in args),
+        VarData(hooks={f"const {name} = {call}": None}),
+    )
+    fields = {
+        field: rx.Var(_js_expr=f"{name}.{field}", _var_data=var_data).to(float)
+        for field in ClientQuote._fields
+    }
+    return ClientQuote(**fields)
@@ -0,0 +1,295 @@
+"""Discount codes compiled once into lookup tables, reloadable while serving.
+
+A rule file is a JSON list (or JSON Lines, for ``.jsonl``) of objects::
+
+    {"code": "SAVE10", "percent": 0.1}
+    {"code": "BULK", "tiers": [{"min_quantity": 10, "percent": 0.05},
+                               {"min_quantity": 50, "percent": 0.12}]}
+    {"code": "SPRING", "percent": 0.15, "min_quantity": 2,
+     "starts_at": "2026-03-20T00:00:00Z", "expires_at": "2026-06-21T00:00:00Z",
+     "stackable": true}
+
+Customers may enter several codes separated by commas or spaces. Stackable
+codes are applied one after the other; the best of that and the single best
+non-stackable code wins. Set ``PRICING_DISCOUNT_RULES`` to a rule file to
+replace the built-in demo codes; it is checked for changes every
+``PRICING_DISCOUNT_RELOAD_S`` seconds.
+"""
+
+import asyncio
+import bisect
+import contextlib
+import dataclasses
+import datetime
+import itertools
+import json
+import logging
+import math
+import os
+import re
+import time
+from array import array
+from collections.abc import Iterable, Iterator
+
+RULES_PATH = os.getenv("PRICING_DISCOUNT_RULES", "")
+RELOAD_INTERVAL_S = float(os.getenv("PRICING_DISCOUNT_RELOAD_S", "5"))
+
+_SEPARATORS = re.compile(r"[\s,]+")
+_SKIP = re.compile(r"[\s,]*")
+_generations = itertools.count()
+
+
+def normalize(code: str) -> str:
+    return code.strip().upper()
+
+
+def _timestamp(value) -> float | None:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str):
+        raise ValueError(f"Not a timestamp: {value!r}")
+    moment = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=datetime.timezone.utc)
+    return moment.timestamp()
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class DiscountRule:
+    """One code. ``tiers`` are ``(min_quantity, percent)``, ascending."""
+
+    code: str
+    tiers: tuple[tuple[int, float], ...]
+    starts_at: float = -math.inf
+    expires_at: float = math.inf
+    stackable: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DiscountRule":
+        if not isinstance(data, dict) or not isinstance(data.get("code"), str):
+            raise ValueError(f"Not a discount rule: {data!r}")
+        if "tiers" in data:
+            tiers = [
+                (int(tier["min_quantity"]), float(tier["percent"]))
+                for tier in data["tiers"]
+            ]
+        else:
+            tiers = [(int(data.get("min_quantity", 1)), float(data["percent"]))]
+        if not tiers or any(not 0 <= percent <= 1 for _, percent in tiers):
+            raise ValueError(f"{data.get('code')!r}: percents must be within 0..1")
+        starts_at = _timestamp(data.get("starts_at"))
+        expires_at = _timestamp(data.get("expires_at"))
+        return cls(
+            code=normalize(data["code"]),
+            tiers=tuple(sorted(tiers)),
+            starts_at=-math.inf if starts_at is None else starts_at,
+            expires_at=math.inf if expires_at is None else expires_at,
+            stackable=bool(data.get("stackable", False)),
+        )
+
+
+class RuleSet:
+    """Rules compiled into flat arrays, indexed by normalized code.
+
+    Looking up a code is one hash probe into a ``code -> row`` dict; the rows
+    live in typed arrays, so a set of hundreds of thousands of rules is a
+    handful of objects for the garbage collector rather than one per rule.
+
+    The sorted start and expiry times split time into periods during which no
+    rule changes state. `period` names the current one, so results cached
+    with it stay correct until a rule starts or expires.
+    """
+
+    def __init__(self, rules: Iterable[DiscountRule], source: str = ""):
+        self.source = source
+        self.generation = next(_generations)
+        self._rows: dict[str, int] = {}
+        self._starts = array("d")
+        self._expires = array("d")
+        self._stackable = bytearray()
+        # Row ``i``'s tiers are ``_tier_min[_tiers_at[i]:_tiers_at[i + 1]]``.
+        self._tiers_at = array("q", [0])
+        self._tier_min = array("q")
+        self._tier_percent = array("d")
+        boundaries = set()
+        for rule in rules:
+            if rule.code in self._rows:
+                raise ValueError(f"Duplicate discount code {rule.code!r}")
+            self._rows[rule.code] = len(self._starts)
+            self._starts.append(rule.starts_at)
+            self._expires.append(rule.expires_at)
+            self._stackable.append(rule.stackable)
+            for min_quantity, percent in rule.tiers:
+                self._tier_min.append(min_quantity)
+                self._tier_percent.append(percent)
+            self._tiers_at.append(len(self._tier_min))
+            boundaries.update(
+                moment
+                for moment in (rule.starts_at, rule.expires_at)
+                if math.isfinite(moment)
+            )
+        self._boundaries = array("d", sorted(boundaries))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[DiscountRule]:
+        return map(self.get, self._rows)
+
+    def get(self, code: str) -> DiscountRule | None:
+        code = normalize(code)
+        row = self._rows.get(code)
+        if row is None:
+            return None
+        tiers = slice(self._tiers_at[row], self._tiers_at[row + 1])
+        return DiscountRule(
+            code=code,
+            tiers=tuple(zip(self._tier_min[tiers], self._tier_percent[tiers])),
+            starts_at=self._starts[row],
+            expires_at=self._expires[row],
+            stackable=bool(self._stackable[row]),
+        )
+
+    def period(self, now: float | None = None) -> int:
+        if now is None:
+            now = time.time()
+        return bisect.bisect_right(self._boundaries, now)
+
+    def percent(
+        self, codes: str, quantity: int = 1, now: float | None = None
+    ) -> float:
+        """The discount for the codes entered, applying the stacking rules."""
+        if now is None:
+            now = time.time()
+        codes = codes.upper()
+        row = self._rows.get(codes)
+        if row is not None:
+            return self._percent(row, quantity, now)
+        single = 0.0
+        remaining = 1.0
+        for code in dict.fromkeys(_SEPARATORS.split(codes)):
+            row = self._rows.get(code)
+            if row is None:
+                continue
+            percent = self._percent(row, quantity, now)
+            if self._stackable[row]:
+                remaining *= 1 - percent
+            else:
+                single = max(single, percent)
+        return max(single, 1 - remaining)
+
+    def _percent(self, row: int, quantity: int, now: float) -> float:
+        if not self._starts[row] <= now < self._expires[row]:
+            return 0.0
+        start = self._tiers_at[row]
+        tier = bisect.bisect_right(
+            self._tier_min, quantity, start, self._tiers_at[row + 1]
+        )
+        return self._tier_percent[tier - 1] if tier > start else 0.0
+
+
+DEMO_RULES = RuleSet(
+    [
+        DiscountRule("REFLEX20", ((1, 0.2),)),
+        DiscountRule("DEVMODE", ((1, 0.5),)),
+        DiscountRule("SAVE10", ((1, 0.1),)),
+    ],
+    source="demo",
+)
+
+
+def _records(text: str) -> Iterator[dict]:
+    """The objects of a JSON list, or of JSON Lines, decoded one at a time.
+
+    Decoding a whole large file is a single C call that holds the GIL for its
+    full duration; one call per record lets the event loop run in between.
+    """
+    decoder = json.JSONDecoder()
+    end = len(text)
+    index = _SKIP.match(text, 0).end()
+    if text.startswith("[", index):
+        index += 1
+    while True:
+        index = _SKIP.match(text, index).end()
+        if index >= end or text[index] == "]":
+            return
+        record, index = decoder.raw_decode(text, index)
+        yield record
+
+
+def load_rules(path: str) -> RuleSet:
+    """Parse and compile a rule file. Blocking; see `reload_rules`."""
+    with open(path) as file:
+        text = file.read()
+    return RuleSet(map(DiscountRule.from_dict, _records(text)), source=path)
+
+
+_rules = DEMO_RULES
+_loaded_version: tuple[int, int] | None = None
+
+
+def active_rules() -> RuleSet:
+    return _rules
+
+
+def use_rules(rules: RuleSet):
+    """Replace the active rules; quotes in progress keep the set they started with."""
+    global _rules
+    _rules = rules
+
+
+async def reload_rules(path: str = RULES_PATH) -> bool:
+    """Load ``path`` if it changed since the last load; returns True if it did.
+
+    Parsing and compiling happen on a worker thread, and the new set replaces
+    the old one in a single assignment, so the event loop is never blocked
+    and never sees a half-built set. A file that fails to load leaves the
+    current rules in place.
+    """
+    global _loaded_version
+    try:
+        stat = await asyncio.to_thread(os.stat, path)
+    except FileNotFoundError:
+        logging.warning("Discount rule file %s not found", path)
+        return False
+    version = (stat.st_mtime_ns, stat.st_size)
+    if version == _loaded_version:
+        return False
+    try:
+        rules = await asyncio.to_thread(load_rules, path)
+    except (OSError, ValueError, KeyError, TypeError):
+        logging.exception("%s failed to load; keeping the current rules", path)
+        return False
+    _loaded_version = version
+    use_rules(rules)
+    return True
+
+
+async def _watch(path: str, interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await reload_rules(path)
+        except Exception:
+            # One bad reload must not stop the watcher for good.
+            logging.exception("Reloading %s failed", path)
+
+
+@contextlib.asynccontextmanager
+async def discount_rules_lifespan():
+    """App lifespan task that loads ``PRICING_DISCOUNT_RULES`` and watches it.
+
+    The first load finishes before the app starts serving, so no request is
+    priced with the demo codes when a rule file is configured.
+    """
+    if not RULES_PATH:
+        yield
+        return
+    await reload_rules(RULES_PATH)
+    task = asyncio.create_task(_watch(RULES_PATH, RELOAD_INTERVAL_S))
+    try:
+        yield
+    finally:
+        task.cancel()
@@ -0,0 +1,73 @@
+import dataclasses
+import functools
+import os
+
+from reflex_state_examples.pricing import discounts
+
+QUOTE_CACHE_SIZE = int(os.getenv("PRICING_QUOTE_CACHE_SIZE", "4096"))
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Quote:
+    """Everything the order summary shows, for one product line."""
+
+    subtotal: float
+    discount_percent: float
+    discount_amount: float
+    tax_amount: float
+    total: float
+
+
+def discount_percent(code: str, quantity: int = 1) -> float:
+    return discounts.active_rules().percent(code, quantity)
+
+
+def quote_subtotal(subtotal: float, percent: float, tax_rate: float) -> Quote:
+    """The arithmetic of a quote, once the subtotal and discount are known."""
+    discount = subtotal * percent
+    tax = (subtotal - discount) * tax_rate
+    return Quote(
+        subtotal=subtotal,
+        discount_percent=percent,
+        discount_amount=discount,
+        tax_amount=tax,
+        total=subtotal - discount + tax,
+    )
+
+
+def quote_line(
+    unit_price: float, quantity: int, percent: float, tax_rate: float
+) -> Quote:
+    return quote_subtotal(unit_price * quantity, percent, tax_rate)
+
+
+def quote(
+    unit_price: float, quantity: int, discount_code: str, tax_rate: float
+) -> Quote:
+    """Price a line in one pass.
+
+    Quotes are immutable and memoized on their inputs, so every state showing
+    the same cart shares one instance and recomputes nothing. The memo is also
+    keyed on the discount rules in force, so a reload or a code starting or
+    expiring is picked up on the next quote.
+    """
+    rules = discounts.active_rules()
+    return _quote(
+        unit_price, quantity, discount_code, tax_rate, rules.generation, rules.period()
+    )
+
+
+@functools.lru_cache(maxsize=QUOTE_CACHE_SIZE)
+def _quote(
+    unit_price: float,
+    quantity: int,
+    discount_code: str,
+    tax_rate: float,
+    generation: int,
+    period: int,
+) -> Quote:
+    # Keyed on the generation rather than the set itself, so stale entries do
+    # not keep replaced rule sets alive. Nothing can swap the rules between
+    # `quote` reading the generation and this call.
+    percent = discounts.active_rules().percent(discount_code, quantity)
+    return quote_line(unit_price, quantity, percent, tax_rate)
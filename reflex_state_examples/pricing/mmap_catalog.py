@@ -0,0 +1,173 @@
+"""A product catalog read from a fixed-record file through ``mmap``.
+
+Every worker maps the same file read-only, so millions of products cost one
+copy in the OS page cache instead of one heap copy per process, and opening
+the catalog reads nothing but the header. Build the file from CSV (columns
+``id,name,price,icon``) or a JSON list of the same objects:
+
+    python -m reflex_state_examples.pricing.mmap_catalog products.csv catalog.bin
+
+File layout, little-endian::
+
+    header   magic "RSECAT", version u16, count u64, name_size u16, icon_size u16
+    ids      count x i64, sorted ascending
+    records  count x (price f64, name, icon), the strings NUL-padded UTF-8
+
+The IDs sit in their own dense array so a lookup is a binary search over it
+followed by one record read at the same position.
+"""
+
+import argparse
+import bisect
+import csv
+import functools
+import json
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Iterable, Iterator
+
+from reflex_state_examples.pricing.catalog import Product
+
+MAGIC = b"RSECAT"
+VERSION = 1
+HEADER = struct.Struct("<6sHQHH")
+HEADER_SIZE = 32
+PRICE = struct.Struct("<d")
+CACHE_SIZE = int(os.getenv("PRICING_CATALOG_CACHE_SIZE", "1024"))
+
+
+class MmapCatalog:
+    """Read-only `catalog.Catalog` lookalike backed by a file built with `build`.
+
+    Products are decoded on access. The last ``cache_size`` distinct ones are
+    kept, since many sessions tend to look at the same few products.
+    """
+
+    def __init__(self, path: str | os.PathLike, cache_size: int = CACHE_SIZE):
+        if sys.byteorder != "little":
+            raise ValueError("MmapCatalog reads its IDs in place: little-endian only")
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, self._name_size, self._icon_size = HEADER.unpack_from(
+            self._map
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a version {VERSION} catalog file")
+        if not count:
+            raise ValueError("A catalog needs at least one product")
+        self._count = count
+        self._record_size = PRICE.size + self._name_size + self._icon_size
+        self._records_at = HEADER_SIZE + 8 * count
+        if len(self._map) != self._records_at + self._record_size * count:
+            raise ValueError(f"{self.path} is truncated")
+        self._ids = memoryview(self._map)[HEADER_SIZE : self._records_at].cast("q")
+        self._product = functools.lru_cache(maxsize=cache_size)(self._product)
+
+    def close(self):
+        self._product.cache_clear()
+        self._ids.release()
+        self._map.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Product]:
+        return (self._product(index) for index in range(self._count))
+
+    def __contains__(self, product_id: int) -> bool:
+        return self._index(product_id) is not None
+
+    @property
+    def first(self) -> Product:
+        return self._product(0)
+
+    def get(self, product_id: int) -> Product:
+        """The product with ``product_id``, or the first product if there is none."""
+        index = self._index(product_id)
+        return self._product(0 if index is None else index)
+
+    def prices(self) -> dict[int, float]:
+        """Unit price by ID, in ID order. Reads the whole file."""
+        return {
+            self._ids[index]: PRICE.unpack_from(self._map, self._offset(index))[0]
+            for index in range(self._count)
+        }
+
+    def _index(self, product_id: int) -> int | None:
+        index = bisect.bisect_left(self._ids, product_id)
+        if index < self._count and self._ids[index] == product_id:
+            return index
+        return None
+
+    def _offset(self, index: int) -> int:
+        return self._records_at + index * self._record_size
+
+    def _product(self, index: int) -> Product:
+        offset = self._offset(index)
+        (price,) = PRICE.unpack_from(self._map, offset)
+        offset += PRICE.size
+        name = self._map[offset : offset + self._name_size]
+        offset += self._name_size
+        icon = self._map[offset : offset + self._icon_size]
+        # Validating is cheaper than `model_construct` for four plain fields.
+        return Product(
+            id=self._ids[index],
+            name=name.rstrip(b"\0").decode(),
+            price=price,
+            icon=icon.rstrip(b"\0").decode(),
+        )
+
+
+def build(products: Iterable[Product], path: str | os.PathLike) -> int:
+    """Write ``products`` as a catalog file at ``path``; returns the count.
+
+    The file is written next to ``path`` and renamed over it, so workers that
+    already mapped the old file keep reading it until they reopen.
+    """
+    by_id: dict[int, Product] = {}
+    for product in products:
+        if product.id in by_id:
+            raise ValueError(f"Duplicate product id {product.id}")
+        by_id[product.id] = product
+    if not by_id:
+        raise ValueError("A catalog needs at least one product")
+    ids = sorted(by_id)
+    names = [by_id[product_id].name.encode() for product_id in ids]
+    icons = [by_id[product_id].icon.encode() for product_id in ids]
+    name_size = max(map(len, names))
+    icon_size = max(map(len, icons))
+
+    path = os.fspath(path)
+    partial = f"{path}.partial"
+    with open(partial, "wb") as file:
+        header = HEADER.pack(MAGIC, VERSION, len(ids), name_size, icon_size)
+        file.write(header.ljust(HEADER_SIZE, b"\0"))
+        file.write(struct.pack(f"<{len(ids)}q", *ids))
+        record = struct.Struct(f"<d{name_size}s{icon_size}s")
+        for product_id, name, icon in zip(ids, names, icons):
+            file.write(record.pack(by_id[product_id].price, name, icon))
+    os.replace(partial, path)
+    return len(ids)
+
+
+def read_products(path: str | os.PathLike) -> Iterator[Product]:
+    """Products from a CSV file with an ``id,name,price,icon`` header, or JSON."""
+    with open(path, newline="") as file:
+        if os.fspath(path).endswith(".json"):
+            rows = json.load(file)
+        else:
+            rows = csv.DictReader(file)
+        for row in rows:
+            yield Product(**row)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a memory-mapped catalog file.")
+    parser.add_argument("source", help="CSV or .json product list")
+    parser.add_argument("output", help="catalog file to write")
+    args = parser.parse_args()
+    count = build(read_products(args.source), args.output)
+    print(f"Wrote {count} products to {args.output}")
@@ -0,0 +1,273 @@
+"""Typeahead search over product names, one page of matches at a time.
+
+Every word of every name goes into one sorted list, so the words starting
+with a prefix are a contiguous run found with two binary searches. A query
+matches products that have, for each of its words, a name word starting with
+it. The rarest query word drives the scan, and scanning stops as soon as one
+page (plus one, to know whether there is more) has been found, so a keystroke
+costs about the same whether the catalog has a thousand products or millions.
+The exception is a query whose words are each common but rarely appear
+together, which has to scan further to fill its page.
+
+Building the index reads every name, which takes seconds for millions of
+products, so `search_index_lifespan` does it on a worker thread after startup
+(or opens the copy saved next to an mmap catalog file), and `find` scans the
+catalog off the event loop until it is ready.
+"""
+
+import asyncio
+import bisect
+import contextlib
+import itertools
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, NamedTuple
+
+from reflex_state_examples.pricing.catalog import Catalog, Product, catalog
+
+if TYPE_CHECKING:
+    from reflex_state_examples.pricing.mmap_catalog import MmapCatalog
+
+PAGE_SIZE = int(os.getenv("PRICING_SEARCH_PAGE_SIZE", "8"))
+
+MAGIC = b"RSEIDX"
+VERSION = 1
+HEADER = struct.Struct("<6sHQQQqQ")
+HEADER_SIZE = 64
+
+_WORD = re.compile(r"\w+")
+
+
+def words(text: str) -> list[str]:
+    return _WORD.findall(text.casefold())
+
+
+def _has_all(name_words: list[str], terms: list[str]) -> bool:
+    return all(any(word.startswith(term) for word in name_words) for term in terms)
+
+
+class SearchPage(NamedTuple):
+    products: list[Product]
+    has_more: bool
+
+
+class ProductIndex:
+    """Prefix index over the names of a `catalog.Catalog` or `MmapCatalog`.
+
+    Only IDs and name words are kept, in flat arrays: the words as one UTF-8
+    blob, which sorts like the strings it holds, with an array of start
+    offsets. Products are fetched from the catalog for the names checked and
+    the page returned. Matches are ordered by the name word that matched the
+    rarest query word, then by catalog order.
+
+    `save` writes the arrays to a file that `open` maps read-only, so workers
+    serving an mmap catalog share one copy of the index as well.
+    """
+
+    def __init__(self, products: "Catalog | MmapCatalog"):
+        self._catalog = products
+        self._ids = array("q")
+        entries = []
+        for position, product in enumerate(products):
+            self._ids.append(product.id)
+            entries.extend(
+                (word.encode(), position) for word in dict.fromkeys(words(product.name))
+            )
+        entries.sort()
+        self._starts = array("q", [0])
+        self._positions = array("q")
+        for word, position in entries:
+            self._starts.append(self._starts[-1] + len(word))
+            self._positions.append(position)
+        self._blob = b"".join(word for word, _ in entries)
+        self._blob_at = 0
+
+    @classmethod
+    def open(
+        cls,
+        path: str | os.PathLike,
+        products: "Catalog | MmapCatalog",
+        source: tuple[int, int] = (0, 0),
+    ) -> "ProductIndex":
+        """Map an index written by `save` for ``products``.
+
+        Raises ValueError if the file was saved for a different catalog, or a
+        different ``source`` (see `load_index`).
+        """
+        if sys.byteorder != "little":
+            raise ValueError("ProductIndex.open reads in place: little-endian only")
+        with open(path, "rb") as file:
+            index_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, entries, blob_size, mtime_ns, size = HEADER.unpack_from(
+            index_map
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{os.fspath(path)} is not a version {VERSION} index file")
+        if count != len(products) or (mtime_ns, size) != source:
+            raise ValueError(f"{os.fspath(path)} was saved for another catalog")
+        positions_at = HEADER_SIZE + 8 * (count + entries + 1)
+        blob_at = positions_at + 8 * entries
+        if len(index_map) != blob_at + blob_size:
+            raise ValueError(f"{os.fspath(path)} is truncated")
+        view = memoryview(index_map)
+        index = cls.__new__(cls)
+        index._catalog = products
+        index._ids = view[HEADER_SIZE : HEADER_SIZE + 8 * count].cast("q")
+        index._starts = view[HEADER_SIZE + 8 * count : positions_at].cast("q")
+        index._positions = view[positions_at:blob_at].cast("q")
+        index._blob = index_map
+        index._blob_at = blob_at
+        return index
+
+    def save(self, path: str | os.PathLike, source: tuple[int, int] = (0, 0)):
+        """Write the index for `open`, next to ``path`` and renamed over it."""
+        path = os.fspath(path)
+        partial = f"{path}.partial"
+        blob = self._blob[self._blob_at :]
+        with open(partial, "wb") as file:
+            header = HEADER.pack(
+                MAGIC, VERSION, len(self._ids), len(self._positions), len(blob), *source
+            )
+            file.write(header.ljust(HEADER_SIZE, b"\0"))
+            for values in (self._ids, self._starts, self._positions):
+                file.write(array("q", values).tobytes())
+            file.write(blob)
+        os.replace(partial, path)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def search(
+        self, query: str, offset: int = 0, limit: int = PAGE_SIZE
+    ) -> SearchPage:
+        """The products matching ``query``, skipping the first ``offset``."""
+        matches = self._matches(words(query))
+        found = list(itertools.islice(matches, offset, offset + limit + 1))
+        return SearchPage(
+            [self._catalog.get(self._ids[position]) for position in found[:limit]],
+            len(found) > limit,
+        )
+
+    def _word(self, entry: int) -> bytes:
+        start = self._blob_at + self._starts[entry]
+        return self._blob[start : self._blob_at + self._starts[entry + 1]]
+
+    def _range(self, prefix: str) -> range:
+        entries = range(len(self._positions))
+        prefix_bytes = prefix.encode()
+        start = bisect.bisect_left(entries, prefix_bytes, key=self._word)
+        # Every word starting with ``prefix`` sorts below this: 0xff is never
+        # part of UTF-8.
+        stop = bisect.bisect_left(entries, prefix_bytes + b"\xff", start, key=self._word)
+        return range(start, stop)
+
+    def _matches(self, terms: list[str]) -> Iterator[int]:
+        if not terms:
+            yield from range(len(self._ids))
+            return
+        ranges = {term: self._range(term) for term in terms}
+        driver = min(ranges, key=lambda term: len(ranges[term]))
+        rest = [term for term in ranges if term != driver]
+        seen = set()
+        for entry in ranges[driver]:
+            position = self._positions[entry]
+            if position in seen:
+                continue
+            seen.add(position)
+            if not rest or _has_all(
+                words(self._catalog.get(self._ids[position]).name), rest
+            ):
+                yield position
+
+
+def scan(
+    products: "Catalog | MmapCatalog",
+    query: str,
+    offset: int = 0,
+    limit: int = PAGE_SIZE,
+) -> SearchPage:
+    """`ProductIndex.search` without an index: matches in catalog order.
+
+    Reads the catalog until the page is filled, so a rare query reads all of
+    it. Run it on a worker thread.
+    """
+    terms = words(query)
+    matches = (product for product in products if _has_all(words(product.name), terms))
+    found = list(itertools.islice(matches, offset, offset + limit + 1))
+    return SearchPage(found[:limit], len(found) > limit)
+
+
+def load_index(products: "Catalog | MmapCatalog" = catalog) -> ProductIndex:
+    """Build the index of ``products``; slow for a large catalog.
+
+    For an mmap catalog the index is kept in ``<catalog file>.search``: a file
+    saved for the current catalog file is opened instead of building, and a
+    new build is saved there for the next worker to open.
+    """
+    path = getattr(products, "path", None)
+    if path is None:
+        return ProductIndex(products)
+    stat = os.stat(path)
+    source = (stat.st_mtime_ns, stat.st_size)
+    index_path = f"{path}.search"
+    with contextlib.suppress(FileNotFoundError, ValueError):
+        return ProductIndex.open(index_path, products, source)
+    index = ProductIndex(products)
+    try:
+        index.save(index_path, source)
+    except OSError:
+        logging.exception("Could not save the search index to %s", index_path)
+    return index
+
+
+_index: ProductIndex | None = None
+
+
+def product_index() -> ProductIndex | None:
+    """The index of the shared catalog, or None until it is ready."""
+    return _index
+
+
+async def find(query: str, offset: int = 0, limit: int = PAGE_SIZE) -> SearchPage:
+    """Search the shared catalog: through the index once it is ready, else `scan`.
+
+    While the index is loading, the scan runs on a worker thread, so a
+    keystroke never blocks the event loop.
+    """
+    index = _index
+    if index is not None:
+        return index.search(query, offset, limit)
+    return await asyncio.to_thread(scan, catalog, query, offset, limit)
+
+
+async def _load():
+    global _index
+    try:
+        _index = await asyncio.to_thread(load_index, catalog)
+    except Exception:
+        logging.exception("The search index failed to load; searches scan instead")
+
+
+@contextlib.asynccontextmanager
+async def search_index_lifespan():
+    """App lifespan task that loads the shared catalog's index off the event loop.
+
+    The app starts serving straight away; searches use `scan` until it is ready.
+    """
+    task = asyncio.create_task(_load())
+    try:
+        yield
+    finally:
+        task.cancel()
+
+
+def first_page(limit: int = PAGE_SIZE) -> SearchPage:
+    """What an empty query shows, without the index."""
+    products = list(itertools.islice(catalog, limit + 1))
+    return SearchPage(products[:limit], len(products) > limit)
@@ -1,11 +1,19 @@
 import reflex as rx
+from starlette.applications import Starlette
+from starlette.routing import Route
 from reflex_state_examples.components.layout import layout
 from reflex_state_examples.states.example_one import example_one_content
 from reflex_state_examples.states.example_two import example_two_content
 from reflex_state_examples.states.example_three import example_three_content
 from reflex_state_examples.states.example_four import example_four_content
-from reflex_state_examples.states.example_five import example_five_content
+from reflex_state_examples.states.example_five import (
+    example_five_content,
+    sync_metrics,
+)
+from reflex_state_examples.pricing.discounts import discount_rules_lifespan
+from reflex_state_examples.pricing.search import search_index_lifespan
 from reflex_state_examples.states.navigation import NavState
+from reflex_state_examples.sync.redis_pool import redis_pool_lifespan
 
 
 def inmemory_page() -> rx.Component:
@@ -42,7 +50,13 @@ app = rx.App(
             rel="stylesheet",
         ),
     ],
+    api_transformer=Starlette(
+        routes=[Route("/api/example5/metrics", sync_metrics)],
+    ),
 )
+app.register_lifespan_task(redis_pool_lifespan)
+app.register_lifespan_task(discount_rules_lifespan)
+app.register_lifespan_task(search_index_lifespan)
 app.add_page(inmemory_page, route="/in-memory")
 app.add_page(index, route="/", on_load=rx.redirect("/in-memory"))
 app.add_page(derived_page, route="/derived")
@@ -1,71 +1,90 @@
-import json
+import asyncio
+import itertools
 import os
-import time
 import uuid
 
-import redis.asyncio as redis
 import reflex as rx
-from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from reflex_state_examples.components.event_log import (
+    EventLog,
+    EventLogState,
+    event_log_entries,
+)
+from reflex_state_examples.pricing import engine as pricing
+from reflex_state_examples.pricing.catalog import PICKER_LIMIT, Product, catalog
+from reflex_state_examples.sync.fanout import WorkerFanout, drain
+from reflex_state_examples.sync.metrics import elapsed_us, metrics
+from reflex_state_examples.sync.protocol import DEFAULT_ROOM, SyncSessions, room_name
+from reflex_state_examples.sync.publisher import CoalescingPublisher
+from reflex_state_examples.sync.snapshot_cache import SnapshotCache
+from reflex_state_examples.sync.supervisor import ListenerSupervisor
+from reflex_state_examples.sync.transport import create_transport
 
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 REDIS_CHANNEL = os.getenv("REDIS_CHANNEL", "reflex:example5")
 REDIS_STATE_KEY = os.getenv("REDIS_STATE_KEY", "reflex:example5:state")
+EVENT_LOG_SIZE = int(os.getenv("EXAMPLE5_EVENT_LOG_SIZE", "6"))
+
+transport = create_transport(REDIS_CHANNEL, REDIS_STATE_KEY)
+fanout = WorkerFanout(transport)
+publisher = CoalescingPublisher(transport)
+sync_sessions = SyncSessions()
+supervisor = ListenerSupervisor()
+snapshots = SnapshotCache(transport)
 
 
-class Product(BaseModel):
-    id: int
-    name: str
-    price: float
-    icon: str
+async def sync_metrics(request: Request) -> JSONResponse:
+    """This worker's Example 5 counters and latency percentiles."""
+    return JSONResponse(
+        {
+            **metrics.snapshot(),
+            "transport": transport.name,
+            "sessions": fanout.session_count,
+            "rooms": fanout.room_count,
+            "listeners": supervisor.stats(),
+            "snapshot_cache": snapshots.stats(),
+            "fanout_received": fanout.messages_received,
+            "fanout_dropped": fanout.messages_dropped,
+            "publish_requested": publisher.requested,
+            "publish_sent": publisher.sent,
+            "publish_stale": publisher.stale,
+        }
+    )
 
 
-class ExampleFiveState(rx.State):
+class ExampleFiveState(EventLogState, rx.State):
     """Derived state synced through Redis Pub/Sub."""
 
-    products: list[Product] = [
-        Product(id=1, name="Neural Link Cable", price=49.99, icon="zap"),
-        Product(id=2, name="Quantum Processor", price=899.0, icon="cpu"),
-        Product(id=3, name="Holographic Display", price=249.5, icon="monitor"),
-        Product(id=4, name="Bio-Metric Scanner", price=120.0, icon="fingerprint"),
-    ]
-    selected_product_id: int = 1
+    selected_product_id: int = catalog.first.id
     quantity: int = 1
     discount_code: str = ""
     tax_rate: float = 0.0825
 
     session_id: str = ""
+    room: str = DEFAULT_ROOM
     connection_status: str = "disconnected"
     is_listening: bool = False
     last_message: str = "None"
-    event_log: list[str] = []
+    publish_stats: str = "0 sent / 0 requested"
+    inbound_stats: str = "0 applied / 0 received"
+    latency_stats: str = "No samples yet"
+    listener_stats: str = "0 live / 0 leaked / 0 restarted"
+    _event_log: EventLog = EventLog(EVENT_LOG_SIZE)
+    _stream_cursor: str = ""
 
     @rx.var
     def selected_product(self) -> Product:
-        for p in self.products:
-            if p.id == self.selected_product_id:
-                return p
-        return self.products[0]
-
-    @rx.var
-    def subtotal(self) -> float:
-        return self.selected_product.price * self.quantity
-
-    @rx.var
-    def discount_percent(self) -> float:
-        codes = {"REFLEX20": 0.2, "DEVMODE": 0.5, "SAVE10": 0.1}
-        return codes.get(self.discount_code.upper(), 0.0)
-
-    @rx.var
-    def discount_amount(self) -> float:
-        return self.subtotal * self.discount_percent
+        return catalog.get(self.selected_product_id)
 
     @rx.var
-    def tax_amount(self) -> float:
-        return (self.subtotal - self.discount_amount) * self.tax_rate
-
-    @rx.var
-    def total(self) -> float:
-        return self.subtotal - self.discount_amount + self.tax_amount
+    def quote(self) -> pricing.Quote:
+        return pricing.quote(
+            self.selected_product.price,
+            self.quantity,
+            self.discount_code,
+            self.tax_rate,
+        )
 
     def _build_payload(self) -> dict:
         return {
@@ -85,35 +104,39 @@ class ExampleFiveState(rx.State):
         if "tax_rate" in payload:
             self.tax_rate = float(payload["tax_rate"])
 
-    def _log_event(self, message: str):
-        self.event_log.insert(0, message)
-        if len(self.event_log) > 6:
-            self.event_log.pop()
-
-    async def _publish_state(self, label: str, payload: dict):
-        message = {
-            "origin": self.session_id,
-            "label": label,
-            "payload": payload,
-        }
-        client = redis.from_url(REDIS_URL, decode_responses=True)
+    async def _publish_state(self, label: str, payload: dict, force: bool = False):
+        # Held only for the publish unless a listener holds it too, so the
+        # payload should carry just the fields the caller changed.
+        session = sync_sessions.acquire(self.session_id, room=self.room)
         try:
-            state_record = {
-                "label": label,
-                "payload": payload,
-                "updated_at": time.time(),
-            }
-            await client.set(REDIS_STATE_KEY, json.dumps(state_record))
-            await client.publish(REDIS_CHANNEL, json.dumps(message))
+            if not session.stage(payload, force=force):
+                return
+            sent = await publisher.publish(session, label)
             async with self:
-                self.last_message = f"Sent: {label}"
-                self._log_event(self.last_message)
+                self.publish_stats = (
+                    f"{publisher.sent} sent / {publisher.requested} requested"
+                )
+                if sent:
+                    self.last_message = f"Sent: {label}"
+                    self._log_event(self.last_message)
         except Exception as exc:
             async with self:
                 self.connection_status = "error"
                 self._log_event(f"Publish failed: {exc}")
         finally:
-            await client.close()
+            sync_sessions.release(self.session_id)
+
+    async def _hydrate(self, sync, room: str) -> str | None:
+        """Catch up with the room's stored record; return an error, if any."""
+        try:
+            changed = sync.merge_snapshot(await snapshots.get(room))
+        except Exception as exc:
+            return str(exc)
+        if changed:
+            async with self:
+                self._apply_payload(changed)
+                self._log_event("Loaded room snapshot")
+        return None
 
     @rx.event(background=True)
     async def listen_redis(self):
@@ -123,44 +146,136 @@ class ExampleFiveState(rx.State):
             if not self.session_id:
                 self.session_id = uuid.uuid4().hex
             self.is_listening = True
+            # Open the page with ?room=<name> to sync with that room only.
+            room = room_name(self.router.url.query_parameters.get("room"))
+            if room != self.room:
+                # Stream IDs are per room; another room's cursor means nothing.
+                self.room = room
+                self._stream_cursor = ""
             self.connection_status = "connecting"
             self.last_message = "Waiting for messages..."
-        client = redis.from_url(REDIS_URL, decode_responses=True)
-        pubsub = client.pubsub()
-        try:
-            await pubsub.subscribe(REDIS_CHANNEL)
+            token = self.router.session.client_token
+            session_id = self.session_id
+            payload = self._build_payload()
+            since = self._stream_cursor
+        if not supervisor.attach(token):
             async with self:
-                self.connection_status = "connected"
-                self._log_event("Connected to Redis")
-            async for message in pubsub.listen():
-                if message.get("type") != "message":
-                    continue
+                self.is_listening = False
+                self.connection_status = "error"
+                self._log_event("Too many listeners on this worker; try again later")
+            return
+        sync = sync_sessions.acquire(session_id, payload, room)
+        attempt = 0
+        running = True
+        try:
+            while running:
+                queue = fanout.register(token, session_id, room, since=since)
                 try:
-                    data = json.loads(message.get("data", "{}"))
-                except json.JSONDecodeError:
-                    async with self:
-                        self._log_event("Ignored malformed message")
-                    continue
-                if data.get("origin") == self.session_id:
-                    continue
-                payload = data.get("payload", {})
-                label = data.get("label", "Incoming update")
+                    # Per-field versions make the stored record and live
+                    # updates safe to apply in either order.
+                    error = await self._hydrate(sync, room)
+                    while running and error is None:
+                        status, error, label, cursor = None, None, None, None
+                        changed: set[str] = set()
+                        stamps: list[dict] = []
+                        resync = False
+                        # Merge everything that piled up since the last pass,
+                        # latest version per field, and apply it under a
+                        # single state lock.
+                        for kind, data in await drain(queue):
+                            if kind == "stop":
+                                running = False
+                                break
+                            if kind == "connected":
+                                status = "connected"
+                                continue
+                            if kind == "error":
+                                status, error = "error", data
+                                break
+                            if kind == "resync":
+                                # Updates were dropped while this tab lagged.
+                                resync = True
+                                continue
+                            metrics.messages_received += 1
+                            fields = sync.merge(
+                                data.get("fields", {}),
+                                int(data.get("seq", 0)),
+                                str(data.get("origin", "")),
+                            )
+                            if not fields:
+                                metrics.messages_skipped += 1
+                                continue
+                            changed.update(fields)
+                            label = data.get("label", "Incoming update")
+                            cursor = data.get("id") or cursor
+                            if "sent" in data:
+                                stamps.append(data["sent"])
+                        if resync and running and error is None:
+                            try:
+                                snapshot = await snapshots.get(room, fresh=True)
+                            except Exception as exc:
+                                status, error = "error", str(exc)
+                            else:
+                                fields = sync.merge_snapshot(snapshot)
+                                changed.update(fields)
+                                if fields:
+                                    label = label or "Room snapshot"
+                        if not changed and status is None:
+                            # Only stale or no-op updates: skip the state lock.
+                            continue
+                        if changed:
+                            metrics.state_applications += 1
+                        async with self:
+                            if status == "connected":
+                                attempt = 0
+                                self.connection_status = "connected"
+                                self.listener_stats = supervisor.summary()
+                                self._log_event("Connected to Redis")
+                            if changed:
+                                self._apply_payload(
+                                    {name: sync.values[name] for name in changed}
+                                )
+                                for stamp in stamps:
+                                    metrics.apply_latency.record(elapsed_us(stamp))
+                                self.latency_stats = metrics.latency_summary()
+                                if cursor:
+                                    self._stream_cursor = cursor
+                                self.last_message = f"Received: {label}"
+                                self._log_event(self.last_message)
+                                self.inbound_stats = (
+                                    f"{metrics.state_applications} applied / "
+                                    f"{metrics.messages_received} received"
+                                )
+                        if status == "error":
+                            break
+                finally:
+                    fanout.unregister(token, queue)
+                if not running:
+                    break
+                delay = supervisor.backoff(attempt)
+                attempt += 1
                 async with self:
-                    self._apply_payload(payload)
-                    self.last_message = f"Received: {label}"
-                    self._log_event(self.last_message)
-        except Exception as exc:
-            async with self:
-                self.connection_status = "error"
-                self._log_event(f"Connection error: {exc}")
+                    self.connection_status = "reconnecting"
+                    self.listener_stats = supervisor.summary()
+                    self._log_event(
+                        f"Connection error: {error}; retrying in {delay:.1f}s"
+                    )
+                    since = self._stream_cursor
+                await asyncio.sleep(delay)
         finally:
-            try:
-                await pubsub.unsubscribe(REDIS_CHANNEL)
-                await pubsub.close()
-            finally:
-                await client.close()
-                async with self:
-                    self.is_listening = False
+            supervisor.detach(token)
+            sync_sessions.release(session_id)
+            async with self:
+                self.is_listening = False
+                self.listener_stats = supervisor.summary()
+                if self.connection_status != "error":
+                    self.connection_status = "disconnected"
+
+    @rx.event
+    def stop_listening(self):
+        # Cancel rather than signal the fanout queue: while retrying, the
+        # listener is asleep with no queue registered to receive a stop.
+        supervisor.stop(self.router.session.client_token)
 
     @rx.event(background=True)
     async def select_product(self, val: str):
@@ -168,7 +283,7 @@ class ExampleFiveState(rx.State):
             if not self.session_id:
                 self.session_id = uuid.uuid4().hex
             self.selected_product_id = int(val)
-            payload = self._build_payload()
+            payload = {"selected_product_id": self.selected_product_id}
         await self._publish_state("Product changed", payload)
 
     @rx.event(background=True)
@@ -180,7 +295,7 @@ class ExampleFiveState(rx.State):
                 self.quantity = max(1, int(val))
             except (TypeError, ValueError):
                 self.quantity = 1
-            payload = self._build_payload()
+            payload = {"quantity": self.quantity}
         await self._publish_state("Quantity changed", payload)
 
     @rx.event(background=True)
@@ -189,7 +304,7 @@ class ExampleFiveState(rx.State):
             if not self.session_id:
                 self.session_id = uuid.uuid4().hex
             self.discount_code = code
-            payload = self._build_payload()
+            payload = {"discount_code": self.discount_code}
         await self._publish_state("Discount code changed", payload)
 
     @rx.event(background=True)
@@ -198,7 +313,7 @@ class ExampleFiveState(rx.State):
             if not self.session_id:
                 self.session_id = uuid.uuid4().hex
             payload = self._build_payload()
-        await self._publish_state("Manual broadcast", payload)
+        await self._publish_state("Manual broadcast", payload, force=True)
 
 
 def summary_line(
@@ -225,6 +340,7 @@ def status_pill() -> rx.Component:
             ExampleFiveState.connection_status,
             ("connected", "px-2 py-1 rounded-full text-xs font-bold bg-green-100 text-green-700"),
             ("connecting", "px-2 py-1 rounded-full text-xs font-bold bg-amber-100 text-amber-700"),
+            ("reconnecting", "px-2 py-1 rounded-full text-xs font-bold bg-amber-100 text-amber-700"),
             ("error", "px-2 py-1 rounded-full text-xs font-bold bg-red-100 text-red-700"),
             "px-2 py-1 rounded-full text-xs font-bold bg-gray-100 text-gray-500",
         ),
@@ -256,10 +372,12 @@ def example_five_content() -> rx.Component:
                             class_name="block text-sm font-bold text-gray-700 mb-2",
                         ),
                         rx.el.select(
-                            rx.foreach(
-                                ExampleFiveState.products,
-                                lambda p: rx.el.option(p.name, value=p.id.to_string()),
-                            ),
+                            # The catalog is static: render it into the page once
+                            # rather than shipping it in every session's state.
+                            *[
+                                rx.el.option(p.name, value=str(p.id))
+                                for p in itertools.islice(catalog, PICKER_LIMIT)
+                            ],
                             on_change=ExampleFiveState.select_product,
                             class_name="w-full p-3 rounded-xl border border-gray-200 bg-white focus:ring-2 focus:ring-indigo-500 outline-none appearance-none",
                         ),
@@ -289,9 +407,9 @@ def example_five_content() -> rx.Component:
                             class_name="w-full p-3 rounded-xl border border-gray-200 focus:ring-2 focus:ring-indigo-500 outline-none",
                         ),
                         rx.cond(
-                            ExampleFiveState.discount_percent > 0,
+                            ExampleFiveState.quote.discount_percent > 0,
                             rx.el.p(
-                                f"Applied {ExampleFiveState.discount_percent * 100:.0f}% discount!",
+                                f"Applied {ExampleFiveState.quote.discount_percent * 100:.0f}% discount!",
                                 class_name="text-xs text-green-600 font-bold mt-2",
                             ),
                             None,
@@ -332,23 +450,25 @@ def example_five_content() -> rx.Component:
                             "Unit Price",
                             f"${ExampleFiveState.selected_product.price:.2f}",
                         ),
-                        summary_line("Subtotal", f"${ExampleFiveState.subtotal:.2f}"),
+                        summary_line(
+                            "Subtotal", f"${ExampleFiveState.quote.subtotal:.2f}"
+                        ),
                         rx.cond(
-                            ExampleFiveState.discount_amount > 0,
+                            ExampleFiveState.quote.discount_amount > 0,
                             summary_line(
                                 "Discount",
-                                f"-${ExampleFiveState.discount_amount:.2f}",
+                                f"-${ExampleFiveState.quote.discount_amount:.2f}",
                                 is_red=True,
                             ),
                             None,
                         ),
                         summary_line(
-                            "Tax (8.25%)", f"${ExampleFiveState.tax_amount:.2f}"
+                            "Tax (8.25%)", f"${ExampleFiveState.quote.tax_amount:.2f}"
                         ),
                         rx.el.div(class_name="my-4 border-t border-gray-100"),
                         summary_line(
                             "Total Amount",
-                            f"${ExampleFiveState.total:.2f}",
+                            f"${ExampleFiveState.quote.total:.2f}",
                             is_bold=True,
                         ),
                         class_name="bg-gray-50 p-6 rounded-2xl",
@@ -376,6 +496,30 @@ def example_five_content() -> rx.Component:
                                 f"Channel: {REDIS_CHANNEL}",
                                 class_name="text-xs text-gray-500",
                             ),
+                            rx.el.p(
+                                f"Listeners: {ExampleFiveState.listener_stats}",
+                                class_name="text-xs text-gray-500",
+                            ),
+                            rx.el.p(
+                                f"Room: {ExampleFiveState.room}",
+                                class_name="text-xs text-gray-500",
+                            ),
+                            rx.el.p(
+                                f"Transport: {transport.name}",
+                                class_name="text-xs text-gray-500",
+                            ),
+                            rx.el.p(
+                                f"Publishes: {ExampleFiveState.publish_stats}",
+                                class_name="text-xs text-gray-500",
+                            ),
+                            rx.el.p(
+                                f"Inbound: {ExampleFiveState.inbound_stats}",
+                                class_name="text-xs text-gray-500",
+                            ),
+                            rx.el.p(
+                                f"Latency: {ExampleFiveState.latency_stats}",
+                                class_name="text-xs text-gray-500",
+                            ),
                             rx.el.p(
                                 ExampleFiveState.last_message,
                                 class_name="text-xs text-indigo-600 font-semibold",
@@ -395,16 +539,16 @@ def example_five_content() -> rx.Component:
                             ),
                             rx.el.div(
                                 rx.foreach(
-                                    ExampleFiveState.event_log,
+                                    event_log_entries(ExampleFiveState),
                                     lambda item: rx.el.p(
-                                        item,
+                                        item[1],
                                         class_name="text-xs text-gray-600 mb-1",
                                     ),
                                 ),
-                                class_name="bg-white border border-gray-100 rounded-xl p-4",
+                                class_name="bg-white border border-gray-100 rounded-xl p-4 max-h-64 overflow-y-auto",
                             ),
                             rx.cond(
-                                ExampleFiveState.event_log.length() == 0,
+                                event_log_entries(ExampleFiveState).length() == 0,
                                 rx.el.p(
                                     "No activity yet.",
                                     class_name="text-xs text-gray-400 mt-2",
@@ -422,5 +566,6 @@ def example_five_content() -> rx.Component:
             class_name="grid grid-cols-1 lg:grid-cols-2 gap-8",
         ),
         class_name="animate-in fade-in slide-in-from-bottom-4 duration-700",
-        on_mount=ExampleFiveState.listen_redis,
+        on_mount=[ExampleFiveState.send_event_log, ExampleFiveState.listen_redis],
+        on_unmount=ExampleFiveState.stop_listening,
     )
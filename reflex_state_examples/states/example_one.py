@@ -1,15 +1,43 @@
+import contextlib
+import os
+
 import reflex as rx
 
+from reflex_state_examples.components.batched_counter import batched_counter
+from reflex_state_examples.components.event_log import (
+    EventLog,
+    EventLogState,
+    event_log_entries,
+)
+from reflex_state_examples.sync.shared_counter import CounterHub, create_counter
+from reflex_state_examples.sync.supervisor import ListenerSupervisor
+
+EVENT_LOG_SIZE = int(os.getenv("EXAMPLE1_EVENT_LOG_SIZE", "5"))
+BATCHED_COUNTER = os.getenv("EXAMPLE1_BATCHED_COUNTER", "") == "1"
+COUNTER_IDLE_MS = int(os.getenv("EXAMPLE1_COUNTER_IDLE_MS", "150"))
+COUNTER_MAX_WAIT_MS = int(os.getenv("EXAMPLE1_COUNTER_MAX_WAIT_MS", "500"))
+
+global_counter = CounterHub(create_counter())
+global_watchers = ListenerSupervisor()
 
-class ExampleOneState(rx.State):
+
+class ExampleOneState(EventLogState, rx.State):
     """Pure In-Memory State demonstration."""
 
     count: int = 0
+    # Sequence number of the last batch `add` applied.
+    count_applied: int = 0
     is_active: bool = False
     is_premium: bool = False
     username: str = "DemoUser"
     last_event: str = "None"
-    event_log: list[str] = ["Initial state loaded"]
+    _event_log: EventLog = EventLog(EVENT_LOG_SIZE, ["Initial state loaded"])
+    event_log_batch: dict = _event_log.snapshot()
+    # The site-wide counter every session shares (see `sync.shared_counter`).
+    global_count: int = 0
+    global_count_applied: int = 0
+    global_count_status: str = "connecting"
+    _watching_global_count: bool = False
 
     @rx.event
     def increment(self):
@@ -23,6 +51,55 @@ class ExampleOneState(rx.State):
         self.count -= 1
         self._log_event(f"Decrement: {self.count}")
 
+    @rx.event
+    def add(self, n: int, seq: int):
+        """Apply a batch of clicks from the batched counter."""
+        self.count += int(n)
+        self.count_applied = int(seq)
+        self._log_event(f"Add {int(n):+d}: {self.count}")
+
+    @rx.event
+    async def add_global(self, n: int, seq: int):
+        """Apply a batch of clicks to the site-wide counter."""
+        try:
+            self.global_count = await global_counter.add(
+                self.router.session.client_token, int(n)
+            )
+            self._log_event(f"Global {int(n):+d}: {self.global_count}")
+        except Exception as exc:
+            self.global_count_status = f"error: {exc}"
+        self.global_count_applied = int(seq)
+
+    @rx.event(background=True)
+    async def watch_global_count(self):
+        """Keep `global_count` current while the page is open."""
+        async with self:
+            if self._watching_global_count:
+                return
+            self._watching_global_count = True
+            token = self.router.session.client_token
+        try:
+            if not global_watchers.attach(token):
+                async with self:
+                    self.global_count_status = "too many watchers on this worker"
+                return
+            async with contextlib.aclosing(global_counter.watch()) as totals:
+                async for total in totals:
+                    async with self:
+                        self.global_count = total
+                        self.global_count_status = "live"
+        except Exception as exc:
+            async with self:
+                self.global_count_status = f"error: {exc}"
+        finally:
+            global_watchers.detach(token)
+            async with self:
+                self._watching_global_count = False
+
+    @rx.event
+    def stop_watching_global_count(self):
+        global_watchers.stop(self.router.session.client_token)
+
     @rx.event
     def toggle_active(self):
         """Boolean state toggle."""
@@ -38,9 +115,59 @@ class ExampleOneState(rx.State):
     def _log_event(self, event_msg: str):
         """Internal helper to update the event log."""
         self.last_event = event_msg
-        self.event_log.insert(0, event_msg)
-        if len(self.event_log) > 5:
-            self.event_log.pop()
+        super()._log_event(event_msg)
+
+
+def counter_controls():
+    """The value and buttons the counter card shows, batched in the browser or not."""
+    if not BATCHED_COUNTER:
+        return (
+            ExampleOneState.count,
+            ExampleOneState.decrement,
+            ExampleOneState.increment,
+        )
+    counter = batched_counter(
+        "example_one_counter",
+        ExampleOneState.count,
+        ExampleOneState.count_applied,
+        ExampleOneState.add,
+        COUNTER_IDLE_MS,
+        COUNTER_MAX_WAIT_MS,
+    )
+    return counter.value, counter.decrement, counter.increment
+
+
+def counter_body(
+    label: str, value: rx.Var, decrement, increment, footer=None
+) -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            rx.el.p(
+                label,
+                class_name="text-xs font-bold text-gray-400 uppercase tracking-widest mb-1",
+            ),
+            rx.el.p(
+                value.to_string(),
+                class_name="text-5xl font-black text-indigo-600 tabular-nums",
+            ),
+            class_name="text-center py-6 bg-indigo-50/50 rounded-2xl mb-6",
+        ),
+        rx.el.div(
+            rx.el.button(
+                rx.icon("minus", class_name="h-5 w-5"),
+                on_click=decrement,
+                class_name="flex-1 flex justify-center py-3 bg-white border border-gray-200 rounded-xl hover:bg-gray-50 transition-colors shadow-sm",
+            ),
+            rx.el.button(
+                rx.icon("plus", class_name="h-5 w-5"),
+                on_click=increment,
+                class_name="flex-1 flex justify-center py-3 bg-indigo-600 text-white rounded-xl hover:bg-indigo-700 transition-colors shadow-sm",
+            ),
+            class_name="flex gap-3",
+        ),
+        footer,
+        class_name="w-full",
+    )
 
 
 def concept_card(
@@ -63,7 +190,34 @@ def concept_card(
     )
 
 
+def global_counter_card() -> rx.Component:
+    counter = batched_counter(
+        "example_one_global_counter",
+        ExampleOneState.global_count,
+        ExampleOneState.global_count_applied,
+        ExampleOneState.add_global,
+        COUNTER_IDLE_MS,
+        COUNTER_MAX_WAIT_MS,
+    )
+    return concept_card(
+        "Shared State",
+        "One counter for every session on every worker, pushed a few times a second.",
+        counter_body(
+            "Site-wide Value",
+            counter.value,
+            counter.decrement,
+            counter.increment,
+            rx.el.p(
+                ExampleOneState.global_count_status,
+                class_name="mt-3 text-xs text-center text-gray-400",
+            ),
+        ),
+        "globe",
+    )
+
+
 def example_one_content() -> rx.Component:
+    count, decrement, increment = counter_controls()
     return rx.el.div(
         rx.el.div(
             rx.el.h1(
@@ -81,33 +235,7 @@ def example_one_content() -> rx.Component:
                 concept_card(
                     "Numeric State",
                     "A simple integer variable modified by event handlers.",
-                    rx.el.div(
-                        rx.el.div(
-                            rx.el.p(
-                                "Current Value",
-                                class_name="text-xs font-bold text-gray-400 uppercase tracking-widest mb-1",
-                            ),
-                            rx.el.p(
-                                ExampleOneState.count.to_string(),
-                                class_name="text-5xl font-black text-indigo-600 tabular-nums",
-                            ),
-                            class_name="text-center py-6 bg-indigo-50/50 rounded-2xl mb-6",
-                        ),
-                        rx.el.div(
-                            rx.el.button(
-                                rx.icon("minus", class_name="h-5 w-5"),
-                                on_click=ExampleOneState.decrement,
-                                class_name="flex-1 flex justify-center py-3 bg-white border border-gray-200 rounded-xl hover:bg-gray-50 transition-colors shadow-sm",
-                            ),
-                            rx.el.button(
-                                rx.icon("plus", class_name="h-5 w-5"),
-                                on_click=ExampleOneState.increment,
-                                class_name="flex-1 flex justify-center py-3 bg-indigo-600 text-white rounded-xl hover:bg-indigo-700 transition-colors shadow-sm",
-                            ),
-                            class_name="flex gap-3",
-                        ),
-                        class_name="w-full",
-                    ),
+                    counter_body("Current Value", count, decrement, increment),
                     "hash",
                 ),
                 concept_card(
@@ -187,6 +315,7 @@ def example_one_content() -> rx.Component:
                 ),
                 class_name="grid grid-cols-1 md:grid-cols-2 gap-8 mb-8",
             ),
+            rx.el.div(global_counter_card(), class_name="mb-8"),
             concept_card(
                 "Event Lifecycle Visualization",
                 "Observe how UI interactions trigger backend handlers which emit state updates back to the frontend.",
@@ -232,13 +361,13 @@ def example_one_content() -> rx.Component:
                                 ),
                                 rx.el.div(
                                     rx.foreach(
-                                        ExampleOneState.event_log,
+                                        event_log_entries(ExampleOneState),
                                         lambda log: rx.el.p(
-                                            f"> {log}",
+                                            f"> {log[1]}",
                                             class_name="font-mono text-sm text-green-400 mb-1",
                                         ),
                                     ),
-                                    class_name="bg-gray-900 p-6 rounded-xl shadow-inner min-h-[160px]",
+                                    class_name="bg-gray-900 p-6 rounded-xl shadow-inner min-h-[160px] max-h-96 overflow-y-auto",
                                 ),
                                 class_name="flex-1",
                             ),
@@ -251,4 +380,6 @@ def example_one_content() -> rx.Component:
             ),
         ),
         class_name="animate-in fade-in slide-in-from-bottom-4 duration-700",
+        on_mount=[ExampleOneState.send_event_log, ExampleOneState.watch_global_count],
+        on_unmount=ExampleOneState.stop_watching_global_count,
     )
\ No newline at end of file
@@ -1,56 +1,67 @@
 import asyncio
-import random
 
 import reflex as rx
-from pydantic import BaseModel
-from faker import Faker
 
-fake = Faker()
+from reflex_state_examples.components.client_rows import ClientRows
+from reflex_state_examples.users.source import PAGE_SIZE, User, UserSource
 
-
-class User(BaseModel):
-    id: int
-    name: str
-    email: str
-    role: str
+users_source = UserSource()
+user_rows = ClientRows("example_three_users")
 
 
 class ExampleThreeState(rx.State):
     """Simulated Backend Sync demonstration."""
 
-    users: list[User] = []
+    # The table lives in the page (`user_rows`); each page of the fetch
+    # sends only its own rows.
+    _users: list[User] = []
+    user_count: int = 0
     is_loading: bool = False
     error_message: str = ""
 
     @rx.event(background=True)
     async def fetch_users(self):
         async with self:
-            self.is_loading = True
-            self.error_message = ""
-        await asyncio.sleep(1.5)
-        async with self:
-            if random.random() < 0.2:
-                self.error_message = (
-                    "Failed to establish connection to database cluster."
-                )
+            # The page may have been reloaded, emptying its copy of the table:
+            # show what the session holds, so it agrees with `user_count`. If
+            # a fetch is already under way, it sends the rest.
+            streaming = self.is_loading
+            rows = [user.model_dump() for user in self._users]
+            if not streaming:
+                self.is_loading = True
+                self.error_message = ""
+        yield user_rows.replace(rows)
+        if streaming:
+            return
+        first = True
+        try:
+            async for page in users_source.pages(PAGE_SIZE):
+                rows = [user.model_dump() for user in page]
+                async with self:
+                    # Keep the previous table until the first page is in.
+                    if first:
+                        self._users = []
+                    self._users.extend(page)
+                    self.user_count = len(self._users)
+                yield user_rows.replace(rows) if first else user_rows.append(*rows)
+                first = False
+            if first:
+                yield user_rows.replace([])
+        except ConnectionError as exc:
+            async with self:
+                self.error_message = str(exc)
+                rows = [user.model_dump() for user in self._users]
+            yield user_rows.replace(rows)
+        finally:
+            async with self:
                 self.is_loading = False
-                return
-            new_users = [
-                User(
-                    id=i,
-                    name=fake.name(),
-                    email=fake.email(),
-                    role=random.choice(["Admin", "Editor", "Viewer"]),
-                )
-                for i in range(1, 6)
-            ]
-            self.users = new_users
-            self.is_loading = False
 
     @rx.event(background=True)
     async def delete_user(self, user_id: int):
         async with self:
-            self.users = [u for u in self.users if u.id != user_id]
+            self._users = [u for u in self._users if u.id != user_id]
+            self.user_count = len(self._users)
+        yield user_rows.remove(user_id)
         await asyncio.sleep(0.8)
 
 
@@ -102,6 +113,7 @@ def user_row(user: dict) -> rx.Component:
 
 def example_three_content() -> rx.Component:
     return rx.el.div(
+        user_rows.var,
         rx.el.div(
             rx.el.h1(
                 "Example 3: Backend Sync",
@@ -134,7 +146,18 @@ def example_three_content() -> rx.Component:
         rx.el.div(
             rx.el.div(
                 rx.el.div(
-                    rx.el.h3("Connected User Database", class_name="text-xl font-bold"),
+                    rx.el.div(
+                        rx.el.h3("Connected User Database", class_name="text-xl font-bold"),
+                        rx.el.p(
+                            ExampleThreeState.user_count.to_string(),
+                            rx.cond(
+                                ExampleThreeState.is_loading,
+                                " users loaded...",
+                                " users",
+                            ),
+                            class_name="text-sm text-gray-400 tabular-nums",
+                        ),
+                    ),
                     rx.el.button(
                         rx.icon(
                             "refresh-cw",
@@ -153,7 +176,7 @@ def example_three_content() -> rx.Component:
                 ),
                 rx.el.div(
                     rx.cond(
-                        ExampleThreeState.is_loading,
+                        ExampleThreeState.is_loading & (user_rows.rows.length() == 0),
                         rx.el.div(
                             rx.foreach(
                                 rx.Var.range(5),
@@ -182,7 +205,7 @@ def example_three_content() -> rx.Component:
                                     class_name="border-b border-gray-100",
                                 )
                             ),
-                            rx.el.tbody(rx.foreach(ExampleThreeState.users, user_row)),
+                            rx.el.tbody(rx.foreach(user_rows.rows, user_row)),
                             class_name="w-full table-auto",
                         ),
                     ),
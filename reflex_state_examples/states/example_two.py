@@ -1,70 +1,162 @@
 import logging
+import os
 
 import reflex as rx
-from pydantic import BaseModel
+from reflex.experimental.client_state import ClientStateVar
 
+from reflex_state_examples.components.client_rows import ClientRows
+from reflex_state_examples.pricing import discounts, search
+from reflex_state_examples.pricing import engine as pricing
+from reflex_state_examples.pricing.cart import Cart
+from reflex_state_examples.pricing.catalog import Product, catalog
+from reflex_state_examples.pricing.client import (
+    client_quote,
+    client_rules,
+    on_input,
+)
 
-class Product(BaseModel):
-    id: int
-    name: str
-    price: float
-    icon: str
+CLIENT_PRICING = os.getenv("EXAMPLE2_CLIENT_PRICING", "") == "1"
+SAVE_DEBOUNCE_MS = int(os.getenv("EXAMPLE2_SAVE_DEBOUNCE_MS", "800"))
+
+FIRST_SEARCH_PAGE = search.first_page()
+
+# In client pricing mode the inputs live in the browser and the summary is
+# computed there; the server only receives the cart once typing pauses. The
+# discount table is compiled into the page, so the mode is only offered with
+# the built-in codes: a rule file can be reloaded while serving, and the page
+# would keep quoting the old rules.
+client_table = None
+if CLIENT_PRICING and discounts.RULES_PATH:
+    logging.warning(
+        "EXAMPLE2_CLIENT_PRICING is ignored while PRICING_DISCOUNT_RULES is set"
+    )
+elif CLIENT_PRICING:
+    client_table = client_rules(discounts.DEMO_RULES)
+quantity_input = ClientStateVar.create("example_two_quantity", "1")
+code_input = ClientStateVar.create("example_two_discount_code", "")
+
+# The cart's lines are patched in the browser one at a time; only its totals
+# are state vars.
+cart_rows = ClientRows("example_two_cart")
+
+
+def parse_quantity(val) -> int:
+    try:
+        return max(1, int(float(val)))
+    except (TypeError, ValueError, OverflowError) as e:
+        logging.exception(f"Error: {e}")
+        return 1
 
 
 class ExampleTwoState(rx.State):
     """Demonstration of Derived State using @rx.var."""
 
-    products: list[Product] = [
-        Product(id=1, name="Neural Link Cable", price=49.99, icon="zap"),
-        Product(id=2, name="Quantum Processor", price=899.0, icon="cpu"),
-        Product(id=3, name="Holographic Display", price=249.5, icon="monitor"),
-        Product(id=4, name="Bio-Metric Scanner", price=120.0, icon="fingerprint"),
-    ]
-    selected_product_id: int = 1
+    selected_product_id: int = catalog.first.id
     quantity: int = 1
     discount_code: str = ""
     tax_rate: float = 0.0825
+    search_query: str = ""
+    search_offset: int = 0
+    search_results: list[Product] = FIRST_SEARCH_PAGE.products
+    search_has_more: bool = FIRST_SEARCH_PAGE.has_more
+    _cart: Cart = Cart()
+    _cart_revision: int = 0
 
     @rx.var
     def selected_product(self) -> Product:
-        for p in self.products:
-            if p.id == self.selected_product_id:
-                return p
-        return self.products[0]
+        return catalog.get(self.selected_product_id)
 
     @rx.var
-    def subtotal(self) -> float:
-        return self.selected_product.price * self.quantity
+    def quote(self) -> pricing.Quote:
+        return pricing.quote(
+            self.selected_product.price,
+            self.quantity,
+            self.discount_code,
+            self.tax_rate,
+        )
 
     @rx.var
-    def discount_percent(self) -> float:
-        codes = {"REFLEX20": 0.2, "DEVMODE": 0.5, "SAVE10": 0.1}
-        return codes.get(self.discount_code.upper(), 0.0)
+    def cart_quote(self) -> pricing.Quote:
+        # The cart is changed in place; reading the revision makes it a
+        # dependency, so bumping it marks this var dirty.
+        self._cart_revision
+        return self._cart.quote(self.discount_code, self.tax_rate)
 
     @rx.var
-    def discount_amount(self) -> float:
-        return self.subtotal * self.discount_percent
+    def cart_item_count(self) -> int:
+        self._cart_revision
+        return self._cart.quantity
 
-    @rx.var
-    def tax_amount(self) -> float:
-        return (self.subtotal - self.discount_amount) * self.tax_rate
+    @rx.event
+    def change_quantity(self, val: float):
+        self.quantity = parse_quantity(val)
 
-    @rx.var
-    def total(self) -> float:
-        return self.subtotal - self.discount_amount + self.tax_amount
+    @rx.event
+    def add_to_cart(self, quantity: str):
+        line = self._cart.add(self.selected_product, parse_quantity(quantity))
+        self._cart_revision += 1
+        return cart_rows.upsert(line.to_row())
 
     @rx.event
-    def change_quantity(self, val: float):
-        try:
-            self.quantity = max(1, int(val))
-        except (TypeError, ValueError) as e:
-            logging.exception(f"Error: {e}")
-            self.quantity = 1
+    def update_cart_line(self, line_id: int, val: str):
+        if line_id not in self._cart.lines:
+            return self.send_cart()
+        line = self._cart.update(line_id, parse_quantity(val))
+        self._cart_revision += 1
+        return cart_rows.upsert(line.to_row())
+
+    @rx.event
+    def remove_cart_line(self, line_id: int):
+        if line_id in self._cart.lines:
+            self._cart.remove(line_id)
+            self._cart_revision += 1
+        return cart_rows.remove(line_id)
+
+    @rx.event
+    def send_cart(self):
+        """Send every line, for a page that (re)connected to this session."""
+        return cart_rows.replace([line.to_row() for line in self._cart.lines.values()])
+
+    @rx.event
+    def load_page(self):
+        """Send the cart and, in client pricing mode, the inputs' saved values.
+
+        The browser's copies of the inputs start from their defaults on every
+        load, while the page shows the values saved in this session.
+        """
+        events = [self.send_cart()]
+        if client_table is not None:
+            events.append(quantity_input.push(str(self.quantity)))
+            events.append(code_input.push(self.discount_code))
+        return events
 
     @rx.event
     def select_product(self, val: str):
         self.selected_product_id = int(val)
 
+    async def _load_search_page(self):
+        page = await search.find(self.search_query, self.search_offset)
+        self.search_results = page.products
+        self.search_has_more = page.has_more
+
+    @rx.event
+    async def search_products(self, query: str):
+        self.search_query = query
+        self.search_offset = 0
+        await self._load_search_page()
+
+    @rx.event
+    async def next_search_page(self):
+        if self.search_has_more:
+            self.search_offset += search.PAGE_SIZE
+            await self._load_search_page()
+
+    @rx.event
+    async def previous_search_page(self):
+        if self.search_offset:
+            self.search_offset = max(0, self.search_offset - search.PAGE_SIZE)
+            await self._load_search_page()
+
 
 def summary_line(
     label: str, value: str, is_bold: bool = False, is_red: bool = False
@@ -83,8 +175,111 @@ def summary_line(
     )
 
 
+def product_option(product: Product) -> rx.Component:
+    return rx.el.button(
+        product.name,
+        on_click=ExampleTwoState.select_product(product.id.to_string()),
+        class_name=rx.cond(
+            product.id == ExampleTwoState.selected_product_id,
+            "text-left px-3 py-2 rounded-lg text-sm font-semibold bg-indigo-50 text-indigo-700",
+            "text-left px-3 py-2 rounded-lg text-sm text-gray-700 hover:bg-gray-50",
+        ),
+    )
+
+
+def summary_quote():
+    """The quote the summary shows: the state's, or one computed in the browser."""
+    if client_table is None:
+        return ExampleTwoState.quote
+    return client_quote(
+        "example_two_quote",
+        client_table,
+        ExampleTwoState.selected_product.price,
+        quantity_input.value,
+        code_input.value,
+        ExampleTwoState.tax_rate,
+    )
+
+
+def input_events(handler, client_input: ClientStateVar, debounce_ms: int = 0) -> dict:
+    if client_table is None:
+        return {"on_change": handler.debounce(debounce_ms) if debounce_ms else handler}
+    return {
+        "on_change": handler.debounce(SAVE_DEBOUNCE_MS),
+        "custom_attrs": {"on_input": on_input(client_input)},
+    }
+
+
+def cart_line(row: rx.Var) -> rx.Component:
+    return rx.el.div(
+        rx.el.span(row["name"], class_name="flex-1 font-medium text-gray-800"),
+        rx.el.input(
+            type="number",
+            min=1,
+            default_value=row["quantity"].to_string(),
+            on_change=lambda value: ExampleTwoState.update_cart_line(
+                row["id"], value
+            ).debounce(300),
+            class_name="w-20 p-2 rounded-lg border border-gray-200 text-sm",
+        ),
+        rx.el.span(
+            f"${row['amount'].to(float):.2f}",
+            class_name="w-24 text-right font-semibold text-gray-900",
+        ),
+        rx.el.button(
+            rx.icon("trash-2", class_name="h-4 w-4"),
+            on_click=ExampleTwoState.remove_cart_line(row["id"]),
+            class_name="p-2 text-gray-400 hover:text-red-500",
+        ),
+        # Keyed by line, so removing a line does not shift the inputs' values.
+        key=row["id"],
+        class_name="flex items-center gap-4 py-2 border-b border-gray-100",
+    )
+
+
+def cart_panel() -> rx.Component:
+    quote = ExampleTwoState.cart_quote
+    return rx.el.div(
+        rx.el.h3(
+            f"Cart ({ExampleTwoState.cart_item_count} items)",
+            class_name="text-xl font-bold mb-6",
+        ),
+        rx.el.div(
+            rx.foreach(cart_rows.rows, cart_line),
+            rx.cond(
+                cart_rows.rows.length() == 0,
+                rx.el.p("The cart is empty.", class_name="text-sm text-gray-400"),
+                None,
+            ),
+            class_name="mb-6",
+        ),
+        rx.el.div(
+            summary_line("Subtotal", f"${quote.subtotal:.2f}"),
+            rx.cond(
+                quote.discount_amount > 0,
+                summary_line(
+                    "Discount", f"-${quote.discount_amount:.2f}", is_red=True
+                ),
+                None,
+            ),
+            summary_line("Tax (8.25%)", f"${quote.tax_amount:.2f}"),
+            rx.el.div(class_name="my-4 border-t border-gray-100"),
+            summary_line("Cart Total", f"${quote.total:.2f}", is_bold=True),
+            class_name="bg-gray-50 p-6 rounded-2xl",
+        ),
+        class_name="mt-8 p-8 bg-white border border-gray-100 rounded-3xl shadow-sm",
+    )
+
+
 def example_two_content() -> rx.Component:
+    quote = summary_quote()
+    if client_table is None:
+        cart_quantity = ExampleTwoState.quantity.to_string()
+    else:
+        cart_quantity = quantity_input.value
     return rx.el.div(
+        *([quantity_input, code_input] if client_table is not None else []),
+        cart_rows.var,
         rx.el.div(
             rx.el.h1(
                 "Example 2: Derived State",
@@ -107,13 +302,39 @@ def example_two_content() -> rx.Component:
                             "Select Product",
                             class_name="block text-sm font-bold text-gray-700 mb-2",
                         ),
-                        rx.el.select(
-                            rx.foreach(
-                                ExampleTwoState.products,
-                                lambda p: rx.el.option(p.name, value=p.id.to_string()),
+                        rx.el.input(
+                            placeholder="Search products",
+                            # Only the current page of matches is ever sent to
+                            # the browser, whatever the size of the catalog.
+                            on_change=ExampleTwoState.search_products.debounce(200),
+                            class_name="w-full p-3 rounded-xl border border-gray-200 focus:ring-2 focus:ring-indigo-500 outline-none",
+                        ),
+                        rx.el.div(
+                            rx.foreach(ExampleTwoState.search_results, product_option),
+                            rx.cond(
+                                ExampleTwoState.search_results.length() == 0,
+                                rx.el.p(
+                                    "No matching products",
+                                    class_name="text-sm text-gray-400 px-3 py-2",
+                                ),
+                                None,
                             ),
-                            on_change=ExampleTwoState.select_product,
-                            class_name="w-full p-3 rounded-xl border border-gray-200 bg-white focus:ring-2 focus:ring-indigo-500 outline-none appearance-none",
+                            class_name="mt-2 flex flex-col gap-1",
+                        ),
+                        rx.el.div(
+                            rx.el.button(
+                                "Previous",
+                                on_click=ExampleTwoState.previous_search_page,
+                                disabled=ExampleTwoState.search_offset == 0,
+                                class_name="text-xs font-bold text-indigo-600 disabled:text-gray-300",
+                            ),
+                            rx.el.button(
+                                "Next",
+                                on_click=ExampleTwoState.next_search_page,
+                                disabled=~ExampleTwoState.search_has_more,
+                                class_name="text-xs font-bold text-indigo-600 disabled:text-gray-300",
+                            ),
+                            class_name="flex justify-between mt-2",
                         ),
                         class_name="mb-6",
                     ),
@@ -124,7 +345,9 @@ def example_two_content() -> rx.Component:
                         ),
                         rx.el.input(
                             type="number",
-                            on_change=ExampleTwoState.change_quantity,
+                            **input_events(
+                                ExampleTwoState.change_quantity, quantity_input
+                            ),
                             class_name="w-full p-3 rounded-xl border border-gray-200 focus:ring-2 focus:ring-indigo-500 outline-none",
                             default_value=ExampleTwoState.quantity.to_string(),
                         ),
@@ -137,18 +360,27 @@ def example_two_content() -> rx.Component:
                         ),
                         rx.el.input(
                             placeholder="Try REFLEX20 or DEVMODE",
-                            on_change=ExampleTwoState.set_discount_code.debounce(300),
+                            **input_events(
+                                ExampleTwoState.set_discount_code, code_input, 300
+                            ),
                             class_name="w-full p-3 rounded-xl border border-gray-200 focus:ring-2 focus:ring-indigo-500 outline-none",
+                            default_value=ExampleTwoState.discount_code,
                         ),
                         rx.cond(
-                            ExampleTwoState.discount_percent > 0,
+                            quote.discount_percent > 0,
                             rx.el.p(
-                                f"Applied {ExampleTwoState.discount_percent * 100:.0f}% discount!",
+                                f"Applied {quote.discount_percent * 100:.0f}% discount!",
                                 class_name="text-xs text-green-600 font-bold mt-2",
                             ),
                             None,
                         ),
-                        class_name="mb-2",
+                        class_name="mb-6",
+                    ),
+                    rx.el.button(
+                        rx.icon("shopping-cart", class_name="h-4 w-4"),
+                        "Add to Cart",
+                        on_click=ExampleTwoState.add_to_cart(cart_quantity),
+                        class_name="w-full flex items-center justify-center gap-2 p-3 rounded-xl bg-indigo-600 text-white font-bold hover:bg-indigo-700",
                     ),
                     class_name="p-8 bg-white border border-gray-100 rounded-3xl shadow-sm h-full",
                 ),
@@ -175,23 +407,25 @@ def example_two_content() -> rx.Component:
                             "Unit Price",
                             f"${ExampleTwoState.selected_product.price:.2f}",
                         ),
-                        summary_line("Subtotal", f"${ExampleTwoState.subtotal:.2f}"),
+                        summary_line(
+                            "Subtotal", f"${quote.subtotal:.2f}"
+                        ),
                         rx.cond(
-                            ExampleTwoState.discount_amount > 0,
+                            quote.discount_amount > 0,
                             summary_line(
                                 "Discount",
-                                f"-${ExampleTwoState.discount_amount:.2f}",
+                                f"-${quote.discount_amount:.2f}",
                                 is_red=True,
                             ),
                             None,
                         ),
                         summary_line(
-                            "Tax (8.25%)", f"${ExampleTwoState.tax_amount:.2f}"
+                            "Tax (8.25%)", f"${quote.tax_amount:.2f}"
                         ),
                         rx.el.div(class_name="my-4 border-t border-gray-100"),
                         summary_line(
                             "Total Amount",
-                            f"${ExampleTwoState.total:.2f}",
+                            f"${quote.total:.2f}",
                             is_bold=True,
                         ),
                         class_name="bg-gray-50 p-6 rounded-2xl",
@@ -226,5 +460,7 @@ def example_two_content() -> rx.Component:
             ),
             class_name="grid grid-cols-1 lg:grid-cols-2 gap-8",
         ),
+        cart_panel(),
+        on_mount=ExampleTwoState.load_page,
         class_name="animate-in fade-in slide-in-from-bottom-4 duration-700",
     )
\ No newline at end of file
@@ -0,0 +1,198 @@
+"""Wire formats for Example 5 sync messages.
+
+Every encoded message announces its format in the first byte, so workers
+running different codecs can still read each other: JSON always starts with
+``{`` and the binary format with its version byte. ``EXAMPLE5_CODEC`` only
+picks how this worker encodes.
+
+Binary layout (version 1), integers as LEB128 varints, signed ones zigzagged::
+
+    version | seq | origin | label | flags | schema fields... | [sent] | [extra]
+
+``origin`` and ``label`` are length-prefixed UTF-8. Bit ``i`` of ``flags``
+marks ``PAYLOAD_SCHEMA[i]`` as present; present fields follow in schema
+order, floats as little-endian doubles. ``FLAG_SENT`` adds the timing stamp
+(host, then monotonic ns and wall-clock us as two little-endian uint64s)
+and ``FLAG_EXTRA`` a length-prefixed JSON object holding any field that is
+not in the schema, does not have the schema's type, or is an int outside
+the signed 64-bit range the zigzag encoding covers.
+"""
+
+import json
+import os
+import struct
+
+CODEC = os.getenv("EXAMPLE5_CODEC", "binary")
+
+BINARY_V1 = 0x01
+FLAG_SENT = 0x40
+FLAG_EXTRA = 0x80
+
+# The synced ExampleFiveState fields; append only, the position is the wire ID.
+PAYLOAD_SCHEMA: tuple[tuple[str, type], ...] = (
+    ("selected_product_id", int),
+    ("quantity", int),
+    ("discount_code", str),
+    ("tax_rate", float),
+)
+
+INT64_MIN = -(2**63)
+INT64_MAX = 2**63 - 1
+
+_DOUBLE = struct.Struct("<d")
+_STAMP = struct.Struct("<QQ")
+
+
+class CodecError(ValueError):
+    """Raised for bytes that no known codec can decode."""
+
+
+def _write_varint(out: bytearray, value: int):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    byte = data[pos]
+    if byte < 0x80:
+        return byte, pos + 1
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _write_str(out: bytearray, value: str):
+    raw = value.encode()
+    _write_varint(out, len(raw))
+    out += raw
+
+
+def _read_str(data: bytes, pos: int) -> tuple[str, int]:
+    size, pos = _read_varint(data, pos)
+    return data[pos : pos + size].decode(), pos + size
+
+
+class JsonCodec:
+    """Plain JSON, readable in ``redis-cli MONITOR`` and handy for debugging."""
+
+    name = "json"
+
+    def encode(self, message: dict) -> bytes:
+        return json.dumps(message, separators=(",", ":")).encode()
+
+    def decode(self, data: bytes) -> dict:
+        return json.loads(data)
+
+
+class BinaryCodec:
+    """Fixed-schema binary encoding of the synced fields."""
+
+    name = "binary"
+
+    def encode(self, message: dict) -> bytes:
+        seq = message["seq"]
+        if seq < 0:
+            raise ValueError(f"seq must be non-negative, got {seq}")
+        out = bytearray((BINARY_V1,))
+        _write_varint(out, seq)
+        _write_str(out, message["origin"])
+        _write_str(out, message["label"])
+        fields = message["fields"]
+        flags = 0
+        body = bytearray()
+        extra = {}
+        known = set()
+        for bit, (name, kind) in enumerate(PAYLOAD_SCHEMA):
+            if name not in fields:
+                continue
+            known.add(name)
+            value = fields[name]
+            # bool is an int subclass, but would not survive the round trip.
+            if type(value) is not kind or (
+                kind is int and not INT64_MIN <= value <= INT64_MAX
+            ):
+                extra[name] = value
+                continue
+            flags |= 1 << bit
+            if kind is int:
+                _write_varint(body, (value << 1) ^ (value >> 63))
+            elif kind is str:
+                _write_str(body, value)
+            else:
+                body += _DOUBLE.pack(value)
+        extra.update(
+            (name, value) for name, value in fields.items() if name not in known
+        )
+        sent = message.get("sent")
+        if sent is not None:
+            flags |= FLAG_SENT
+            _write_str(body, sent["host"])
+            body += _STAMP.pack(sent["mono_ns"], sent["wall_us"])
+        if extra:
+            flags |= FLAG_EXTRA
+            _write_str(body, json.dumps(extra, separators=(",", ":")))
+        out.append(flags)
+        return bytes(out + body)
+
+    def decode(self, data: bytes) -> dict:
+        seq, pos = _read_varint(data, 1)
+        origin, pos = _read_str(data, pos)
+        label, pos = _read_str(data, pos)
+        flags = data[pos]
+        pos += 1
+        fields = {}
+        for bit, (name, kind) in enumerate(PAYLOAD_SCHEMA):
+            if not flags & (1 << bit):
+                continue
+            if kind is int:
+                raw, pos = _read_varint(data, pos)
+                fields[name] = (raw >> 1) ^ -(raw & 1)
+            elif kind is str:
+                fields[name], pos = _read_str(data, pos)
+            else:
+                (fields[name],) = _DOUBLE.unpack_from(data, pos)
+                pos += _DOUBLE.size
+        message = {"origin": origin, "seq": seq, "label": label, "fields": fields}
+        if flags & FLAG_SENT:
+            host, pos = _read_str(data, pos)
+            mono_ns, wall_us = _STAMP.unpack_from(data, pos)
+            pos += _STAMP.size
+            message["sent"] = {"host": host, "mono_ns": mono_ns, "wall_us": wall_us}
+        if flags & FLAG_EXTRA:
+            extra, pos = _read_str(data, pos)
+            fields.update(json.loads(extra))
+        return message
+
+
+_CODECS = {codec.name: codec for codec in (JsonCodec(), BinaryCodec())}
+
+
+def get_codec(name: str = CODEC) -> JsonCodec | BinaryCodec:
+    """The codec selected by ``EXAMPLE5_CODEC``."""
+    try:
+        return _CODECS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown EXAMPLE5_CODEC {name!r}; expected 'json' or 'binary'"
+        ) from None
+
+
+def decode(data: bytes | str) -> dict:
+    """Decode a message in whichever format its first byte announces."""
+    if isinstance(data, str):
+        data = data.encode()
+    try:
+        if data[:1] == b"{":
+            return _CODECS["json"].decode(data)
+        if data[:1] == bytes((BINARY_V1,)):
+            return _CODECS["binary"].decode(data)
+    except (IndexError, UnicodeDecodeError, ValueError, struct.error) as exc:
+        raise CodecError(f"Malformed sync message: {exc}") from exc
+    raise CodecError(f"Unknown sync message format {data[:1]!r}")
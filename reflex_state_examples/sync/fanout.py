@@ -0,0 +1,189 @@
+import asyncio
+import os
+
+from reflex_state_examples.sync.metrics import elapsed_us, metrics
+from reflex_state_examples.sync.protocol import DEFAULT_ROOM
+
+SESSION_QUEUE_SIZE = int(os.getenv("EXAMPLE5_SESSION_QUEUE_SIZE", "256"))
+
+
+async def drain(queue: asyncio.Queue) -> list:
+    """Wait for at least one item, then take everything already queued."""
+    items = [await queue.get()]
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+class _Room:
+    def __init__(self):
+        self.members: dict[str, tuple[str, asyncio.Queue]] = {}
+        self.task: asyncio.Task | None = None
+        self.is_connected = False
+        self.last_id: str | None = None
+
+
+class WorkerFanout:
+    """One transport subscription per room, fanned out to the worker's sessions.
+
+    Each message is decoded once and handed to the queue of every session in
+    its room on this worker, so broker connections scale with workers rather
+    than browser tabs and a message costs work proportional to its room's
+    members rather than to every open session. Queue items are
+    ``(kind, data)`` tuples where ``kind`` is one of ``"connected"``,
+    ``"message"``, ``"resync"``, ``"error"`` or ``"stop"``. Messages from a
+    transport with history carry their ID under ``"id"``.
+
+    A session holds at most ``queue_size`` messages. Messages carry only the
+    fields that changed, so one cannot be dropped on its own: when a slow
+    session's queue is full, its queued messages are replaced by a single
+    ``"resync"``, on which the session reloads the room snapshot (every
+    broadcast delta is merged into the snapshot first). Control items are
+    never dropped.
+    """
+
+    def __init__(self, transport, queue_size: int = SESSION_QUEUE_SIZE):
+        self.transport = transport
+        self.queue_size = queue_size
+        self.messages_received = 0
+        self.messages_dropped = 0
+        self._sessions: dict[str, tuple[str, asyncio.Queue]] = {}
+        self._rooms: dict[str, _Room] = {}
+        self._replays: set[asyncio.Task] = set()
+
+    @property
+    def session_count(self) -> int:
+        return len(self._sessions)
+
+    @property
+    def room_count(self) -> int:
+        return len(self._rooms)
+
+    def is_connected(self, room: str = DEFAULT_ROOM) -> bool:
+        entry = self._rooms.get(room)
+        return entry is not None and entry.is_connected
+
+    def register(
+        self,
+        token: str,
+        origin: str,
+        room: str = DEFAULT_ROOM,
+        since: str | None = None,
+    ) -> asyncio.Queue:
+        """Register a session in ``room`` and return the queue it should consume.
+
+        A session that already saw message ``since`` first receives whatever
+        the transport can replay after it.
+        """
+        # Unbounded, so control items always fit; `_put` bounds the messages.
+        queue = asyncio.Queue()
+        previous = self._sessions.get(token)
+        self._sessions[token] = (room, queue)
+        entry = self._rooms.setdefault(room, _Room())
+        entry.members[token] = (origin, queue)
+        if previous is not None:
+            self._put(previous[1], ("stop", None))
+            self._leave(token, *previous)
+        if entry.is_connected:
+            self._put(queue, ("connected", None))
+        if since:
+            task = asyncio.create_task(self._replay(room, origin, queue, since))
+            self._replays.add(task)
+            task.add_done_callback(self._replays.discard)
+        if entry.task is None or entry.task.done():
+            entry.task = asyncio.create_task(
+                self._run(room, entry),
+                name=f"example5_fanout|{self.transport.name}|{room}",
+            )
+        return queue
+
+    def unregister(self, token: str, queue: asyncio.Queue):
+        entry = self._sessions.get(token)
+        if entry is not None and entry[1] is queue:
+            del self._sessions[token]
+            self._leave(token, *entry)
+
+    def _leave(self, token: str, room: str, queue: asyncio.Queue):
+        entry = self._rooms.get(room)
+        if entry is None:
+            return
+        member = entry.members.get(token)
+        if member is not None and member[1] is queue:
+            del entry.members[token]
+        if not entry.members:
+            # Give the subscription back as soon as the room empties; the next
+            # session starts from the live tail rather than old history.
+            if entry.task is not None:
+                entry.task.cancel()
+            del self._rooms[room]
+
+    def stop(self, token: str):
+        """Ask a session's listener to exit, e.g. when its page unmounts."""
+        entry = self._sessions.get(token)
+        if entry is not None:
+            self._put(entry[1], ("stop", None))
+
+    def dispatch(self, room: str, data: dict):
+        entry = self._rooms.get(room)
+        if entry is None:
+            return
+        origin = data.get("origin")
+        for session_origin, queue in entry.members.values():
+            if session_origin != origin:
+                self._put(queue, ("message", data))
+
+    def _broadcast(self, entry: _Room, item: tuple):
+        for _, queue in entry.members.values():
+            self._put(queue, item)
+
+    def _put(self, queue: asyncio.Queue, item: tuple):
+        if item[0] == "message" and queue.qsize() >= self.queue_size:
+            self._resync(queue)
+        queue.put_nowait(item)
+
+    def _resync(self, queue: asyncio.Queue):
+        resync_queued = False
+        for _ in range(queue.qsize()):
+            item = queue.get_nowait()
+            if item[0] not in ("message", "resync"):
+                queue.put_nowait(item)
+                continue
+            self.messages_dropped += item[0] == "message"
+            if not resync_queued:
+                # Stands in for the dropped messages, where the first one was.
+                queue.put_nowait(("resync", None))
+                resync_queued = True
+
+    async def _replay(
+        self, room: str, origin: str, queue: asyncio.Queue, since: str
+    ):
+        try:
+            missed = await self.transport.replay(room, since)
+        except Exception:
+            return
+        for message_id, data in missed:
+            if data.get("origin") != origin:
+                data["id"] = message_id
+                self._put(queue, ("message", data))
+
+    async def _run(self, room: str, entry: _Room):
+        def on_ready():
+            entry.is_connected = True
+            self._broadcast(entry, ("connected", None))
+
+        try:
+            async for message_id, data in self.transport.subscribe(
+                room, on_ready, since=entry.last_id
+            ):
+                self.messages_received += 1
+                if "sent" in data:
+                    metrics.receive_latency.record(elapsed_us(data["sent"]))
+                if message_id is not None:
+                    entry.last_id = data["id"] = message_id
+                self.dispatch(room, data)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self._broadcast(entry, ("error", str(exc)))
+        finally:
+            entry.is_connected = False
@@ -0,0 +1,111 @@
+import asyncio
+import os
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Callable
+
+from reflex_state_examples.sync.protocol import SnapshotRecord
+from reflex_state_examples.sync.transport import STREAM_MAXLEN, SyncTransport
+
+MAX_ROOMS = int(os.getenv("EXAMPLE5_MEMORY_MAX_ROOMS", "1000"))
+
+
+class _Room:
+    def __init__(self, maxlen: int):
+        self.record = SnapshotRecord()
+        self.history: deque[tuple[int, dict]] = deque(maxlen=maxlen)
+        self.subscribers: set[asyncio.Queue] = set()
+
+
+class InProcessTransport(SyncTransport):
+    """An asyncio broker living inside the worker process.
+
+    Needs no external service, so it suits a single worker, tests and load
+    benchmarks. Messages are handed to subscribers as the same dict objects,
+    and the last ``STREAM_MAXLEN`` of them per room are kept for replay.
+    """
+
+    name = "memory"
+
+    def __init__(
+        self,
+        channel: str,
+        state_key: str,
+        maxlen: int = STREAM_MAXLEN,
+        max_rooms: int = MAX_ROOMS,
+    ):
+        super().__init__(channel, state_key)
+        self.maxlen = maxlen
+        self.max_rooms = max_rooms
+        self._rooms: OrderedDict[str, _Room] = OrderedDict()
+        self._next_id = 0
+
+    def _room(self, room: str) -> _Room:
+        topic = self._rooms.get(room)
+        if topic is None:
+            self._evict(self.max_rooms - 1)
+            topic = self._rooms[room] = _Room(self.maxlen)
+        else:
+            self._rooms.move_to_end(room)
+        return topic
+
+    def _evict(self, keep: int):
+        excess = len(self._rooms) - keep
+        if excess <= 0:
+            return
+        idle = [name for name, topic in self._rooms.items() if not topic.subscribers]
+        for name in idle[:excess]:
+            del self._rooms[name]
+
+    async def publish(
+        self,
+        room: str,
+        origin: str,
+        seq: int,
+        label: str,
+        fields: dict,
+        sent: dict | None = None,
+    ) -> bool:
+        topic = self._room(room)
+        if not topic.record.merge(fields, seq, origin, label):
+            return False
+        self._next_id += 1
+        message = {"origin": origin, "seq": seq, "label": label, "fields": fields}
+        if sent is not None:
+            message["sent"] = sent
+        topic.history.append((self._next_id, message))
+        for queue in topic.subscribers:
+            queue.put_nowait((str(self._next_id), message))
+        return True
+
+    async def subscribe(
+        self, room: str, on_ready: Callable[[], None], since: str | None = None
+    ) -> AsyncIterator[tuple[str | None, dict]]:
+        topic = self._room(room)
+        queue = asyncio.Queue()
+        if since:
+            for item in await self.replay(room, since):
+                queue.put_nowait(item)
+        topic.subscribers.add(queue)
+        try:
+            on_ready()
+            while True:
+                yield await queue.get()
+        finally:
+            topic.subscribers.discard(queue)
+
+    async def replay(self, room: str, since: str) -> list[tuple[str, dict]]:
+        topic = self._rooms.get(room)
+        if topic is None:
+            return []
+        after = int(since)
+        return [
+            (str(message_id), message)
+            for message_id, message in topic.history
+            if message_id > after
+        ]
+
+    async def get_snapshot(self, room: str) -> dict:
+        topic = self._rooms.get(room)
+        if topic is None:
+            return SnapshotRecord().to_dict()
+        return topic.record.to_dict()
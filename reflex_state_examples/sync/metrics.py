@@ -0,0 +1,133 @@
+import socket
+import time
+
+HOST = socket.gethostname()
+
+# Values below 2**_SUB_BITS microseconds are counted exactly; above that each
+# power of two is split into 2**(_SUB_BITS - 1) buckets, so a recorded value is
+# never off by more than 1/64 (about 1.6%).
+_SUB_BITS = 7
+_SUB = 1 << _SUB_BITS
+_HALF = _SUB >> 1
+
+
+def send_stamp() -> dict:
+    """Timing stamp a sender attaches to each published message."""
+    return {
+        "host": HOST,
+        "mono_ns": time.monotonic_ns(),
+        "wall_us": time.time_ns() // 1000,
+    }
+
+
+def elapsed_us(stamp: dict) -> int:
+    """Microseconds since ``stamp`` was taken.
+
+    The monotonic clock is only comparable on the host that took the stamp;
+    across hosts the wall clock is used, so skew shows up as error there.
+    """
+    if stamp.get("host") == HOST:
+        elapsed = (time.monotonic_ns() - stamp["mono_ns"]) // 1000
+    else:
+        elapsed = time.time_ns() // 1000 - stamp["wall_us"]
+    return max(0, elapsed)
+
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of microsecond latencies.
+
+    Memory is bounded by the value range rather than the number of samples,
+    and percentiles are read straight off the bucket counts.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+        self._counts: dict[int, int] = {}
+
+    @staticmethod
+    def _index(value: int) -> int:
+        if value < _SUB:
+            return value
+        shift = value.bit_length() - _SUB_BITS
+        return _SUB + (shift - 1) * _HALF + (value >> shift) - _HALF
+
+    @staticmethod
+    def _highest(index: int) -> int:
+        if index < _SUB:
+            return index
+        shift, offset = divmod(index - _SUB, _HALF)
+        shift += 1
+        return ((_HALF + offset + 1) << shift) - 1
+
+    def record(self, value: int):
+        value = max(0, int(value))
+        index = self._index(value)
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.min = value if not self.count else min(self.min, value)
+        self.max = max(self.max, value)
+        self.count += 1
+        self.total += value
+
+    def percentile(self, pct: float) -> int:
+        """Highest value equivalent to the ``pct`` percentile sample."""
+        if not self.count:
+            return 0
+        rank = max(1, round(self.count * pct / 100))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= rank:
+                return min(self._highest(index), self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "min_us": self.min,
+            "mean_us": self.total / self.count if self.count else 0,
+            "p50_us": self.percentile(50),
+            "p95_us": self.percentile(95),
+            "p99_us": self.percentile(99),
+            "max_us": self.max,
+        }
+
+
+class SyncMetrics:
+    """Per-worker counters and latency histograms for Example 5 sync traffic."""
+
+    def __init__(self):
+        # Messages handed to session listeners, and how many of them turned
+        # out stale or no-op once merged.
+        self.messages_received = 0
+        self.messages_skipped = 0
+        # Locked state updates the listeners actually made.
+        self.state_applications = 0
+        # Publish -> worker receive, and publish -> applied to a session.
+        self.receive_latency = LatencyHistogram()
+        self.apply_latency = LatencyHistogram()
+
+    def reset(self):
+        """Zero every counter and histogram, e.g. between benchmark runs."""
+        self.__init__()
+
+    def latency_summary(self) -> str:
+        hist = self.apply_latency
+        return ", ".join(
+            f"p{pct} {hist.percentile(pct) / 1000:.1f} ms" for pct in (50, 95, 99)
+        )
+
+    def snapshot(self) -> dict:
+        return {
+            "host": HOST,
+            "messages_received": self.messages_received,
+            "messages_skipped": self.messages_skipped,
+            "state_applications": self.state_applications,
+            "receive_latency": self.receive_latency.to_dict(),
+            "apply_latency": self.apply_latency.to_dict(),
+        }
+
+
+metrics = SyncMetrics()
@@ -0,0 +1,193 @@
+import re
+import time
+
+Version = tuple[int, str]
+
+DEFAULT_ROOM = "lobby"
+
+_MISSING = object()
+_ROOM_NAME = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+def room_name(value: str | None) -> str:
+    """The sync room for ``value``, or the default room if it is not a valid name.
+
+    Room names end up in channel and key names and in pattern subscriptions,
+    so only letters, digits, ``_`` and ``-`` are allowed.
+    """
+    if value and _ROOM_NAME.fullmatch(value):
+        return value
+    return DEFAULT_ROOM
+
+
+class HybridClock:
+    """Hybrid logical clock: wall-clock microseconds that never go backwards.
+
+    Timestamps stay below 2**53 so they survive JSON and Lua doubles intact.
+    Observing a remote timestamp moves the clock past it, which keeps causally
+    later writes ordered after the ones they have seen.
+    """
+
+    def __init__(self):
+        self._last = 0
+
+    def now(self) -> int:
+        self._last = max(self._last + 1, int(time.time() * 1_000_000))
+        return self._last
+
+    def observe(self, remote: int):
+        self._last = max(self._last, remote)
+
+
+clock = HybridClock()
+
+
+class SyncSession:
+    """Per-session replica of the synced fields with last-writer-wins versions.
+
+    Local edits are staged here and marked dirty until the publisher takes
+    them; remote updates are merged field by field and dropped when they are
+    not newer than what the session already holds.
+    """
+
+    def __init__(
+        self, origin: str, values: dict | None = None, room: str = DEFAULT_ROOM
+    ):
+        self.origin = origin
+        self.room = room
+        self.values: dict = dict(values or {})
+        self.versions: dict[str, Version] = {}
+        self._dirty: set[str] = set()
+
+    def stage(self, values: dict, force: bool = False) -> dict:
+        """Record local edits; return the fields that actually changed."""
+        changed = {
+            name: value
+            for name, value in values.items()
+            if force or self.values.get(name, _MISSING) != value
+        }
+        if changed:
+            version = (clock.now(), self.origin)
+            for name, value in changed.items():
+                self.values[name] = value
+                self.versions[name] = version
+            self._dirty.update(changed)
+        return changed
+
+    def take_dirty(self) -> tuple[dict, int]:
+        """Return the current value of every dirty field, stamped with a fresh sequence."""
+        seq = clock.now()
+        fields = {name: self.values[name] for name in self._dirty}
+        for name in self._dirty:
+            self.versions[name] = (seq, self.origin)
+        self._dirty.clear()
+        return fields, seq
+
+    def mark_dirty(self, names):
+        """Put fields back for the next publish, e.g. after a failed send."""
+        self._dirty.update(names)
+
+    def merge(self, fields: dict, seq: int, origin: str) -> dict:
+        """Apply a remote update; return the fields whose value changed."""
+        clock.observe(seq)
+        version = (seq, origin)
+        changed = {}
+        for name, value in fields.items():
+            if self.versions.get(name, (0, "")) >= version:
+                continue
+            self.versions[name] = version
+            if self.values.get(name, _MISSING) != value:
+                self.values[name] = value
+                changed[name] = value
+        return changed
+
+    def merge_snapshot(self, snapshot: dict) -> dict:
+        """Apply a stored room record; return the fields whose value changed."""
+        changed = {}
+        versions = snapshot.get("versions", {})
+        for name, value in snapshot.get("fields", {}).items():
+            if name not in versions:
+                continue
+            seq, origin = versions[name]
+            changed.update(self.merge({name: value}, int(seq), str(origin)))
+        return changed
+
+
+class SnapshotRecord:
+    """The merged latest value and version of every synced field.
+
+    This is the broker-side counterpart of the Redis state hash, used by
+    transports that keep the snapshot in Python.
+    """
+
+    def __init__(self):
+        self.fields: dict = {}
+        self.versions: dict[str, Version] = {}
+        self.label = ""
+        self.updated_at = 0.0
+
+    def merge(self, fields: dict, seq: int, origin: str, label: str) -> int:
+        """Merge a delta; return how many fields were newer than the record."""
+        version = (seq, origin)
+        applied = 0
+        for name, value in fields.items():
+            if self.versions.get(name, (0, "")) >= version:
+                continue
+            self.fields[name] = value
+            self.versions[name] = version
+            applied += 1
+        if applied:
+            self.label = label
+            self.updated_at = time.time()
+        return applied
+
+    def to_dict(self) -> dict:
+        return {
+            "fields": dict(self.fields),
+            "versions": {name: list(v) for name, v in self.versions.items()},
+            "label": self.label,
+            "updated_at": self.updated_at,
+        }
+
+
+class SyncSessions:
+    """Worker-local registry of `SyncSession` replicas keyed by origin.
+
+    Entries taken with `acquire` are dropped when the last holder releases
+    them, so sessions that stop listening and publishing do not pile up.
+    """
+
+    def __init__(self):
+        self._sessions: dict[str, SyncSession] = {}
+        self._holders: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(
+        self, origin: str, values: dict | None = None, room: str = DEFAULT_ROOM
+    ) -> SyncSession:
+        session = self._sessions.get(origin)
+        if session is None:
+            session = self._sessions[origin] = SyncSession(origin, values, room)
+        session.room = room
+        return session
+
+    def acquire(
+        self, origin: str, values: dict | None = None, room: str = DEFAULT_ROOM
+    ) -> SyncSession:
+        """`get`, keeping the entry until a matching `release`."""
+        session = self.get(origin, values, room)
+        self._holders[origin] = self._holders.get(origin, 0) + 1
+        return session
+
+    def release(self, origin: str):
+        holders = self._holders.get(origin, 0) - 1
+        if holders > 0:
+            self._holders[origin] = holders
+        else:
+            self.discard(origin)
+
+    def discard(self, origin: str):
+        self._sessions.pop(origin, None)
+        self._holders.pop(origin, None)
@@ -0,0 +1,93 @@
+import asyncio
+import os
+
+from reflex_state_examples.sync.metrics import send_stamp
+from reflex_state_examples.sync.protocol import SyncSession
+
+COALESCE_WINDOW_MS = float(os.getenv("EXAMPLE5_COALESCE_MS", "30"))
+
+
+class _PendingPublish:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.future = loop.create_future()
+        self.label = ""
+        self.requests = 0
+
+
+class CoalescingPublisher:
+    """Publishes field-level deltas, collapsing bursts per session.
+
+    Requests from one session that arrive within ``window_ms`` of the first
+    collapse into a single publish of every field dirtied in that window. The
+    transport merges the delta into the state record and broadcasts it in one
+    atomic round trip.
+    """
+
+    def __init__(self, transport, window_ms: float = COALESCE_WINDOW_MS):
+        self.transport = transport
+        self.window = window_ms / 1000
+        self.requested = 0
+        self.sent = 0
+        self.stale = 0
+        self._pending: dict[str, _PendingPublish] = {}
+        self._flushes: set[asyncio.Task] = set()
+
+    @property
+    def coalescing_ratio(self) -> float:
+        """Requested publishes per publish actually sent."""
+        return self.requested / self.sent if self.sent else 0.0
+
+    async def publish(self, session: SyncSession, label: str) -> bool:
+        """Queue a publish of ``session``'s dirty fields.
+
+        Returns True once this request's label went out with the delta, or
+        False if a newer request from the same session superseded it within
+        the window.
+        """
+        self.requested += 1
+        pending = self._pending.get(session.origin)
+        if pending is None:
+            pending = _PendingPublish(asyncio.get_running_loop())
+            self._pending[session.origin] = pending
+            task = asyncio.create_task(self._flush_later(session, pending))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+        pending.label = label
+        pending.requests += 1
+        ticket = pending.requests
+        return await asyncio.shield(pending.future) == ticket
+
+    async def _flush_later(self, session: SyncSession, pending: _PendingPublish):
+        fields = {}
+        try:
+            await asyncio.sleep(self.window)
+            # Requests arriving from here on open a new window.
+            del self._pending[session.origin]
+            fields, seq = session.take_dirty()
+            sent = bool(fields) and await self._send(
+                session.room, session.origin, pending.label, fields, seq
+            )
+        except Exception as exc:
+            session.mark_dirty(fields)
+            pending.future.set_exception(exc)
+        else:
+            pending.future.set_result(pending.requests if sent else 0)
+        finally:
+            if not pending.future.done():
+                # Cancelled, e.g. at shutdown: nobody may be left waiting.
+                if self._pending.get(session.origin) is pending:
+                    del self._pending[session.origin]
+                session.mark_dirty(fields)
+                pending.future.cancel()
+
+    async def _send(
+        self, room: str, origin: str, label: str, fields: dict, seq: int
+    ) -> bool:
+        if not await self.transport.publish(
+            room, origin, seq, label, fields, sent=send_stamp()
+        ):
+            # Every field was already overwritten by a newer version.
+            self.stale += 1
+            return False
+        self.sent += 1
+        return True
@@ -0,0 +1,291 @@
+import asyncio
+import contextlib
+import json
+import os
+import time
+from collections.abc import AsyncIterator, Callable
+
+from reflex_state_examples.sync.codec import CodecError, decode, get_codec
+from reflex_state_examples.sync.redis_pool import redis_pool
+from reflex_state_examples.sync.transport import STREAM_MAXLEN, SyncTransport
+
+STREAM_BLOCK_MS = int(os.getenv("EXAMPLE5_STREAM_BLOCK_MS", "5000"))
+
+# Merges the changed fields into the state hash KEYS[1] (field by field,
+# newest version wins) and broadcasts the delta to KEYS[2], all in one atomic
+# round trip. Field values live under "f:<name>" and their "<seq>:<origin>"
+# versions under "v:<name>". The broadcast is a PUBLISH or, for streams, a
+# capped XADD. Returns the number of fields that were newer than the record.
+MERGE_AND_BROADCAST = """
+if redis.call('TYPE', KEYS[1]).ok ~= 'hash' then
+  redis.call('DEL', KEYS[1])
+end
+local seq = tonumber(ARGV[2])
+local origin = ARGV[3]
+local applied = 0
+for i = 8, #ARGV, 2 do
+  local name = ARGV[i]
+  local current = redis.call('HGET', KEYS[1], 'v:' .. name)
+  local newer = true
+  if current then
+    local sep = string.find(current, ':', 1, true)
+    local current_seq = tonumber(string.sub(current, 1, sep - 1))
+    local current_origin = string.sub(current, sep + 1)
+    newer = current_seq < seq or (current_seq == seq and current_origin < origin)
+  end
+  if newer then
+    redis.call('HSET', KEYS[1], 'f:' .. name, ARGV[i + 1], 'v:' .. name, ARGV[2] .. ':' .. origin)
+    applied = applied + 1
+  end
+end
+if applied > 0 then
+  redis.call('HSET', KEYS[1], 'label', ARGV[4], 'updated_at', ARGV[5])
+  if ARGV[6] == 'streams' then
+    redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[7], '*', 'm', ARGV[1])
+  else
+    redis.call('PUBLISH', KEYS[2], ARGV[1])
+  end
+end
+return applied
+"""
+
+
+_READY = object()
+
+
+class RedisPubSubTransport(SyncTransport):
+    """Broadcasts deltas over Redis Pub/Sub.
+
+    Listeners only see messages sent while they are subscribed, so nothing
+    can be replayed after a disconnect. Every room subscribed in a worker
+    shares one pattern subscription to ``<channel>:*``, so joining or leaving
+    a room costs no Redis round trip; messages for rooms without local
+    subscribers are dropped before they are decoded.
+    """
+
+    name = "pubsub"
+
+    def __init__(self, channel: str, state_key: str):
+        super().__init__(channel, state_key)
+        self.codec = get_codec()
+        self._script = None
+        self._rooms: dict[str, set[asyncio.Queue]] = {}
+        self._listener: asyncio.Task | None = None
+        self._live = False
+
+    # Both names of a room carry the hash tag ``{<room>}``, so on Redis Cluster
+    # the state hash and the stream land in one slot and a script can write
+    # both.
+    def room_channel(self, room: str) -> str:
+        return f"{self.channel}:{{{room}}}"
+
+    def room_key(self, room: str) -> str:
+        return f"{self.state_key}:{{{room}}}"
+
+    def _room_of(self, channel: bytes) -> str:
+        return channel.decode()[len(self.channel) + 2 : -1]
+
+    async def publish(
+        self,
+        room: str,
+        origin: str,
+        seq: int,
+        label: str,
+        fields: dict,
+        sent: dict | None = None,
+    ) -> bool:
+        message = {"origin": origin, "seq": seq, "label": label, "fields": fields}
+        if sent is not None:
+            message["sent"] = sent
+        args = [
+            self.codec.encode(message),
+            seq,
+            origin,
+            label,
+            time.time(),
+            self.name,
+            STREAM_MAXLEN,
+        ]
+        for name, value in fields.items():
+            args += [name, json.dumps(value)]
+        client = redis_pool.client()
+        if self._script is None or self._script.registered_client is not client:
+            self._script = client.register_script(MERGE_AND_BROADCAST)
+        keys = [self.room_key(room), self.room_channel(room)]
+        return bool(await self._script(keys=keys, args=args))
+
+    async def subscribe(
+        self, room: str, on_ready: Callable[[], None], since: str | None = None
+    ) -> AsyncIterator[tuple[str | None, dict]]:
+        queue = asyncio.Queue()
+        self._rooms.setdefault(room, set()).add(queue)
+        if self._live:
+            queue.put_nowait(_READY)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        try:
+            while True:
+                item = await queue.get()
+                if item is _READY:
+                    on_ready()
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield None, item
+        finally:
+            queues = self._rooms.get(room, set())
+            queues.discard(queue)
+            if not queues:
+                self._rooms.pop(room, None)
+            if not self._rooms and self._listener is not None:
+                self._listener.cancel()
+                self._listener = None
+
+    async def _listen(self):
+        """Demultiplex the worker's pattern subscription into per-room queues."""
+        pattern = self.room_channel("*")
+        # Messages may be binary, so read them as bytes.
+        pubsub = redis_pool.raw_client().pubsub()
+        try:
+            await pubsub.psubscribe(pattern)
+            self._live = True
+            self._put_all(_READY)
+            async for message in pubsub.listen():
+                if message.get("type") != "pmessage":
+                    continue
+                queues = self._rooms.get(self._room_of(message["channel"]))
+                if not queues:
+                    continue
+                try:
+                    data = decode(message["data"])
+                except CodecError:
+                    continue
+                for queue in queues:
+                    queue.put_nowait(data)
+        except Exception as exc:
+            self._put_all(exc)
+        finally:
+            self._live = False
+            with contextlib.suppress(Exception):
+                await pubsub.punsubscribe(pattern)
+            await pubsub.aclose()
+
+    def _put_all(self, item):
+        for queues in self._rooms.values():
+            for queue in queues:
+                queue.put_nowait(item)
+
+    async def get_snapshot(self, room: str) -> dict:
+        record = await redis_pool.client().hgetall(self.room_key(room))
+        snapshot = {
+            "fields": {},
+            "versions": {},
+            "label": record.get("label", ""),
+            "updated_at": float(record.get("updated_at", 0)),
+        }
+        for key, value in record.items():
+            kind, _, name = key.partition(":")
+            if kind == "f":
+                snapshot["fields"][name] = json.loads(value)
+            elif kind == "v":
+                seq, _, origin = value.partition(":")
+                snapshot["versions"][name] = [int(seq), origin]
+        return snapshot
+
+
+class RedisStreamTransport(RedisPubSubTransport):
+    """Broadcasts deltas through a capped Redis Stream.
+
+    Every worker reads the whole stream with XREAD (a consumer group would
+    split messages between workers), remembering the last entry ID it saw so
+    a reconnect resumes exactly where it left off. Sessions can replay what
+    they missed with `replay`. Each room is its own stream; a worker reads
+    all the rooms it has sessions in with one blocking XREAD, on a connection
+    of its own so the wait never holds one that publishes need.
+    """
+
+    name = "streams"
+
+    def __init__(self, channel: str, state_key: str):
+        super().__init__(channel, state_key)
+        # The last entry ID read from each room's stream.
+        self._cursors: dict[str, str] = {}
+
+    async def _tail_id(self, client, stream: str) -> str:
+        entries = await client.xrevrange(stream, count=1)
+        return entries[0][0].decode() if entries else "0-0"
+
+    @staticmethod
+    def _decode_entries(entries) -> list[tuple[str, dict]]:
+        decoded = []
+        for entry_id, values in entries:
+            try:
+                decoded.append((entry_id.decode(), decode(values.get(b"m", b""))))
+            except CodecError:
+                continue
+        return decoded
+
+    async def subscribe(
+        self, room: str, on_ready: Callable[[], None], since: str | None = None
+    ) -> AsyncIterator[tuple[str | None, dict]]:
+        queue = asyncio.Queue()
+        if room not in self._cursors:
+            cursor = since or await self._tail_id(
+                redis_pool.raw_client(), self.room_channel(room)
+            )
+            if room not in self._cursors:
+                self._cursors[room] = cursor
+                if self._listener is not None:
+                    # The XREAD in flight does not cover this stream; start
+                    # over, from the same cursors, with one that does.
+                    self._listener.cancel()
+                    self._listener = None
+        self._rooms.setdefault(room, set()).add(queue)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        on_ready()
+        try:
+            while True:
+                item = await queue.get()
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            queues = self._rooms.get(room, set())
+            queues.discard(queue)
+            if not queues:
+                self._rooms.pop(room, None)
+                self._cursors.pop(room, None)
+            if not self._rooms and self._listener is not None:
+                self._listener.cancel()
+                self._listener = None
+
+    async def _listen(self):
+        """Read every subscribed room's stream into its queues, one XREAD at a time."""
+        try:
+            # Messages may be binary, so read them as bytes.
+            async with redis_pool.connection(decode_responses=False) as client:
+                while self._cursors:
+                    streams = {
+                        self.room_channel(room): cursor
+                        for room, cursor in self._cursors.items()
+                    }
+                    response = await client.xread(
+                        streams, count=500, block=STREAM_BLOCK_MS
+                    )
+                    for stream, entries in response or []:
+                        room = self._room_of(stream)
+                        if not entries or room not in self._cursors:
+                            continue
+                        self._cursors[room] = entries[-1][0].decode()
+                        for item in self._decode_entries(entries):
+                            for queue in self._rooms.get(room, ()):
+                                queue.put_nowait(item)
+        except Exception as exc:
+            self._put_all(exc)
+
+    async def replay(self, room: str, since: str) -> list[tuple[str, dict]]:
+        entries = await redis_pool.raw_client().xrange(
+            self.room_channel(room), min=f"({since}", count=STREAM_MAXLEN
+        )
+        return self._decode_entries(entries)
@@ -0,0 +1,197 @@
+import asyncio
+import os
+import socket
+import zlib
+from collections.abc import AsyncIterator, Callable
+
+COUNTER_BACKEND = os.getenv("EXAMPLE1_GLOBAL_COUNTER", "memory")
+COUNTER_KEY = os.getenv("EXAMPLE1_GLOBAL_COUNTER_KEY", "reflex:example1:count")
+COUNTER_SHARDS = int(os.getenv("EXAMPLE1_GLOBAL_COUNTER_SHARDS", "16"))
+REFRESH_MS = float(os.getenv("EXAMPLE1_GLOBAL_COUNTER_REFRESH_MS", "200"))
+PUSH_MS = float(os.getenv("EXAMPLE1_GLOBAL_COUNTER_PUSH_MS", "250"))
+
+
+class ShardedCounter:
+    """A counter split into ``shards`` sub-counters that are summed on read.
+
+    Each writer adds to the shard its key hashes to, so sessions on many
+    workers spread their increments over several values instead of all
+    contending on one.
+    """
+
+    name = ""
+
+    def __init__(self, shards: int = COUNTER_SHARDS):
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        self.shards = shards
+
+    def shard(self, key: str) -> int:
+        return zlib.crc32(key.encode()) % self.shards
+
+    async def add(self, key: str, n: int):
+        raise NotImplementedError
+
+    async def total(self) -> int:
+        raise NotImplementedError
+
+
+class InProcessCounter(ShardedCounter):
+    """Sub-counters in worker memory, for a single worker, tests and benchmarks."""
+
+    name = "memory"
+
+    def __init__(self, shards: int = COUNTER_SHARDS):
+        super().__init__(shards)
+        self.values = [0] * shards
+
+    async def add(self, key: str, n: int):
+        self.values[self.shard(key)] += n
+
+    async def total(self) -> int:
+        return sum(self.values)
+
+
+class RedisCounter(ShardedCounter):
+    """Sub-counters in the Redis keys ``<key>:<shard>``.
+
+    Separate keys rather than fields of one hash, so a Redis Cluster spreads
+    the shards over its nodes. A read is one pipelined round trip.
+    """
+
+    name = "redis"
+
+    def __init__(
+        self, key: str, client: Callable[[], object], shards: int = COUNTER_SHARDS
+    ):
+        super().__init__(shards)
+        self.key = key
+        self.client = client
+        self.keys = [f"{key}:{shard}" for shard in range(shards)]
+
+    async def add(self, key: str, n: int):
+        await self.client().incrby(self.keys[self.shard(key)], n)
+
+    async def total(self) -> int:
+        async with self.client().pipeline(transaction=False) as pipe:
+            for key in self.keys:
+                pipe.get(key)
+            values = await pipe.execute()
+        return sum(int(value) for value in values if value is not None)
+
+
+def create_counter(name: str = COUNTER_BACKEND) -> ShardedCounter:
+    """Build the backend selected by ``EXAMPLE1_GLOBAL_COUNTER``."""
+    if name == "memory":
+        return InProcessCounter()
+    if name == "redis":
+        from reflex_state_examples.sync.redis_pool import redis_pool
+
+        return RedisCounter(COUNTER_KEY, redis_pool.client)
+    raise ValueError(
+        f"Unknown EXAMPLE1_GLOBAL_COUNTER {name!r}; expected 'memory' or 'redis'"
+    )
+
+
+class CounterHub:
+    """One worker's cached total of a sharded counter, for the sessions watching it.
+
+    While anyone watches, the total is read from the backend every
+    ``refresh_ms``; adds made through this worker count immediately. A
+    watcher is handed the total at most once per ``push_ms`` however fast it
+    moves, so thousands of increments a second still cost each session a few
+    deltas. Between refreshes the total may miss other workers' adds.
+    """
+
+    def __init__(
+        self,
+        counter: ShardedCounter,
+        refresh_ms: float = REFRESH_MS,
+        push_ms: float = PUSH_MS,
+    ):
+        self.counter = counter
+        self.refresh_interval = refresh_ms / 1000
+        self.push_interval = push_ms / 1000
+        self.value = 0
+        self.version = 0
+        self.loaded = False
+        self.watchers = 0
+        self.adds = 0
+        self.reads = 0
+        self.errors = 0
+        self._worker = f"{socket.gethostname()}:{os.getpid()}"
+        self._changed = asyncio.Event()
+        self._refresher: asyncio.Task | None = None
+
+    async def add(self, session: str, n: int) -> int:
+        """Add ``n`` on ``session``'s shard; returns the total including it."""
+        await self.counter.add(f"{self._worker}:{session}", n)
+        self.adds += 1
+        self._set(self.value + n)
+        return self.value
+
+    async def refresh(self, raced: bool = False) -> bool:
+        """Read the total from the backend; False if an add raced the read.
+
+        A read that overlaps an add may or may not include it. Such a result
+        is dropped once, so the pushed total does not briefly go back, but
+        is applied on the next try so a steady stream of adds cannot starve
+        the refresh.
+        """
+        adds = self.adds
+        total = await self.counter.total()
+        self.reads += 1
+        if adds != self.adds and not raced:
+            return False
+        self.loaded = True
+        self._set(total)
+        return True
+
+    async def watch(self) -> AsyncIterator[int]:
+        """Yield the total, then again each time it changes, rate-limited."""
+        self.watchers += 1
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.create_task(
+                self._refresh_loop(), name="example1_counter_refresh"
+            )
+        try:
+            if not self.loaded:
+                await self.refresh(raced=True)
+            version = None
+            while True:
+                while self.version == version:
+                    await self._changed.wait()
+                version = self.version
+                yield self.value
+                await asyncio.sleep(self.push_interval)
+        finally:
+            self.watchers -= 1
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.counter.name,
+            "shards": self.counter.shards,
+            "total": self.value,
+            "watchers": self.watchers,
+            "adds": self.adds,
+            "reads": self.reads,
+            "errors": self.errors,
+        }
+
+    def _set(self, value: int):
+        if value == self.value:
+            return
+        self.value = value
+        self.version += 1
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def _refresh_loop(self):
+        raced = False
+        while self.watchers:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                raced = not await self.refresh(raced)
+            except Exception:
+                # Keep serving the last total; the next read may succeed.
+                self.errors += 1
@@ -0,0 +1,59 @@
+import asyncio
+import os
+import time
+
+SNAPSHOT_TTL_MS = float(os.getenv("EXAMPLE5_SNAPSHOT_TTL_MS", "1000"))
+
+
+class SnapshotCache:
+    """Read-through cache of room snapshots with a short TTL.
+
+    Concurrent misses for the same room share one transport read, so a burst
+    of page loads (say, every tab reconnecting after a deploy) costs a single
+    read per worker and TTL window rather than one per session. A cached
+    snapshot may be up to ``ttl_ms`` old; the live subscription and the
+    per-field versions make up the difference.
+    """
+
+    def __init__(self, transport, ttl_ms: float = SNAPSHOT_TTL_MS):
+        self.transport = transport
+        self.ttl = ttl_ms / 1000
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, tuple[float, dict]] = {}
+        self._loads: dict[str, asyncio.Task] = {}
+
+    async def get(self, room: str, fresh: bool = False) -> dict:
+        """The room's snapshot; treat it as read-only, it is shared.
+
+        ``fresh`` skips the cached and in-flight reads, for a session that
+        must see every update broadcast so far.
+        """
+        if fresh:
+            self.misses += 1
+            return await self._load(room)
+        entry = self._entries.get(room)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+        load = self._loads.get(room)
+        if load is None:
+            self.misses += 1
+            load = self._loads[room] = asyncio.create_task(self._load(room))
+            load.add_done_callback(lambda _: self._loads.pop(room, None))
+        else:
+            self.hits += 1
+        return await asyncio.shield(load)
+
+    async def _load(self, room: str) -> dict:
+        snapshot = await self.transport.get_snapshot(room)
+        now = time.monotonic()
+        # Drop expired rooms so rooms nobody visits again do not pile up.
+        for name, (expires, _) in list(self._entries.items()):
+            if expires <= now:
+                del self._entries[name]
+        self._entries[room] = (now + self.ttl, snapshot)
+        return snapshot
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "ttl_ms": self.ttl * 1000}
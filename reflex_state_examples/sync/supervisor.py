@@ -0,0 +1,124 @@
+import asyncio
+import os
+import random
+from collections.abc import Callable
+
+MAX_LISTENERS = int(os.getenv("EXAMPLE5_MAX_LISTENERS", "1000"))
+REAP_INTERVAL = float(os.getenv("EXAMPLE5_REAP_INTERVAL_S", "10"))
+BACKOFF_BASE = float(os.getenv("EXAMPLE5_BACKOFF_BASE_S", "0.5"))
+BACKOFF_MAX = float(os.getenv("EXAMPLE5_BACKOFF_MAX_S", "30"))
+
+
+_app = None
+
+
+def _event_namespace():
+    # Looked up once: `get_and_validate_app` puts the working directory on
+    # `sys.path` again every time it is called.
+    global _app
+    if _app is None:
+        from reflex.utils.prerequisites import get_and_validate_app
+
+        _app = get_and_validate_app().app
+    return _app.event_namespace
+
+
+def client_connected(token: str) -> bool:
+    """Whether the browser tab behind ``token`` still has a websocket here.
+
+    Answers True until the app's event namespace is up, so nothing is reaped
+    before the server can tell.
+    """
+    namespace = _event_namespace()
+    if namespace is None:
+        return True
+    return token in namespace.token_to_sid
+
+
+class ListenerSupervisor:
+    """Tracks the per-session listener tasks of one worker.
+
+    At most ``max_listeners`` run at once. Every ``reap_interval`` seconds the
+    supervisor cancels listeners whose tab has disconnected on two checks in a
+    row (one miss may just be a websocket reconnecting); without it they would
+    leak until the broker dropped their connection. Failed listeners retry
+    after an exponential backoff with full jitter.
+    """
+
+    def __init__(
+        self,
+        max_listeners: int = MAX_LISTENERS,
+        reap_interval: float = REAP_INTERVAL,
+        is_connected: Callable[[str], bool] = client_connected,
+    ):
+        self.max_listeners = max_listeners
+        self.reap_interval = reap_interval
+        self.is_connected = is_connected
+        self.leaked = 0
+        self.restarted = 0
+        self.rejected = 0
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._missing: set[str] = set()
+        self._reaper: asyncio.Task | None = None
+
+    @property
+    def live(self) -> int:
+        return len(self._tasks)
+
+    def attach(self, token: str) -> bool:
+        """Adopt the running task as ``token``'s listener.
+
+        Returns False, and adopts nothing, when the worker is at its cap.
+        """
+        if token not in self._tasks and self.live >= self.max_listeners:
+            self.rejected += 1
+            return False
+        self._tasks[token] = asyncio.current_task()
+        self._missing.discard(token)
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(
+                self._reap(), name="example5_listener_reaper"
+            )
+        return True
+
+    def detach(self, token: str):
+        if self._tasks.get(token) is asyncio.current_task():
+            del self._tasks[token]
+            self._missing.discard(token)
+
+    def stop(self, token: str):
+        """Cancel ``token``'s listener, if it has one here."""
+        task = self._tasks.get(token)
+        if task is not None:
+            task.cancel()
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait before retry number ``attempt`` (counting from 0)."""
+        self.restarted += 1
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))
+
+    def summary(self) -> str:
+        return f"{self.live} live / {self.leaked} leaked / {self.restarted} restarted"
+
+    def stats(self) -> dict:
+        return {
+            "live": self.live,
+            "leaked": self.leaked,
+            "restarted": self.restarted,
+            "rejected": self.rejected,
+            "max_listeners": self.max_listeners,
+        }
+
+    async def _reap(self):
+        while self._tasks:
+            await asyncio.sleep(self.reap_interval)
+            for token, task in list(self._tasks.items()):
+                if self.is_connected(token):
+                    self._missing.discard(token)
+                elif token in self._missing:
+                    self.leaked += 1
+                    del self._tasks[token]
+                    self._missing.discard(token)
+                    task.cancel()
+                else:
+                    self._missing.add(token)
@@ -0,0 +1,92 @@
+import os
+from collections.abc import AsyncIterator, Callable
+
+TRANSPORT = os.getenv("EXAMPLE5_TRANSPORT", "pubsub")
+STREAM_MAXLEN = int(os.getenv("EXAMPLE5_STREAM_MAXLEN", "10000"))
+
+
+class SyncTransport:
+    """The broker that carries Example 5 deltas between sessions and workers.
+
+    Writing the snapshot and broadcasting are a single `publish` call so every
+    implementation can keep the two atomic: a delta is only broadcast if at
+    least one of its fields was newer than the merged snapshot.
+
+    Sessions are partitioned into rooms. Each room has its own channel and
+    snapshot, named ``<channel>:<room>`` and ``<state_key>:<room>``.
+    """
+
+    name = ""
+
+    def __init__(self, channel: str, state_key: str):
+        self.channel = channel
+        self.state_key = state_key
+
+    def room_channel(self, room: str) -> str:
+        return f"{self.channel}:{room}"
+
+    def room_key(self, room: str) -> str:
+        return f"{self.state_key}:{room}"
+
+    async def publish(
+        self,
+        room: str,
+        origin: str,
+        seq: int,
+        label: str,
+        fields: dict,
+        sent: dict | None = None,
+    ) -> bool:
+        """Merge ``fields`` into ``room``'s snapshot and broadcast them.
+
+        Returns False when every field was already superseded by a newer
+        version, in which case nothing is broadcast. ``sent`` is the sender's
+        timing stamp and travels with the message under ``"sent"``.
+        """
+        raise NotImplementedError
+
+    def subscribe(
+        self, room: str, on_ready: Callable[[], None], since: str | None = None
+    ) -> AsyncIterator[tuple[str | None, dict]]:
+        """Yield ``(message_id, message)`` pairs until cancelled or disconnected.
+
+        Only messages published to ``room`` are yielded. ``on_ready`` is
+        called once the subscription is live. Transports with history resume
+        after the ``since`` message ID when one is given.
+        """
+        raise NotImplementedError
+
+    async def replay(self, room: str, since: str) -> list[tuple[str, dict]]:
+        """Messages sent to ``room`` after ``since``, if the transport keeps history."""
+        return []
+
+    async def get_snapshot(self, room: str) -> dict:
+        """The room's record: ``fields``, ``versions``, ``label``, ``updated_at``."""
+        raise NotImplementedError
+
+
+def create_transport(
+    channel: str, state_key: str, name: str = TRANSPORT
+) -> SyncTransport:
+    """Build the transport selected by ``EXAMPLE5_TRANSPORT``."""
+    if name in ("pubsub", "streams"):
+        from reflex_state_examples.sync.redis_transport import (
+            RedisPubSubTransport,
+            RedisStreamTransport,
+        )
+
+        if name == "streams":
+            return RedisStreamTransport(channel, state_key)
+        return RedisPubSubTransport(channel, state_key)
+    if name == "memory":
+        from reflex_state_examples.sync.memory_transport import InProcessTransport
+
+        return InProcessTransport(channel, state_key)
+    if name == "unix":
+        from reflex_state_examples.sync.unix_transport import UnixSocketTransport
+
+        return UnixSocketTransport(channel, state_key)
+    raise ValueError(
+        f"Unknown EXAMPLE5_TRANSPORT {name!r}; "
+        "expected one of 'pubsub', 'streams', 'memory', 'unix'"
+    )
@@ -0,0 +1,264 @@
+"""A broker for several workers on one host, reached over a Unix socket.
+
+The first worker to need the broker starts it inside its own process; the
+others connect to the same socket path. To run it on its own instead:
+
+    python -m reflex_state_examples.sync.unix_transport [socket_path]
+"""
+
+import asyncio
+import contextlib
+import fcntl
+import json
+import os
+import sys
+import tempfile
+from collections.abc import AsyncIterator, Callable
+
+from reflex_state_examples.sync.memory_transport import InProcessTransport
+from reflex_state_examples.sync.transport import SyncTransport
+
+SOCKET_PATH = os.getenv(
+    "EXAMPLE5_UNIX_SOCKET",
+    os.path.join(tempfile.gettempdir(), "reflex_example5.sock"),
+)
+
+
+def _frame(payload) -> bytes:
+    body = json.dumps(payload).encode()
+    return len(body).to_bytes(4, "big") + body
+
+
+async def _read_frame(reader: asyncio.StreamReader):
+    header = await reader.readexactly(4)
+    return json.loads(await reader.readexactly(int.from_bytes(header, "big")))
+
+
+class UnixSocketBroker:
+    """Serves one `InProcessTransport` per channel to every connected worker.
+
+    Each request is a length-prefixed JSON frame answered by one frame, except
+    ``subscribe``, which turns the connection into a stream of messages.
+    """
+
+    def __init__(self, path: str = SOCKET_PATH):
+        self.path = path
+        self._topics: dict[str, InProcessTransport] = {}
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> "UnixSocketBroker":
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        return self
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def _topic(self, request: dict) -> InProcessTransport:
+        channel = request["channel"]
+        if channel not in self._topics:
+            self._topics[channel] = InProcessTransport(channel, request["state_key"])
+        return self._topics[channel]
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request = await _read_frame(reader)
+                topic = self._topic(request)
+                op = request["op"]
+                room = request["room"]
+                if op == "subscribe":
+                    await self._stream(
+                        topic, room, request.get("since"), reader, writer
+                    )
+                    return
+                if op == "publish":
+                    result = await topic.publish(
+                        room,
+                        request["origin"],
+                        request["seq"],
+                        request["label"],
+                        request["fields"],
+                        request.get("sent"),
+                    )
+                elif op == "replay":
+                    result = await topic.replay(room, request["since"])
+                elif op == "snapshot":
+                    result = await topic.get_snapshot(room)
+                else:
+                    result = None
+                writer.write(_frame({"result": result}))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            # A handler is the top of its task: a dropped or cancelled
+            # connection simply ends it.
+            pass
+        finally:
+            writer.close()
+
+    async def _stream(self, topic, room, since, reader, writer):
+        async def forward():
+            def on_ready():
+                writer.write(_frame({"ready": True}))
+
+            async for message_id, message in topic.subscribe(room, on_ready, since):
+                writer.write(_frame({"id": message_id, "message": message}))
+                await writer.drain()
+
+        task = asyncio.create_task(forward())
+        try:
+            # Subscribers never send again; EOF means the worker went away.
+            await reader.read()
+        finally:
+            task.cancel()
+
+
+_local_broker: UnixSocketBroker | None = None
+_broker_lock: asyncio.Lock | None = None
+
+
+async def _can_connect(path: str) -> bool:
+    try:
+        _, writer = await asyncio.open_unix_connection(path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        return False
+    writer.close()
+    return True
+
+
+def _acquire_lock(path: str):
+    """Open ``path`` and wait for an exclusive lock; closing the file frees it."""
+    lock = open(path, "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+    except BaseException:
+        lock.close()
+        raise
+    return lock
+
+
+async def ensure_broker(path: str = SOCKET_PATH):
+    """Start a broker in this process unless one already answers on ``path``."""
+    global _local_broker, _broker_lock
+    if _broker_lock is None:
+        _broker_lock = asyncio.Lock()
+    async with _broker_lock:
+        if await _can_connect(path):
+            return
+        # Serialise the stale-socket cleanup and bind across worker processes.
+        # The wait runs on a thread, so the event loop keeps serving meanwhile.
+        with await asyncio.to_thread(_acquire_lock, f"{path}.lock"):
+            if await _can_connect(path):
+                return
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path)
+            _local_broker = await UnixSocketBroker(path).start()
+
+
+class UnixSocketTransport(SyncTransport):
+    """Talks to the single-host `UnixSocketBroker`, starting it if needed."""
+
+    name = "unix"
+
+    def __init__(self, channel: str, state_key: str, path: str = SOCKET_PATH):
+        super().__init__(channel, state_key)
+        self.path = path
+        self._connection = None
+        self._lock: asyncio.Lock | None = None
+
+    async def _connect(self):
+        try:
+            return await asyncio.open_unix_connection(self.path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            await ensure_broker(self.path)
+            return await asyncio.open_unix_connection(self.path)
+
+    async def _request(self, op: str, room: str, **params):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        request = {
+            "op": op,
+            "channel": self.channel,
+            "state_key": self.state_key,
+            "room": room,
+        }
+        async with self._lock:
+            if self._connection is None:
+                self._connection = await self._connect()
+            reader, writer = self._connection
+            try:
+                writer.write(_frame({**request, **params}))
+                await writer.drain()
+                response = await _read_frame(reader)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                self._connection = None
+                writer.close()
+                raise
+        return response["result"]
+
+    async def publish(
+        self,
+        room: str,
+        origin: str,
+        seq: int,
+        label: str,
+        fields: dict,
+        sent: dict | None = None,
+    ) -> bool:
+        return await self._request(
+            "publish",
+            room,
+            origin=origin,
+            seq=seq,
+            label=label,
+            fields=fields,
+            sent=sent,
+        )
+
+    async def subscribe(
+        self, room: str, on_ready: Callable[[], None], since: str | None = None
+    ) -> AsyncIterator[tuple[str | None, dict]]:
+        reader, writer = await self._connect()
+        try:
+            writer.write(
+                _frame(
+                    {
+                        "op": "subscribe",
+                        "channel": self.channel,
+                        "state_key": self.state_key,
+                        "room": room,
+                        "since": since,
+                    }
+                )
+            )
+            await writer.drain()
+            while True:
+                frame = await _read_frame(reader)
+                if frame.get("ready"):
+                    on_ready()
+                    continue
+                yield frame["id"], frame["message"]
+        finally:
+            writer.close()
+
+    async def replay(self, room: str, since: str) -> list[tuple[str, dict]]:
+        return [
+            tuple(item) for item in await self._request("replay", room, since=since)
+        ]
+
+    async def get_snapshot(self, room: str) -> dict:
+        return await self._request("snapshot", room)
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else SOCKET_PATH
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)
+    asyncio.run(UnixSocketBroker(path).serve_forever())
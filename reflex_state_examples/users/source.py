@@ -0,0 +1,78 @@
+"""The simulated user database behind Example 3, read a page at a time.
+
+`UserSource.pages` is an async iterator: connecting costs
+``EXAMPLE3_CONNECT_MS`` and every page one more round trip of
+``EXAMPLE3_PAGE_LATENCY_MS``, so a caller can show the first page while the
+rest are still on their way instead of waiting for the whole table. Rows are
+made up with Faker on a worker thread, so large pages do not stall the event
+loop. Connecting fails with probability ``EXAMPLE3_FAILURE_RATE``, like a
+flaky database cluster.
+"""
+
+import asyncio
+import os
+import random
+from collections.abc import AsyncIterator
+
+from faker import Faker
+from pydantic import BaseModel
+
+USER_COUNT = int(os.getenv("EXAMPLE3_USER_COUNT", "5"))
+PAGE_SIZE = int(os.getenv("EXAMPLE3_PAGE_SIZE", "50"))
+CONNECT_MS = float(os.getenv("EXAMPLE3_CONNECT_MS", "1000"))
+PAGE_LATENCY_MS = float(os.getenv("EXAMPLE3_PAGE_LATENCY_MS", "100"))
+FAILURE_RATE = float(os.getenv("EXAMPLE3_FAILURE_RATE", "0.2"))
+
+ROLES = ("Admin", "Editor", "Viewer")
+
+fake = Faker()
+
+
+class User(BaseModel):
+    id: int
+    name: str
+    email: str
+    role: str
+
+
+class UserSource:
+    """``count`` users with IDs from 1, served in pages of ascending ID."""
+
+    def __init__(
+        self,
+        count: int = USER_COUNT,
+        connect_ms: float = CONNECT_MS,
+        page_latency_ms: float = PAGE_LATENCY_MS,
+        failure_rate: float = FAILURE_RATE,
+    ):
+        self.count = count
+        self.connect = connect_ms / 1000
+        self.page_latency = page_latency_ms / 1000
+        self.failure_rate = failure_rate
+
+    async def pages(self, page_size: int = PAGE_SIZE) -> AsyncIterator[list[User]]:
+        """Yield the users ``page_size`` at a time; raises ConnectionError."""
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        await asyncio.sleep(self.connect)
+        if random.random() < self.failure_rate:
+            raise ConnectionError("Failed to establish connection to database cluster.")
+        for start in range(1, self.count + 1, page_size):
+            stop = min(start + page_size, self.count + 1)
+            page, _ = await asyncio.gather(
+                asyncio.to_thread(self._page, start, stop),
+                asyncio.sleep(self.page_latency),
+            )
+            yield page
+
+    @staticmethod
+    def _page(start: int, stop: int) -> list[User]:
+        return [
+            User(
+                id=i,
+                name=fake.name(),
+                email=fake.email(),
+                role=random.choice(ROLES),
+            )
+            for i in range(start, stop)
+        ]
@@ -0,0 +1,26 @@
+import dataclasses
+
+import pytest
+
+from reflex_state_examples.pricing import engine
+
+np = pytest.importorskip("numpy")
+from reflex_state_examples.pricing.batch import quote_batch  # noqa: E402
+
+PRICES = {3: 19.99, 1: 4.5, 7: 120.0}
+
+
+def test_batch_matches_engine_quotes():
+    product_ids = [3, 1, 7, 99, 1, 3]
+    quantities = [-1, 2, 0, 5, 2, 40]
+    codes = ["", "DEVMODE", "save10", "SAVE10, REFLEX20", "DEVMODE", ""]
+    batch = quote_batch(PRICES, product_ids, quantities, codes, 0.0825)
+    for row, (product_id, quantity, code) in enumerate(
+        zip(product_ids, quantities, codes)
+    ):
+        price = PRICES.get(product_id, PRICES[3])
+        expected = engine.quote(price, quantity, code, 0.0825)
+        assert {
+            name: getattr(batch, name)[row].item()
+            for name in batch._fields
+        } == dataclasses.asdict(expected)
@@ -0,0 +1,77 @@
+import math
+import random
+
+import pytest
+
+from reflex_state_examples.pricing import engine
+from reflex_state_examples.pricing.cart import Cart
+from reflex_state_examples.pricing.catalog import Product
+
+PRODUCTS = [
+    Product(id=i, name=f"Product {i}", price=round(0.01 + i * 7.31, 2), icon="box")
+    for i in range(1, 41)
+]
+
+
+def _full_sum(cart: Cart) -> tuple[float, int]:
+    lines = cart.lines.values()
+    return math.fsum(line.amount for line in lines), sum(
+        line.quantity for line in lines
+    )
+
+
+@pytest.mark.parametrize("resum_every", [1, 7, 1000])
+def test_running_totals_match_a_full_resum(resum_every):
+    rng = random.Random(resum_every)
+    cart = Cart(resum_every)
+    for _ in range(5000):
+        action = rng.random()
+        if action < 0.5 or not cart.lines:
+            cart.add(rng.choice(PRODUCTS), rng.randint(1, 20))
+        elif action < 0.8:
+            cart.update(rng.choice(list(cart.lines)), rng.randint(1, 99))
+        else:
+            cart.remove(rng.choice(list(cart.lines)))
+        subtotal, quantity = _full_sum(cart)
+        assert cart.quantity == quantity
+        assert cart.subtotal == pytest.approx(subtotal, rel=1e-12, abs=1e-9)
+    cart.resum()
+    assert cart.subtotal == _full_sum(cart)[0]
+
+
+def test_adding_a_product_again_grows_its_line():
+    cart = Cart()
+    first = cart.add(PRODUCTS[0], 2)
+    again = cart.add(PRODUCTS[0], 3)
+    assert again is first and first.quantity == 5 and len(cart) == 1
+
+
+def test_emptied_cart_is_exactly_zero():
+    cart = Cart()
+    for product in PRODUCTS:
+        cart.add(product, 3)
+    for line_id in list(cart.lines):
+        cart.remove(line_id)
+    assert cart.subtotal == 0.0 and cart.quantity == 0
+
+
+def test_invalid_changes_are_rejected():
+    cart = Cart()
+    with pytest.raises(ValueError):
+        cart.add(PRODUCTS[0], 0)
+    line = cart.add(PRODUCTS[0], 1)
+    with pytest.raises(ValueError):
+        cart.update(line.line_id, 0)
+    with pytest.raises(KeyError):
+        cart.remove(999)
+
+
+def test_quote_prices_the_whole_cart():
+    cart = Cart()
+    cart.add(PRODUCTS[0], 2)
+    cart.add(PRODUCTS[1], 3)
+    quote = cart.quote("SAVE10", 0.0825)
+    expected = engine.quote_subtotal(cart.subtotal, 0.1, 0.0825)
+    assert quote == expected
+    subtotal = 2 * PRODUCTS[0].price + 3 * PRODUCTS[1].price
+    assert quote.subtotal == pytest.approx(subtotal)
@@ -0,0 +1,82 @@
+import pytest
+
+from reflex_state_examples.sync.codec import (
+    INT64_MAX,
+    INT64_MIN,
+    BinaryCodec,
+    CodecError,
+    JsonCodec,
+    decode,
+)
+
+
+def _message(**fields) -> dict:
+    return {
+        "origin": "worker-1",
+        "seq": 7,
+        "label": "Quantity changed",
+        "fields": fields,
+    }
+
+
+@pytest.mark.parametrize("codec", [BinaryCodec(), JsonCodec()], ids=lambda c: c.name)
+@pytest.mark.parametrize(
+    "fields",
+    [
+        {},
+        {
+            "selected_product_id": 3,
+            "quantity": 12,
+            "discount_code": "SAVE10 REFLEX20",
+            "tax_rate": 0.0825,
+        },
+        {"discount_code": "ünïcødé ✓"},
+        {"quantity": True},
+        {"quantity": 2.5, "extra_field": [1, "two"]},
+    ],
+)
+def test_round_trip(codec, fields):
+    message = _message(**fields)
+    assert decode(codec.encode(message)) == message
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        0,
+        -1,
+        1,
+        INT64_MIN,
+        INT64_MAX,
+        INT64_MIN - 1,
+        INT64_MAX + 1,
+        2**63,
+        10**20,
+        -(10**20),
+    ],
+)
+def test_binary_int_edges(value):
+    message = _message(quantity=value, selected_product_id=value)
+    decoded = decode(BinaryCodec().encode(message))
+    assert decoded["fields"] == {"quantity": value, "selected_product_id": value}
+    assert type(decoded["fields"]["quantity"]) is int
+
+
+def test_binary_large_seq_and_stamp():
+    message = _message(quantity=1)
+    message["seq"] = 2**70
+    message["sent"] = {"host": "h", "mono_ns": 2**64 - 1, "wall_us": 0}
+    assert decode(BinaryCodec().encode(message)) == message
+
+
+def test_binary_rejects_negative_seq():
+    message = _message()
+    message["seq"] = -1
+    with pytest.raises(ValueError, match="seq must be non-negative"):
+        BinaryCodec().encode(message)
+
+
+@pytest.mark.parametrize("data", [b"", b"\x02abc", b"\x01", b"{not json"])
+def test_decode_rejects_malformed(data):
+    with pytest.raises(CodecError):
+        decode(data)
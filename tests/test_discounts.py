@@ -0,0 +1,126 @@
+import asyncio
+import math
+
+import pytest
+
+from reflex_state_examples.pricing import discounts
+from reflex_state_examples.pricing.discounts import DiscountRule, RuleSet, load_rules
+
+NOW = 1_800_000_000.0
+
+RULES = RuleSet(
+    [
+        DiscountRule("BULK", ((10, 0.05), (50, 0.12))),
+        DiscountRule("SAVE10", ((1, 0.1),)),
+        DiscountRule("BIG", ((1, 0.3),)),
+        DiscountRule("WINDOW", ((2, 0.2),), starts_at=NOW, expires_at=NOW + 60),
+        DiscountRule("STACK5", ((1, 0.05),), stackable=True),
+        DiscountRule("STACK10", ((1, 0.1),), stackable=True),
+    ]
+)
+
+
+@pytest.mark.parametrize(
+    "quantity, expected",
+    [(1, 0.0), (9, 0.0), (10, 0.05), (49, 0.05), (50, 0.12), (10_000, 0.12)],
+)
+def test_tier_boundaries(quantity, expected):
+    assert RULES.percent("BULK", quantity, NOW) == expected
+
+
+@pytest.mark.parametrize(
+    "now, quantity, expected",
+    [
+        (NOW - 0.001, 2, 0.0),
+        (NOW, 2, 0.2),
+        (NOW, 1, 0.0),
+        (NOW + 59.999, 2, 0.2),
+        (NOW + 60, 2, 0.0),
+    ],
+)
+def test_start_is_inclusive_and_expiry_exclusive(now, quantity, expected):
+    assert RULES.percent("WINDOW", quantity, now) == expected
+
+
+def test_periods_change_only_at_boundaries():
+    assert RULES.period(NOW - 1) == 0
+    assert RULES.period(NOW) == RULES.period(NOW + 59) == 1
+    assert RULES.period(NOW + 60) == 2
+
+
+def test_codes_are_case_insensitive_and_unknown_codes_ignored():
+    assert RULES.percent("save10", 1, NOW) == 0.1
+    assert RULES.percent("NOPE", 1, NOW) == 0.0
+    assert RULES.percent("", 1, NOW) == 0.0
+
+
+def test_best_single_code_wins():
+    assert RULES.percent("SAVE10, BIG", 1, NOW) == 0.3
+    assert RULES.percent("SAVE10 SAVE10", 1, NOW) == 0.1
+
+
+def test_stackable_codes_compound():
+    assert RULES.percent("STACK5 STACK10", 1, NOW) == pytest.approx(
+        1 - 0.95 * 0.9
+    )
+    assert RULES.percent("STACK5,STACK10,SAVE10", 1, NOW) == pytest.approx(
+        1 - 0.95 * 0.9
+    )
+    assert RULES.percent("STACK5 STACK10 BIG", 1, NOW) == 0.3
+
+
+def test_duplicate_codes_are_rejected():
+    with pytest.raises(ValueError, match="Duplicate"):
+        RuleSet([DiscountRule("A", ((1, 0.1),)), DiscountRule("A", ((1, 0.2),))])
+
+
+def test_rules_round_trip_through_the_set():
+    assert RULES.get("window") == DiscountRule(
+        "WINDOW", ((2, 0.2),), starts_at=NOW, expires_at=NOW + 60
+    )
+    assert RULES.get("BULK").starts_at == -math.inf
+    assert RULES.get("missing") is None
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"code": "X", "percent": 1.5},
+        {"code": "X", "percent": -0.1},
+        {"code": "X", "tiers": []},
+    ],
+)
+def test_invalid_percents_are_rejected(data):
+    with pytest.raises(ValueError):
+        DiscountRule.from_dict(data)
+
+
+def test_load_rules_from_json_lines(tmp_path):
+    path = tmp_path / "rules.jsonl"
+    path.write_text(
+        '{"code": "spring", "percent": 0.15, "min_quantity": 2,'
+        ' "starts_at": "2027-01-01T00:00:00Z", "stackable": true}\n'
+        '{"code": "BULK", "tiers": [{"min_quantity": 50, "percent": 0.12},'
+        ' {"min_quantity": 10, "percent": 0.05}]}\n'
+    )
+    rules = load_rules(str(path))
+    spring = rules.get("SPRING")
+    assert spring.stackable and spring.tiers == ((2, 0.15),)
+    assert spring.starts_at == 1798761600.0
+    assert rules.get("BULK").tiers == ((10, 0.05), (50, 0.12))
+
+
+@pytest.mark.parametrize(
+    "record",
+    [
+        '{"code": 123, "percent": 0.1}',
+        '["SAVE10", 0.1]',
+        '{"code": "X", "percent": 0.1, "expires_at": [1]}',
+    ],
+)
+def test_malformed_rule_file_keeps_the_current_rules(tmp_path, record):
+    path = tmp_path / "rules.jsonl"
+    path.write_text(record + "\n")
+    current = discounts.active_rules()
+    assert asyncio.run(discounts.reload_rules(str(path))) is False
+    assert discounts.active_rules() is current
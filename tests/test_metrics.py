@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from reflex_state_examples.sync.metrics import LatencyHistogram
+
+
+def test_empty_histogram():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(99) == 0
+    assert histogram.to_dict()["mean_us"] == 0
+
+
+def test_small_values_are_exact():
+    histogram = LatencyHistogram()
+    for value in range(1, 101):
+        histogram.record(value)
+    assert histogram.percentile(50) == 50
+    assert histogram.percentile(99) == 99
+    assert histogram.percentile(100) == 100
+
+
+@pytest.mark.parametrize("pct", [50, 90, 95, 99, 99.9])
+def test_percentiles_within_bucket_error(pct):
+    rng = random.Random(pct)
+    values = sorted(int(rng.lognormvariate(8, 1.5)) for _ in range(20_000))
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+    exact = values[max(1, round(len(values) * pct / 100)) - 1]
+    reported = histogram.percentile(pct)
+    # The highest value in the sample's bucket: never below it, at most 1/64 above.
+    assert exact <= reported <= exact * (1 + 1 / 64)
+
+
+def test_summary_fields():
+    histogram = LatencyHistogram()
+    for value in (-5, 0, 10, 1_000_000):
+        histogram.record(value)
+    summary = histogram.to_dict()
+    assert summary["count"] == 4
+    assert summary["min_us"] == 0
+    assert summary["max_us"] == 1_000_000
+    assert summary["mean_us"] == (10 + 1_000_000) / 4
+    assert histogram.percentile(100) == 1_000_000
@@ -0,0 +1,284 @@
+import asyncio
+import itertools
+import random
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+
+from reflex_state_examples.sync.fanout import WorkerFanout, drain
+from reflex_state_examples.sync.memory_transport import InProcessTransport
+from reflex_state_examples.sync.protocol import (
+    DEFAULT_ROOM,
+    HybridClock,
+    SnapshotRecord,
+    SyncSession,
+    SyncSessions,
+    room_name,
+)
+from reflex_state_examples.sync.publisher import CoalescingPublisher
+from reflex_state_examples.sync.redis_pool import redis_pool
+from reflex_state_examples.sync.redis_transport import (
+    RedisPubSubTransport,
+    RedisStreamTransport,
+)
+
+# (fields, seq, origin). Two updates share a seq, so ties are decided by
+# origin, and one carries a field nothing else touches.
+UPDATES = [
+    ({"quantity": 2, "discount_code": "SAVE10"}, 100, "a"),
+    ({"quantity": 5}, 200, "b"),
+    ({"quantity": 7, "tax_rate": 0.1}, 200, "c"),
+    ({"discount_code": "REFLEX20"}, 150, "b"),
+    ({"selected_product_id": 3}, 50, "a"),
+]
+EXPECTED_VALUES = {
+    "quantity": 7,
+    "discount_code": "REFLEX20",
+    "tax_rate": 0.1,
+    "selected_product_id": 3,
+}
+EXPECTED_VERSIONS = {
+    "quantity": (200, "c"),
+    "discount_code": (150, "b"),
+    "tax_rate": (200, "c"),
+    "selected_product_id": (50, "a"),
+}
+ORDERS = list(itertools.permutations(UPDATES))
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("team-a", "team-a"),
+        ("Room_1", "Room_1"),
+        (None, DEFAULT_ROOM),
+        ("", DEFAULT_ROOM),
+        ("a:b", DEFAULT_ROOM),
+        ("*", DEFAULT_ROOM),
+        ("x" * 65, DEFAULT_ROOM),
+    ],
+)
+def test_room_name(value, expected):
+    assert room_name(value) == expected
+
+
+def test_hybrid_clock_moves_forward():
+    clock = HybridClock()
+    stamps = [clock.now() for _ in range(1000)]
+    assert stamps == sorted(set(stamps))
+    clock.observe(stamps[-1] + 10**9)
+    assert clock.now() > stamps[-1] + 10**9
+
+
+def test_session_merge_is_order_independent():
+    for order in ORDERS:
+        session = SyncSession("observer")
+        for fields, seq, origin in order:
+            session.merge(fields, seq, origin)
+        assert session.values == EXPECTED_VALUES
+        assert session.versions == EXPECTED_VERSIONS
+
+
+def test_session_merge_drops_stale_updates():
+    session = SyncSession("observer")
+    assert session.merge({"quantity": 5}, 200, "b") == {"quantity": 5}
+    assert session.merge({"quantity": 3}, 199, "z") == {}
+    assert session.merge({"quantity": 3}, 200, "a") == {}
+    assert session.merge({"quantity": 5}, 201, "a") == {}
+    assert session.versions["quantity"] == (201, "a")
+
+
+def test_local_edits_outrank_what_the_session_has_seen():
+    session = SyncSession("local", {"quantity": 1})
+    session.merge({"quantity": 4}, 10**15, "remote")
+    assert session.stage({"quantity": 9}) == {"quantity": 9}
+    fields, seq = session.take_dirty()
+    assert fields == {"quantity": 9}
+    assert seq > 10**15
+    assert session.take_dirty()[0] == {}
+
+
+def test_failed_publish_is_retried():
+    session = SyncSession("local")
+    session.stage({"quantity": 2, "discount_code": "X"})
+    fields, _ = session.take_dirty()
+    session.mark_dirty(fields)
+    assert session.take_dirty()[0] == fields
+
+
+def test_stage_skips_unchanged_fields_unless_forced():
+    session = SyncSession("local", {"quantity": 1, "discount_code": ""})
+    assert session.stage({"quantity": 1, "discount_code": ""}) == {}
+    assert session.stage({"quantity": 1}, force=True) == {"quantity": 1}
+
+
+def test_snapshot_record_merge_is_order_independent():
+    for order in ORDERS:
+        record = SnapshotRecord()
+        for fields, seq, origin in order:
+            record.merge(fields, seq, origin, "label")
+        assert record.fields == EXPECTED_VALUES
+        assert record.versions == EXPECTED_VERSIONS
+
+
+def test_merge_snapshot_applies_only_newer_fields():
+    record = SnapshotRecord()
+    for fields, seq, origin in UPDATES:
+        record.merge(fields, seq, origin, "label")
+    session = SyncSession("observer")
+    session.merge({"quantity": 99}, 300, "d")
+    changed = session.merge_snapshot(record.to_dict())
+    assert "quantity" not in changed
+    assert session.values == {**EXPECTED_VALUES, "quantity": 99}
+
+
+def test_sync_sessions_drop_released_entries():
+    sessions = SyncSessions()
+    first = sessions.acquire("origin", {"quantity": 1}, "room")
+    assert sessions.acquire("origin") is first
+    sessions.release("origin")
+    assert len(sessions) == 1
+    sessions.release("origin")
+    assert len(sessions) == 0
+    sessions.release("origin")
+    assert len(sessions) == 0
+
+
+async def _merged_snapshot(transport, order) -> tuple[list[bool], dict]:
+    applied = [
+        await transport.publish("room", origin, seq, "label", fields)
+        for fields, seq, origin in order
+    ]
+    return applied, await transport.get_snapshot("room")
+
+
+def _expected(order) -> tuple[list[bool], dict]:
+    record = SnapshotRecord()
+    applied = [
+        bool(record.merge(fields, seq, origin, "label"))
+        for fields, seq, origin in order
+    ]
+    return applied, record.to_dict()
+
+
+@pytest.fixture
+def fake_redis():
+    def use_fresh_server():
+        server = fakeredis.FakeServer()
+        redis_pool.use_client(
+            fakeredis.aioredis.FakeRedis(server=server, decode_responses=True),
+            raw=fakeredis.aioredis.FakeRedis(server=server),
+        )
+
+    yield use_fresh_server
+    redis_pool.use_client(None)
+
+
+@pytest.mark.parametrize("transport_cls", [RedisPubSubTransport, RedisStreamTransport])
+def test_lua_merge_matches_snapshot_record(fake_redis, transport_cls):
+    for order in random.Random(0).sample(ORDERS, 20):
+        fake_redis()
+        transport = transport_cls("test:channel", "test:state")
+        applied, snapshot = asyncio.run(_merged_snapshot(transport, order))
+        expected_applied, expected = _expected(order)
+        assert applied == expected_applied
+        assert snapshot["fields"] == expected["fields"] == EXPECTED_VALUES
+        assert snapshot["versions"] == expected["versions"]
+
+
+def test_stream_transport_appends_only_applied_deltas(fake_redis):
+    fake_redis()
+    transport = RedisStreamTransport("test:channel", "test:state")
+
+    async def publish_and_read():
+        await transport.publish("room", "b", 200, "label", {"quantity": 5})
+        await transport.publish("room", "a", 100, "label", {"quantity": 2})
+        return await transport.replay("room", "0-0")
+
+    entries = asyncio.run(publish_and_read())
+    assert [message["fields"] for _, message in entries] == [{"quantity": 5}]
+
+
+def test_memory_transport_merge_is_order_independent():
+    for order in random.Random(0).sample(ORDERS, 20):
+        transport = InProcessTransport("test:channel", "test:state")
+        applied, snapshot = asyncio.run(_merged_snapshot(transport, order))
+        expected_applied, expected = _expected(order)
+        assert applied == expected_applied
+        assert snapshot["fields"] == expected["fields"]
+        assert snapshot["versions"] == expected["versions"]
+
+
+def test_memory_transport_evicts_idle_rooms_past_its_cap():
+    transport = InProcessTransport("test:channel", "test:state", max_rooms=3)
+
+    async def fill():
+        listener = transport.subscribe("busy", lambda: None)
+        first = asyncio.ensure_future(anext(listener))
+        await asyncio.sleep(0)
+        for n in range(10):
+            await transport.publish(f"room-{n}", "a", n + 1, "label", {"n": n})
+        await transport.publish("busy", "a", 1, "label", {"n": -1})
+        _, message = await first
+        await listener.aclose()
+        return message
+
+    assert asyncio.run(fill())["fields"] == {"n": -1}
+    assert list(transport._rooms) == ["room-8", "room-9", "busy"]
+
+
+def test_fanout_overflow_resyncs_without_losing_fields_or_control_items():
+    transport = InProcessTransport("test:channel", "test:state")
+    fanout = WorkerFanout(transport, queue_size=4)
+
+    async def lag_behind():
+        queue = fanout.register("tab", "observer", "room")
+        await asyncio.sleep(0)
+        await transport.publish("room", "a", 1, "label", {"discount_code": "X"})
+        for n in range(2, 8):
+            await transport.publish("room", "a", n, "label", {"quantity": n})
+        await asyncio.sleep(0.01)
+        fanout.stop("tab")
+        await transport.publish("room", "a", 8, "label", {"quantity": 8})
+        await asyncio.sleep(0.01)
+        items = await drain(queue)
+        session = SyncSession("observer", {}, "room")
+        for kind, data in items:
+            if kind == "resync":
+                session.merge_snapshot(await transport.get_snapshot("room"))
+            elif kind == "message":
+                session.merge(data["fields"], data["seq"], data["origin"])
+        fanout.unregister("tab", queue)
+        return [kind for kind, _ in items], session.values
+
+    kinds, values = asyncio.run(lag_behind())
+    assert kinds.count("resync") == 1
+    assert "stop" in kinds
+    assert kinds.count("message") <= 4
+    assert values == {"discount_code": "X", "quantity": 8}
+    assert fanout.messages_dropped > 0
+
+
+class _StalledTransport:
+    async def publish(self, *args, **kwargs):
+        await asyncio.Event().wait()
+
+
+@pytest.mark.parametrize("window_ms", [0, 10_000])
+def test_cancelled_flush_releases_waiting_publishers(window_ms):
+    publisher = CoalescingPublisher(_StalledTransport(), window_ms=window_ms)
+    session = SyncSession("local", {"quantity": 1}, "room")
+
+    async def cancel_flush():
+        session.stage({"quantity": 2})
+        request = asyncio.ensure_future(publisher.publish(session, "label"))
+        await asyncio.sleep(0.01)
+        for flush in list(publisher._flushes):
+            flush.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(request, 1)
+
+    asyncio.run(cancel_flush())
+    assert not publisher._pending
+    assert session.take_dirty()[0] == {"quantity": 2}
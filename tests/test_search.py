@@ -0,0 +1,105 @@
+import asyncio
+import os
+
+import pytest
+
+from reflex_state_examples.pricing import mmap_catalog, search
+from reflex_state_examples.pricing.catalog import Catalog, Product
+from reflex_state_examples.pricing.search import ProductIndex, scan
+
+ADJECTIVES = ["Neural", "Quantum", "Holographic", "Smart", "Café"]
+NOUNS = ["Cable", "Processor", "Display", "Lens", "Scanner"]
+
+CATALOG = Catalog(
+    Product(
+        id=i,
+        name=f"{ADJECTIVES[i % 5]} {NOUNS[i // 5 % 5]} {i}",
+        price=1.0 + i,
+        icon="box",
+    )
+    for i in range(1, 301)
+)
+QUERIES = [
+    "",
+    "q",
+    "quantum",
+    "QUANT proc",
+    "smart lens 1",
+    "café",
+    "caf disp",
+    "zzz",
+    "1",
+]
+
+
+@pytest.fixture(scope="module")
+def index() -> ProductIndex:
+    return ProductIndex(CATALOG)
+
+
+def _ids(page) -> set[int]:
+    return {product.id for product in page.products}
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_index_finds_what_a_scan_finds(index, query):
+    expected = _ids(scan(CATALOG, query, limit=1000))
+    assert _ids(index.search(query, limit=1000)) == expected
+
+
+def test_every_query_word_must_prefix_a_name_word(index):
+    for product in index.search("smart lens", limit=1000).products:
+        name = product.name.casefold().split()
+        assert name[0] == "smart" and name[1] == "lens"
+    assert not index.search("mart").products
+
+
+def test_pages_cover_all_matches_once(index):
+    expected = _ids(index.search("quantum", limit=1000))
+    seen, offset = [], 0
+    while True:
+        page = index.search("quantum", offset, limit=7)
+        seen += [product.id for product in page.products]
+        offset += 7
+        if not page.has_more:
+            break
+    assert len(seen) == len(set(seen)) and set(seen) == expected
+
+
+def test_has_more_is_exact(index):
+    total = len(index.search("lens", limit=1000).products)
+    assert index.search("lens", limit=total).has_more is False
+    assert index.search("lens", limit=total - 1).has_more is True
+
+
+def test_saved_index_matches_the_built_one(index, tmp_path):
+    path = tmp_path / "catalog.search"
+    index.save(path, (1, 2))
+    opened = ProductIndex.open(path, CATALOG, (1, 2))
+    for query in QUERIES:
+        assert opened.search(query) == index.search(query)
+    with pytest.raises(ValueError, match="another catalog"):
+        ProductIndex.open(path, CATALOG, (1, 3))
+
+
+def test_load_index_saves_next_to_an_mmap_catalog(tmp_path):
+    path = tmp_path / "catalog.bin"
+    mmap_catalog.build(CATALOG, path)
+    catalog = mmap_catalog.MmapCatalog(path)
+    try:
+        built = search.load_index(catalog)
+        assert os.path.exists(f"{path}.search")
+        opened = search.load_index(catalog)
+        assert isinstance(opened._ids, memoryview)
+        assert opened.search("holo disp") == built.search("holo disp")
+    finally:
+        catalog.close()
+
+
+def test_find_scans_until_the_index_is_ready(monkeypatch):
+    monkeypatch.setattr(search, "catalog", CATALOG)
+    monkeypatch.setattr(search, "_index", None)
+    scanned = asyncio.run(search.find("neural", limit=1000))
+    monkeypatch.setattr(search, "_index", ProductIndex(CATALOG))
+    indexed = asyncio.run(search.find("neural", limit=1000))
+    assert _ids(scanned) == _ids(indexed) and scanned.products